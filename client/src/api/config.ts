@@ -114,6 +114,7 @@ export interface BirthChartRequest {
   place: string;
   latitude?: string;
   longitude?: string;
+  tz?: string;
 }
 
 export interface BirthChartResponse {
@@ -122,6 +123,16 @@ export interface BirthChartResponse {
   moonSign: string;
   planetaryPositions: PlanetaryPosition[];
   housePositions: HousePosition[];
+  location?: BirthLocation;
+}
+
+export interface BirthLocation {
+  lat: number;
+  lon: number;
+  tz: string;
+  utcOffsetHours: number;
+  place: string | null;
+  source: 'place' | 'coordinates';
 }
 
 export interface PlanetaryPosition {
@@ -12,7 +12,8 @@ export default function BirthChartPage() {
     time: '',
     place: '',
     latitude: '',
-    longitude: ''
+    longitude: '',
+    tz: ''
   });
   const [isCalculating, setIsCalculating] = useState(false);
   const [chartData, setChartData] = useState<BirthChartResponse | null>(null);
@@ -41,7 +42,8 @@ export default function BirthChartPage() {
         time: formData.time,
         place: formData.place,
         latitude: formData.latitude || undefined,
-        longitude: formData.longitude || undefined
+        longitude: formData.longitude || undefined,
+        tz: formData.tz || undefined
       };
 
       const response = await apiService.getBirthChart(request);
@@ -148,6 +150,17 @@ export default function BirthChartPage() {
                     placeholder="e.g., 77.2090"
                   />
                 </div>
+                <div>
+                  <label className="block text-secondary font-semibold mb-2">Timezone (Required with coordinates)</label>
+                  <input
+                    type="text"
+                    name="tz"
+                    value={formData.tz}
+                    onChange={handleInputChange}
+                    className="w-full bg-charcoal border border-primary rounded-lg px-4 py-3 text-textMain focus:outline-none focus:border-secondary"
+                    placeholder="e.g., Asia/Kolkata or 5.5"
+                  />
+                </div>
               </div>
 
               {error && (
@@ -191,6 +204,11 @@ export default function BirthChartPage() {
             {/* Basic Info */}
             <div className="bg-hover rounded-xl p-6">
               <h2 className="text-2xl font-semibold mb-4 mystical-glow">Your Cosmic Blueprint</h2>
+              {chartData.location && (
+                <p className="text-textSoft text-sm mb-4">
+                  Calculated for {chartData.location.place ?? `${chartData.location.lat}, ${chartData.location.lon}`} ({chartData.location.tz})
+                </p>
+              )}
               <div className="grid md:grid-cols-3 gap-4">
                 <div className="text-center p-4 bg-charcoal rounded-lg">
                   <div className="text-2xl mb-2">🌅</div>
@@ -268,7 +286,8 @@ export default function BirthChartPage() {
                     time: '',
                     place: '',
                     latitude: '',
-                    longitude: ''
+                    longitude: '',
+                    tz: ''
                   });
                   setError(null);
                 }}
@@ -1,9 +1,11 @@
-from flask import Flask, request, jsonify
+from flask import Flask, Response, request, jsonify
 from flask_cors import CORS
 from datetime import datetime, timedelta
+import logging
+import os
 import random
 import uuid
-from routes.horoscope import horoscope_bp
+from routes.horoscope import horoscope_bp, daily_pregenerator
 from routes.zodiac import zodiac_bp
 from routes.panchang import panchang_bp
 from routes.matchmaking import matchmaking_bp
@@ -12,9 +14,15 @@ from routes.tarot import tarot_bp
 from routes.mantra import mantra_bp
 from routes.remedy import remedy_bp
 from routes.calendar import calendar_bp
+from routes.muhurta import muhurta_bp
+from services import metrics, profiling
+from services.circuit_breaker import breaker_states
 
 app = Flask(__name__)
+app.logger.setLevel(logging.INFO)
 CORS(app)
+metrics.init_metrics(app)
+profiling.init_profiling(app)
 
 # Register blueprints
 app.register_blueprint(horoscope_bp, url_prefix='/api')
@@ -26,6 +34,7 @@ app.register_blueprint(tarot_bp, url_prefix='/api')
 app.register_blueprint(mantra_bp, url_prefix='/api')
 app.register_blueprint(remedy_bp, url_prefix='/api')
 app.register_blueprint(calendar_bp, url_prefix='/api')
+app.register_blueprint(muhurta_bp, url_prefix='/api')
 
 @app.route('/api/health', methods=['GET'])
 def health_check():
@@ -35,10 +44,16 @@ def health_check():
         'data': {
             'status': 'healthy',
             'timestamp': datetime.now().isoformat(),
-            'service': 'Horoscope API'
+            'service': 'Horoscope API',
+            'circuitBreakers': breaker_states()
         }
     })
 
+@app.route('/api/metrics', methods=['GET'])
+def metrics_endpoint():
+    """Request, upstream, dataSource and cache metrics for all workers (Prometheus text format)"""
+    return Response(metrics.render(), mimetype='text/plain; version=0.0.4')
+
 @app.errorhandler(404)
 def not_found(error):
     return jsonify({
@@ -53,5 +68,12 @@ def internal_error(error):
         'error': 'Internal server error'
     }), 500
 
+def start_background_jobs():
+    """Start per-process background jobs (threads do not survive gunicorn's fork)"""
+    daily_pregenerator.start()
+
 if __name__ == '__main__':
+    # With the debug reloader only the child process serves requests
+    if os.environ.get('WERKZEUG_RUN_MAIN') == 'true':
+        start_background_jobs()
     app.run(debug=True, host='0.0.0.0', port=5000)
@@ -0,0 +1 @@
+# Astronomy package (local ephemeris and panchang calculations)
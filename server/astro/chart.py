@@ -0,0 +1,143 @@
+from typing import Any, Dict, List
+import numpy as np
+from astro.chebyshev import body_longitude
+from astro.ephemeris import PLANET_ELEMENTS, ascendant, lahiri_ayanamsa, lunar_node
+from astro.panchang import NAKSHATRA_SPAN, NAKSHATRAS
+
+# Sidereal (Lahiri) birth chart with whole-sign houses: the rising sign is
+# the first house and every following sign the next one.
+
+SIGNS = ['Aries', 'Taurus', 'Gemini', 'Cancer', 'Leo', 'Virgo', 'Libra', 'Scorpio', 'Sagittarius', 'Capricorn', 'Aquarius', 'Pisces']
+BODIES = ['Sun', 'Moon', 'Mercury', 'Venus', 'Mars', 'Jupiter', 'Saturn', 'Rahu', 'Ketu']
+
+PLANET_SYMBOLS = {
+    'Sun': '☀️',
+    'Moon': '🌙',
+    'Mercury': '☿',
+    'Venus': '♀',
+    'Mars': '♂',
+    'Jupiter': '♃',
+    'Saturn': '♄',
+    'Rahu': '☊',
+    'Ketu': '☋',
+}
+
+SIGN_ELEMENTS = {
+    'Aries': 'Fire', 'Leo': 'Fire', 'Sagittarius': 'Fire',
+    'Taurus': 'Earth', 'Virgo': 'Earth', 'Capricorn': 'Earth',
+    'Gemini': 'Air', 'Libra': 'Air', 'Aquarius': 'Air',
+    'Cancer': 'Water', 'Scorpio': 'Water', 'Pisces': 'Water',
+}
+
+HOUSE_NAMES = ['Ascendant', 'Wealth', 'Siblings', 'Mother', 'Children', 'Enemies',
+               'Spouse', 'Longevity', 'Dharma', 'Career', 'Income', 'Moksha']
+HOUSE_AREAS = [
+    'Self, personality, appearance', 'Finances, family, speech', 'Communication, courage, short journeys',
+    'Home, property, vehicles', 'Intelligence, creativity, romance', 'Health, service, obstacles',
+    'Partnership, marriage, business', 'Mystery, research, sudden events', 'Religion, guru, higher learning',
+    'Profession, authority, reputation', 'Gains, friends, elder siblings', 'Expenses, foreign travel, liberation',
+]
+
+# Dignities by sign index; debilitation is opposite exaltation
+EXALTATION = {'Sun': 0, 'Moon': 1, 'Mercury': 5, 'Venus': 11, 'Mars': 9, 'Jupiter': 3, 'Saturn': 6, 'Rahu': 1, 'Ketu': 7}
+OWN_SIGNS = {'Sun': (4,), 'Moon': (3,), 'Mercury': (2, 5), 'Venus': (1, 6), 'Mars': (0, 7), 'Jupiter': (8, 11), 'Saturn': (9, 10)}
+# Distance from the Sun (degrees) within which a planet is combust
+COMBUSTION_ORB = {'Moon': 12.0, 'Mercury': 14.0, 'Venus': 10.0, 'Mars': 17.0, 'Jupiter': 11.0, 'Saturn': 15.0}
+DUSTHANA_HOUSES = (6, 8, 12)
+
+# Half-width (days) of the central difference used for daily motion
+_SPEED_STEP = 0.5
+
+def tropical_longitudes(jd, true_node: bool = False) -> Dict[str, Any]:
+    """Tropical longitudes of the nine grahas (floats or arrays, like the ephemeris)"""
+    longitudes = {name: body_longitude(name, jd) for name in ('Sun', 'Moon') + tuple(PLANET_ELEMENTS)}
+    rahu = body_longitude('TrueNode', jd) if true_node else lunar_node(jd)
+    longitudes['Rahu'] = rahu
+    longitudes['Ketu'] = (rahu + 180.0) % 360.0
+    return longitudes
+
+def compute_chart(jd, latitude, longitude, true_node: bool = False) -> Dict[str, Any]:
+    """
+    Sidereal longitudes and daily motions of the grahas plus the sidereal
+    ascendant, for a Julian day (UT) and an east-positive location. Works on
+    floats or equally shaped arrays.
+    """
+    ayanamsa = lahiri_ayanamsa(jd)
+    now = tropical_longitudes(jd, true_node)
+    before = tropical_longitudes(jd - _SPEED_STEP, true_node)
+    after = tropical_longitudes(jd + _SPEED_STEP, true_node)
+    return {
+        'ayanamsa': ayanamsa,
+        'ascendant': (ascendant(jd, latitude, longitude) - ayanamsa) % 360.0,
+        'longitudes': {name: (now[name] - ayanamsa) % 360.0 for name in BODIES},
+        'speeds': {name: ((after[name] - before[name] + 180.0) % 360.0 - 180.0) / (2 * _SPEED_STEP) for name in BODIES},
+    }
+
+def planet_status(name: str, sign: int, house: int, distance_from_sun: float) -> str:
+    """Strong or Weak: weak when debilitated, combust, or in a dusthana (6/8/12) outside its own or exaltation sign"""
+    if sign == (EXALTATION[name] + 6) % 12:
+        return 'Weak'
+    if distance_from_sun < COMBUSTION_ORB.get(name, 0.0):
+        return 'Weak'
+    if house in DUSTHANA_HOUSES and sign != EXALTATION[name] and sign not in OWN_SIGNS.get(name, ()):
+        return 'Weak'
+    return 'Strong'
+
+def chart_payload(ascendant_lon: float, longitudes: Dict[str, float], speeds: Dict[str, float]) -> Dict[str, Any]:
+    """The birth chart response for one moment: signs, planetaryPositions and housePositions"""
+    rising = int(ascendant_lon // 30)
+    sun = longitudes['Sun']
+
+    planets: List[Dict[str, Any]] = []
+    for name in BODIES:
+        lon = float(longitudes[name])
+        sign = int(lon // 30)
+        house = (sign - rising) % 12 + 1
+        distance = abs((lon - sun + 180.0) % 360.0 - 180.0)
+        planets.append({
+            'name': name,
+            'symbol': PLANET_SYMBOLS[name],
+            'element': 'Shadow' if name in ('Rahu', 'Ketu') else SIGN_ELEMENTS[SIGNS[sign]],
+            'degree': int(lon % 30),
+            'house': house,
+            'status': planet_status(name, sign, house, distance),
+            'sign': SIGNS[sign],
+            'longitude': round(lon, 2),
+            'nakshatra': NAKSHATRAS[int(lon // NAKSHATRA_SPAN) % 27],
+            'retrograde': bool(speeds[name] < 0),
+        })
+
+    houses = [
+        {'number': n + 1, 'name': HOUSE_NAMES[n], 'area': HOUSE_AREAS[n], 'sign': SIGNS[(rising + n) % 12]}
+        for n in range(12)
+    ]
+
+    return {
+        'ascendant': SIGNS[rising],
+        'ascendantDegree': round(float(ascendant_lon % 30), 2),
+        'sunSign': SIGNS[int(sun // 30)],
+        'moonSign': SIGNS[int(longitudes['Moon'] // 30)],
+        'planetaryPositions': planets,
+        'housePositions': houses,
+    }
+
+def birth_chart(jd: float, latitude: float, longitude: float, true_node: bool = False) -> Dict[str, Any]:
+    """Complete sidereal birth chart for a Julian day (UT) and location"""
+    chart = compute_chart(jd, latitude, longitude, true_node)
+    payload = chart_payload(chart['ascendant'], chart['longitudes'], chart['speeds'])
+    payload['ayanamsa'] = round(chart['ayanamsa'], 4)
+    return payload
+
+def birth_charts(jd: np.ndarray, latitude: np.ndarray, longitude: np.ndarray, true_node: bool = False) -> List[Dict[str, Any]]:
+    """Birth charts for many moments and locations, with the positions computed in one vectorized pass"""
+    chart = compute_chart(jd, latitude, longitude, true_node)
+    ascendants = chart['ascendant'].tolist()
+    ayanamsas = chart['ayanamsa'].tolist()
+    longitudes = {name: values.tolist() for name, values in chart['longitudes'].items()}
+    speeds = {name: values.tolist() for name, values in chart['speeds'].items()}
+    charts = []
+    for i in range(len(ascendants)):
+        payload = chart_payload(ascendants[i], {name: longitudes[name][i] for name in BODIES}, {name: speeds[name][i] for name in BODIES})
+        payload['ayanamsa'] = round(ayanamsas[i], 4)
+        charts.append(payload)
+    return charts
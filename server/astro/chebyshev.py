@@ -0,0 +1,166 @@
+import argparse
+import json
+import math
+import os
+import struct
+from datetime import datetime
+from typing import Callable, Dict, Optional
+import numpy as np
+from config import Config
+from astro.ephemeris import PLANET_ELEMENTS, julian_day, lahiri_ayanamsa, lunar_node, moon_position, planet_position, sun_position
+
+# Precomputed Chebyshev fits of the analytic ephemeris. The build step
+# samples each body's tropical longitude at Chebyshev nodes over fixed-length
+# segments and stores the coefficients in one binary file; the reader
+# memory-maps it, so workers forked from a preloaded master share the pages
+# and a lookup is a segment index plus a dozen multiply-adds. Dates outside
+# the table, or a missing file, fall back to the analytic series.
+#
+# File layout: MAGIC, a little-endian uint32 header length, a JSON header
+# (range, and per body its segment length, degree, count and byte offset),
+# then each body's float64 coefficients as a (segments, degree + 1) array.
+
+MAGIC = b'ASTROCHB'
+FORMAT_VERSION = 1
+_ALIGN = 64
+
+ANALYTIC: Dict[str, Callable] = {
+    'Sun': lambda jd: sun_position(jd)[0],
+    'Moon': lambda jd: moon_position(jd)[0],
+    'TrueNode': lambda jd: lunar_node(jd, True),
+}
+for _name in PLANET_ELEMENTS:
+    ANALYTIC[_name] = lambda jd, name=_name: planet_position(name, jd)[0]
+
+# Segment length (days) and polynomial degree per body, chosen so the fit
+# stays within 1e-5 degrees (a few hundredths of an arcsecond) of the series
+SEGMENTS = {
+    'Sun': (64.0, 10),
+    'Moon': (8.0, 13),
+    'Mercury': (16.0, 12),
+    'Venus': (32.0, 10),
+    'Mars': (32.0, 10),
+    'Jupiter': (64.0, 9),
+    'Saturn': (64.0, 8),
+    'TrueNode': (16.0, 12),
+}
+
+def fit_segments(fn: Callable, start: float, span: float, degree: int, count: int) -> np.ndarray:
+    """Chebyshev coefficients of fn (degrees, unwrapped per segment) for `count` consecutive segments"""
+    n = degree + 1
+    k = np.arange(n)
+    nodes = np.cos(np.pi * (k + 0.5) / n)
+    jd = start + span * (np.arange(count)[:, None] + (nodes[None, :] + 1.0) / 2.0)
+    values = np.degrees(np.unwrap(np.radians(fn(jd)), axis=1))
+    basis = np.cos(np.pi * np.outer(k, k + 0.5) / n) * (2.0 / n)
+    coefficients = values @ basis.T
+    coefficients[:, 0] /= 2.0
+    return coefficients
+
+def build_table(path: str, start_year: int = 1900, end_year: int = 2100) -> None:
+    """Fit every body over [start_year, end_year) and write the table (atomically) to path"""
+    start = julian_day(datetime(start_year, 1, 1))
+    end = julian_day(datetime(end_year, 1, 1))
+    header = {'version': FORMAT_VERSION, 'start': start, 'end': end, 'bodies': {}}
+    arrays = []
+    offset = 0
+    for name, (span, degree) in SEGMENTS.items():
+        count = int(math.ceil((end - start) / span))
+        arrays.append(fit_segments(ANALYTIC[name], start, span, degree, count).astype('<f8'))
+        header['bodies'][name] = {'span': span, 'degree': degree, 'segments': count, 'offset': offset}
+        offset += arrays[-1].nbytes
+
+    encoded = json.dumps(header).encode()
+    data_start = len(MAGIC) + 4 + len(encoded)
+    padding = -data_start % _ALIGN
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'wb') as f:
+        f.write(MAGIC)
+        f.write(struct.pack('<I', len(encoded) + padding))
+        f.write(encoded + b' ' * padding)
+        for array in arrays:
+            f.write(array.tobytes())
+    os.replace(tmp_path, path)
+
+class ChebyshevTable:
+    """Read-only, memory-mapped view of a table written by build_table()"""
+
+    def __init__(self, path: str):
+        with open(path, 'rb') as f:
+            if f.read(len(MAGIC)) != MAGIC:
+                raise ValueError(f'{path} is not an ephemeris table')
+            (length,) = struct.unpack('<I', f.read(4))
+            header = json.loads(f.read(length))
+        if header.get('version') != FORMAT_VERSION:
+            raise ValueError(f"{path} has table version {header.get('version')}, expected {FORMAT_VERSION}")
+        self.start = header['start']
+        self.end = header['end']
+        data_start = len(MAGIC) + 4 + length
+        self.bodies = {}
+        for name, info in header['bodies'].items():
+            coefficients = np.memmap(path, dtype='<f8', mode='r', offset=data_start + info['offset'],
+                                     shape=(info['segments'], info['degree'] + 1))
+            self.bodies[name] = (info['span'], coefficients)
+
+    def covers(self, jd) -> bool:
+        if isinstance(jd, np.ndarray):
+            return bool(jd.size) and bool(np.all((jd >= self.start) & (jd < self.end)))
+        return self.start <= jd < self.end
+
+    def longitude(self, name: str, jd):
+        """Tropical longitude of a body (float or array; jd must be covered)"""
+        span, coefficients = self.bodies[name]
+        position = (jd - self.start) / span
+        if isinstance(jd, np.ndarray):
+            segment = np.floor(position).astype(int)
+            x = 2.0 * (position - segment) - 1.0
+            rows = coefficients[segment]
+            b1 = np.zeros_like(x)
+            b2 = np.zeros_like(x)
+            for j in range(rows.shape[1] - 1, 0, -1):
+                b1, b2 = 2.0 * x * b1 - b2 + rows[:, j], b1
+            return (x * b1 - b2 + rows[:, 0]) % 360.0
+
+        segment = int(position)
+        x = 2.0 * (position - segment) - 1.0
+        row = coefficients[segment].tolist()
+        b1 = b2 = 0.0
+        for c in row[:0:-1]:
+            b1, b2 = 2.0 * x * b1 - b2 + c, b1
+        return (x * b1 - b2 + row[0]) % 360.0
+
+def load_table(path: str) -> Optional[ChebyshevTable]:
+    """The table at path, or None (analytic fallback) when it is missing or unreadable"""
+    if not os.path.exists(path):
+        return None
+    try:
+        return ChebyshevTable(path)
+    except (OSError, ValueError) as e:
+        print(f"Ignoring ephemeris table {path}: {e}")
+        return None
+
+# Loaded at import so a preloaded gunicorn master maps it once for every worker
+table = load_table(Config.EPHEMERIS_TABLE_PATH)
+
+def body_longitude(name: str, jd):
+    """Tropical longitude of a body from the table when it covers jd, else from the analytic series"""
+    if table is not None and table.covers(jd):
+        return table.longitude(name, jd)
+    return ANALYTIC[name](jd)
+
+def sidereal_longitudes(jd):
+    """Sidereal (Lahiri) longitudes of the Sun and Moon"""
+    ayanamsa = lahiri_ayanamsa(jd)
+    return (body_longitude('Sun', jd) - ayanamsa) % 360.0, (body_longitude('Moon', jd) - ayanamsa) % 360.0
+
+def main():
+    parser = argparse.ArgumentParser(description='Precompute the Chebyshev ephemeris table')
+    parser.add_argument('--output', default=Config.EPHEMERIS_TABLE_PATH)
+    parser.add_argument('--start-year', type=int, default=1900)
+    parser.add_argument('--end-year', type=int, default=2100)
+    args = parser.parse_args()
+    build_table(args.output, args.start_year, args.end_year)
+    print(f"Wrote {args.output} ({os.path.getsize(args.output) / 1e6:.1f} MB)")
+
+if __name__ == '__main__':
+    main()
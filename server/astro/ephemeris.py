@@ -0,0 +1,230 @@
+import math
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+from typing import Tuple
+import numpy as np
+
+# Low-precision geocentric Sun, Moon and planet positions from Paul
+# Schlyter's orbital elements ("How to compute planetary positions"),
+# including the main lunar and Jupiter-Saturn perturbation terms. Accuracy
+# is about 1' for the Sun, 2' for the Moon and a few arcminutes for the
+# planets over 1900-2100: panchang boundaries land within a few minutes.
+# Longitudes are tropical, referred to the equinox of date.
+#
+# Every function accepts a float or a NumPy array of Julian days: floats go
+# through `math` (a single date stays in the microsecond range), arrays are
+# evaluated in one vectorized pass.
+
+J2000 = 2451545.0            # 2000 Jan 1, 12h TT
+SCHLYTER_EPOCH = 2451543.5   # day 0.0 of Schlyter's elements (1999 Dec 31, 0h UT)
+UNIX_EPOCH_JD = 2440587.5
+
+def julian_day(moment: datetime) -> float:
+    """Julian day of a datetime (naive values are taken as UTC)"""
+    if moment.tzinfo is not None:
+        moment = moment.astimezone(timezone.utc).replace(tzinfo=None)
+    return UNIX_EPOCH_JD + (moment - datetime(1970, 1, 1)).total_seconds() / 86400.0
+
+def from_julian_day(jd: float) -> datetime:
+    """Aware UTC datetime for a Julian day"""
+    return datetime(1970, 1, 1, tzinfo=timezone.utc) + timedelta(days=jd - UNIX_EPOCH_JD)
+
+_MATH = SimpleNamespace(
+    sind=lambda deg: math.sin(math.radians(deg)),
+    cosd=lambda deg: math.cos(math.radians(deg)),
+    tand=lambda deg: math.tan(math.radians(deg)),
+    asind=lambda x: math.degrees(math.asin(x)),
+    acosd=lambda x: math.degrees(math.acos(x)),
+    atan2d=lambda y, x: math.degrees(math.atan2(y, x)),
+    sqrt=math.sqrt,
+    hypot=math.hypot,
+    degrees=math.degrees,
+)
+_NUMPY = SimpleNamespace(
+    sind=lambda deg: np.sin(np.radians(deg)),
+    cosd=lambda deg: np.cos(np.radians(deg)),
+    tand=lambda deg: np.tan(np.radians(deg)),
+    asind=lambda x: np.degrees(np.arcsin(x)),
+    acosd=lambda x: np.degrees(np.arccos(x)),
+    atan2d=lambda y, x: np.degrees(np.arctan2(y, x)),
+    sqrt=np.sqrt,
+    hypot=np.hypot,
+    degrees=np.degrees,
+)
+
+def ops_for(value):
+    """Degree-based math functions matching the type of `value` (float or ndarray)"""
+    return _NUMPY if isinstance(value, np.ndarray) else _MATH
+
+def _eccentric_anomaly(xp, mean_anomaly, e):
+    """Solve Kepler's equation (degrees) by Newton iteration"""
+    E = mean_anomaly + xp.degrees(e * xp.sind(mean_anomaly) * (1.0 + e * xp.cosd(mean_anomaly)))
+    for _ in range(5):
+        E = E - (E - xp.degrees(e * xp.sind(E)) - mean_anomaly) / (1.0 - e * xp.cosd(E))
+    return E
+
+def _sun_elements(d):
+    """Argument of perihelion, eccentricity and mean anomaly of the Sun"""
+    w = 282.9404 + 4.70935e-5 * d
+    e = 0.016709 - 1.151e-9 * d
+    M = (356.0470 + 0.9856002585 * d) % 360.0
+    return w, e, M
+
+def sun_position(jd) -> Tuple:
+    """Tropical ecliptic longitude (degrees) and distance (AU) of the Sun"""
+    xp = ops_for(jd)
+    w, e, M = _sun_elements(jd - SCHLYTER_EPOCH)
+    E = _eccentric_anomaly(xp, M, e)
+    xv = xp.cosd(E) - e
+    yv = xp.sqrt(1.0 - e * e) * xp.sind(E)
+    v = xp.atan2d(yv, xv)
+    return (v + w) % 360.0, xp.hypot(xv, yv)
+
+def moon_position(jd) -> Tuple:
+    """Tropical ecliptic longitude, latitude (degrees) and distance (Earth radii) of the Moon"""
+    xp = ops_for(jd)
+    d = jd - SCHLYTER_EPOCH
+    N = 125.1228 - 0.0529538083 * d
+    i = 5.1454
+    w = 318.0634 + 0.1643573223 * d
+    a = 60.2666
+    e = 0.054900
+    M = (115.3654 + 13.0649929509 * d) % 360.0
+
+    E = _eccentric_anomaly(xp, M, e)
+    xv = a * (xp.cosd(E) - e)
+    yv = a * math.sqrt(1.0 - e * e) * xp.sind(E)
+    v = xp.atan2d(yv, xv)
+    r = xp.hypot(xv, yv)
+
+    xh = r * (xp.cosd(N) * xp.cosd(v + w) - xp.sind(N) * xp.sind(v + w) * xp.cosd(i))
+    yh = r * (xp.sind(N) * xp.cosd(v + w) + xp.cosd(N) * xp.sind(v + w) * xp.cosd(i))
+    zh = r * xp.sind(v + w) * xp.sind(i)
+    lon = xp.atan2d(yh, xh)
+    lat = xp.atan2d(zh, xp.hypot(xh, yh))
+
+    # Perturbations by the Sun (evection, variation, yearly equation, ...)
+    ws, _, Ms = _sun_elements(d)
+    Ls = Ms + ws
+    Lm = M + w + N
+    D = Lm - Ls
+    F = Lm - N
+    lon += (-1.274 * xp.sind(M - 2 * D)
+            + 0.658 * xp.sind(2 * D)
+            - 0.186 * xp.sind(Ms)
+            - 0.059 * xp.sind(2 * M - 2 * D)
+            - 0.057 * xp.sind(M - 2 * D + Ms)
+            + 0.053 * xp.sind(M + 2 * D)
+            + 0.046 * xp.sind(2 * D - Ms)
+            + 0.041 * xp.sind(M - Ms)
+            - 0.035 * xp.sind(D)
+            - 0.031 * xp.sind(M + Ms)
+            - 0.015 * xp.sind(2 * F - 2 * D)
+            + 0.011 * xp.sind(M - 4 * D))
+    lat += (-0.173 * xp.sind(F - 2 * D)
+            - 0.055 * xp.sind(M - F - 2 * D)
+            - 0.046 * xp.sind(M + F - 2 * D)
+            + 0.033 * xp.sind(F + 2 * D)
+            + 0.017 * xp.sind(2 * M + F))
+    r += -0.58 * xp.cosd(M - 2 * D) - 0.46 * xp.cosd(2 * D)
+    return lon % 360.0, lat, r
+
+# Heliocentric elements (N, i, w, a, e, M) as (value at day 0, change per day)
+PLANET_ELEMENTS = {
+    'Mercury': ((48.3313, 3.24587e-5), (7.0047, 5.00e-8), (29.1241, 1.01444e-5),
+                (0.387098, 0.0), (0.205635, 5.59e-10), (168.6562, 4.0923344368)),
+    'Venus': ((76.6799, 2.46590e-5), (3.3946, 2.75e-8), (54.8910, 1.38374e-5),
+              (0.723330, 0.0), (0.006773, -1.302e-9), (48.0052, 1.6021302244)),
+    'Mars': ((49.5574, 2.11081e-5), (1.8497, -1.78e-8), (286.5016, 2.92961e-5),
+             (1.523688, 0.0), (0.093405, 2.516e-9), (18.6021, 0.5240207766)),
+    'Jupiter': ((100.4542, 2.76854e-5), (1.3030, -1.557e-7), (273.8777, 1.64505e-5),
+                (5.20256, 0.0), (0.048498, 4.469e-9), (19.8950, 0.0830853001)),
+    'Saturn': ((113.6634, 2.38980e-5), (2.4886, -1.081e-7), (339.3939, 2.97661e-5),
+               (9.55475, 0.0), (0.055546, -9.499e-9), (316.9670, 0.0334442282)),
+}
+
+def _heliocentric(xp, name: str, d):
+    """Heliocentric ecliptic x, y, z (AU) of a planet, with Jupiter/Saturn mutual perturbations"""
+    N, i, w, a, e, M = (start + rate * d for start, rate in PLANET_ELEMENTS[name])
+    E = _eccentric_anomaly(xp, M % 360.0, e)
+    xv = a * (xp.cosd(E) - e)
+    yv = a * xp.sqrt(1.0 - e * e) * xp.sind(E)
+    v = xp.atan2d(yv, xv)
+    r = xp.hypot(xv, yv)
+    lon = xp.atan2d(r * (xp.sind(N) * xp.cosd(v + w) + xp.cosd(N) * xp.sind(v + w) * xp.cosd(i)),
+                    r * (xp.cosd(N) * xp.cosd(v + w) - xp.sind(N) * xp.sind(v + w) * xp.cosd(i)))
+    lat = xp.asind(xp.sind(v + w) * xp.sind(i))
+
+    if name in ('Jupiter', 'Saturn'):
+        Mj = PLANET_ELEMENTS['Jupiter'][5][0] + PLANET_ELEMENTS['Jupiter'][5][1] * d
+        Ms = PLANET_ELEMENTS['Saturn'][5][0] + PLANET_ELEMENTS['Saturn'][5][1] * d
+        if name == 'Jupiter':
+            lon += (-0.332 * xp.sind(2 * Mj - 5 * Ms - 67.6)
+                    - 0.056 * xp.sind(2 * Mj - 2 * Ms + 21)
+                    + 0.042 * xp.sind(3 * Mj - 5 * Ms + 21)
+                    - 0.036 * xp.sind(Mj - 2 * Ms)
+                    + 0.022 * xp.cosd(Mj - Ms)
+                    + 0.023 * xp.sind(2 * Mj - 3 * Ms + 52)
+                    - 0.016 * xp.sind(Mj - 5 * Ms - 69))
+        else:
+            lon += (0.812 * xp.sind(2 * Mj - 5 * Ms - 67.6)
+                    - 0.229 * xp.cosd(2 * Mj - 4 * Ms - 2)
+                    + 0.119 * xp.sind(Mj - 2 * Ms - 3)
+                    + 0.046 * xp.sind(2 * Mj - 6 * Ms - 69)
+                    + 0.014 * xp.sind(Mj - 3 * Ms + 32))
+            lat += -0.020 * xp.cosd(2 * Mj - 4 * Ms - 2) + 0.018 * xp.sind(2 * Mj - 6 * Ms - 49)
+
+    return r * xp.cosd(lon) * xp.cosd(lat), r * xp.sind(lon) * xp.cosd(lat), r * xp.sind(lat)
+
+def planet_position(name: str, jd) -> Tuple:
+    """Tropical geocentric ecliptic longitude, latitude (degrees) and distance (AU) of a planet"""
+    xp = ops_for(jd)
+    xh, yh, zh = _heliocentric(xp, name, jd - SCHLYTER_EPOCH)
+    sun_lon, sun_r = sun_position(jd)
+    xg = xh + sun_r * xp.cosd(sun_lon)
+    yg = yh + sun_r * xp.sind(sun_lon)
+    return xp.atan2d(yg, xg) % 360.0, xp.atan2d(zh, xp.hypot(xg, yg)), xp.sqrt(xg * xg + yg * yg + zh * zh)
+
+def lunar_node(jd, true_node: bool = False):
+    """Tropical longitude of the Moon's ascending node (Rahu); Ketu is opposite"""
+    xp = ops_for(jd)
+    d = jd - SCHLYTER_EPOCH
+    N = 125.1228 - 0.0529538083 * d
+    if true_node:
+        # Main periodic terms (Meeus, ch. 47) from Schlyter's mean arguments
+        ws, _, Ms = _sun_elements(d)
+        M = 115.3654 + 13.0649929509 * d
+        Lm = M + 318.0634 + 0.1643573223 * d + N
+        D = Lm - (Ms + ws)
+        F = Lm - N
+        N = N + (-1.4979 * xp.sind(2 * (D - F))
+                 - 0.1500 * xp.sind(Ms)
+                 + 0.1226 * xp.sind(2 * D)
+                 + 0.1176 * xp.sind(2 * F)
+                 - 0.0801 * xp.sind(2 * (F - M)))
+    return N % 360.0
+
+def obliquity(jd):
+    """Obliquity of the ecliptic in degrees"""
+    return 23.4393 - 3.563e-7 * (jd - SCHLYTER_EPOCH)
+
+def sidereal_time(jd, longitude):
+    """Local mean sidereal time in degrees for an east-positive longitude"""
+    return (280.46061837 + 360.98564736629 * (jd - J2000) + longitude) % 360.0
+
+def ascendant(jd, latitude, longitude):
+    """Tropical longitude of the rising point of the ecliptic"""
+    xp = ops_for(jd)
+    theta = sidereal_time(jd, longitude)
+    eps = obliquity(jd)
+    return xp.atan2d(xp.cosd(theta), -(xp.sind(theta) * xp.cosd(eps) + xp.tand(latitude) * xp.sind(eps))) % 360.0
+
+def lahiri_ayanamsa(jd):
+    """Lahiri (Chitrapaksha) ayanamsa in degrees"""
+    T = (jd - J2000) / 36525.0
+    return 23.85306 + 1.396971 * T + 0.000308 * T * T
+
+def sidereal_longitudes(jd) -> Tuple:
+    """Sidereal (Lahiri) longitudes of the Sun and Moon"""
+    ayanamsa = lahiri_ayanamsa(jd)
+    return (sun_position(jd)[0] - ayanamsa) % 360.0, (moon_position(jd)[0] - ayanamsa) % 360.0
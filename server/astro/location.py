@@ -0,0 +1,47 @@
+from datetime import date, datetime, timedelta, timezone
+from typing import Mapping
+import pytz
+
+DEFAULT_LATITUDE = 28.6139    # New Delhi
+DEFAULT_LONGITUDE = 77.2090
+DEFAULT_TIMEZONE = 'Asia/Kolkata'
+
+class Location:
+    """An observer: coordinates in degrees (east/north positive) and a timezone"""
+
+    def __init__(self, latitude: float, longitude: float, tzinfo):
+        self.latitude = latitude
+        self.longitude = longitude
+        self.tzinfo = tzinfo
+
+    def utc_offset_hours(self, day: date) -> float:
+        """UTC offset in force at local noon on `day` (follows DST for named zones)"""
+        return self.tzinfo.utcoffset(datetime(day.year, day.month, day.day, 12)).total_seconds() / 3600.0
+
+    def to_utc(self, local: datetime) -> datetime:
+        """Naive UTC datetime for a naive local wall-clock time"""
+        return local - self.tzinfo.utcoffset(local)
+
+def parse_timezone(value: str):
+    """An IANA zone name ('Asia/Kolkata') or a fixed UTC offset in hours ('5.5', '-4')"""
+    try:
+        hours = float(value)
+    except ValueError:
+        try:
+            return pytz.timezone(value)
+        except pytz.UnknownTimeZoneError:
+            raise ValueError(f"Unknown timezone '{value}'")
+    if not -14 <= hours <= 14:
+        raise ValueError('tz offset must be between -14 and 14 hours')
+    return timezone(timedelta(hours=hours))
+
+def location_from_args(args: Mapping[str, str]) -> Location:
+    """Build a Location from lat/lon/tz query parameters (New Delhi by default)"""
+    try:
+        latitude = float(args.get('lat', DEFAULT_LATITUDE))
+        longitude = float(args.get('lon', DEFAULT_LONGITUDE))
+    except ValueError:
+        raise ValueError('lat and lon must be numbers in degrees')
+    if not (-90 <= latitude <= 90 and -180 <= longitude <= 180):
+        raise ValueError('lat must be within [-90, 90] and lon within [-180, 180]')
+    return Location(latitude, longitude, parse_timezone(args.get('tz', DEFAULT_TIMEZONE)))
@@ -0,0 +1,126 @@
+from datetime import date, timedelta
+from typing import Any, Dict, Iterable, List, Optional
+import numpy as np
+from astro.ephemeris import from_julian_day
+from astro.location import Location
+from astro.panchang import NAKSHATRAS, TITHIS, element_intervals, paksha_name
+from astro.timings import CHOGHADIYA_NAMES, CHOGHADIYA_QUALITY, daily_tables
+
+# Muhurta search: every minute of the range is classified against per-day
+# tables (sunrise, Rahu Kaal, choghadiya, ...) and the tithi/nakshatra
+# transition lists by array indexing, so a year (~525k minutes) is a few
+# dozen vectorized operations rather than a per-date computation.
+
+AVOIDABLE_PERIODS = ('rahuKaal', 'yamaganda', 'gulikaKaal')
+
+# Minute score used for ranking: choghadiya quality, plus bonuses inside
+# Abhijit muhurta and during Shukla paksha
+_CHOGHADIYA_SCORE = np.array([{'Good': 1.0, 'Neutral': 0.5, 'Bad': 0.0}[CHOGHADIYA_QUALITY[name]] for name in CHOGHADIYA_NAMES])
+ABHIJIT_BONUS = 1.0
+SHUKLA_BONUS = 0.5
+
+def _local_minute(jd: float, tzinfo) -> str:
+    """Julian day on the minute grid as ISO 8601 local time (rounded, not truncated)"""
+    return (from_julian_day(jd) + timedelta(seconds=30)).astimezone(tzinfo).isoformat(timespec='minutes')
+
+def _within(minute: np.ndarray, period, day: np.ndarray) -> np.ndarray:
+    start, end = period
+    return (minute >= start[day]) & (minute < end[day])
+
+def _slot(minute: np.ndarray, starts: np.ndarray, length: np.ndarray, day: np.ndarray) -> np.ndarray:
+    """Which of the eight choghadiya slots (0-7) a minute falls in"""
+    with np.errstate(invalid='ignore'):
+        slot = np.floor((minute - starts[day]) / length[day])
+    return np.clip(np.nan_to_num(slot), 0, 7).astype(int)
+
+def search_muhurta(start_date: date, days: int, location: Location,
+                   tithis: Optional[Iterable[int]] = None,
+                   nakshatras: Optional[Iterable[int]] = None,
+                   weekdays: Optional[Iterable[int]] = None,
+                   paksha: Optional[str] = None,
+                   avoid: Iterable[str] = ('rahuKaal',),
+                   daytime_only: bool = True,
+                   min_minutes: int = 30,
+                   limit: int = 20) -> List[Dict[str, Any]]:
+    """
+    Ranked windows of at least `min_minutes` within `days` days from
+    start_date in which every constraint holds. Windows never span two
+    choghadiyas, so each has one quality and score. tithis/nakshatras are
+    indexes into TITHIS/NAKSHATRAS, weekdays are Sunday-first, paksha is
+    'shukla' or 'krishna'; None means unconstrained.
+    """
+    # The day before start_date supplies the night running up to its sunrise
+    tables = daily_tables(start_date - timedelta(days=1), days + 1, location)
+    timings = tables['timings']
+    sunrise, sunset = tables['sunrise'], tables['sunset']
+
+    minutes = np.arange(days * 1440)
+    civil_day = minutes // 1440 + 1
+    clock = minutes % 1440
+    jd = tables['midnight'][civil_day] + clock / 1440.0
+
+    # The sunrise-to-sunrise day each minute belongs to, and minutes since its midnight
+    with np.errstate(invalid='ignore'):
+        before_sunrise = clock < sunrise[civil_day]
+        daytime = ~before_sunrise & (clock < sunset[civil_day])
+    day = civil_day - before_sunrise
+    minute = clock + 1440 * before_sunrise
+
+    allowed = daytime.copy() if daytime_only else np.ones(minutes.shape, dtype=bool)
+    if weekdays is not None:
+        # The vara runs sunrise to sunrise, so the hours before sunrise keep the previous weekday
+        allowed &= np.isin(tables['weekday'][day], list(weekdays))
+    for name in avoid:
+        allowed &= ~_within(minute, timings[name], day)
+
+    tithi_bounds, tithi_labels = element_intervals('tithi', jd[0] - 1, jd[-1] + 1)
+    tithi = tithi_labels[np.searchsorted(tithi_bounds, jd, side='right')]
+    nakshatra_bounds, nakshatra_labels = element_intervals('nakshatra', jd[0] - 1, jd[-1] + 1)
+    nakshatra = nakshatra_labels[np.searchsorted(nakshatra_bounds, jd, side='right')]
+    if tithis is not None:
+        allowed &= np.isin(tithi, list(tithis))
+    if nakshatras is not None:
+        allowed &= np.isin(nakshatra, list(nakshatras))
+    if paksha == 'shukla':
+        allowed &= tithi < 15
+    elif paksha == 'krishna':
+        allowed &= tithi >= 15
+
+    day_starts, _, day_names = timings['choghadiyaDay']
+    night_starts, _, night_names = timings['choghadiyaNight']
+    day_slot = _slot(minute, day_starts[:, 0], (sunset - sunrise) / 8.0, day)
+    night_slot = _slot(minute, night_starts[:, 0], (night_starts[:, 1] - night_starts[:, 0]), day)
+    choghadiya = np.where(daytime, day_names[day, day_slot], night_names[day, night_slot])
+    slot_id = day * 16 + np.where(daytime, day_slot, 8 + night_slot)
+    score = (_CHOGHADIYA_SCORE[choghadiya]
+             + ABHIJIT_BONUS * _within(minute, timings['abhijitMuhurta'], day)
+             + SHUKLA_BONUS * (tithi < 15))
+
+    # A window starts/ends where the constraints or the choghadiya change
+    changed = slot_id[1:] != slot_id[:-1]
+    opens = np.concatenate(([True], ~allowed[:-1] | changed))
+    closes = np.concatenate((~allowed[1:] | changed, [True]))
+    starts = np.nonzero(allowed & opens)[0]
+    ends = np.nonzero(allowed & closes)[0] + 1
+    keep = ends - starts >= min_minutes
+    starts, ends = starts[keep], ends[keep]
+    cumulative = np.concatenate(([0.0], np.cumsum(score)))
+    mean_score = (cumulative[ends] - cumulative[starts]) / (ends - starts)
+
+    ranked = np.lexsort((starts, -(ends - starts), -mean_score))[:limit]
+    windows = []
+    for i in ranked:
+        first, last = starts[i], ends[i] - 1
+        windows.append({
+            'start': _local_minute(jd[first], location.tzinfo),
+            'end': _local_minute(jd[last] + 1 / 1440.0, location.tzinfo),
+            'durationMinutes': int(ends[i] - starts[i]),
+            'score': round(float(mean_score[i]), 3),
+            'dayName': tables['dates'][civil_day[first]].strftime('%A'),
+            'vara': tables['dates'][day[first]].strftime('%A'),
+            'tithi': TITHIS[tithi[first]],
+            'paksha': paksha_name(tithi[first]),
+            'nakshatra': NAKSHATRAS[nakshatra[first]],
+            'choghadiya': CHOGHADIYA_NAMES[choghadiya[first]],
+        })
+    return windows
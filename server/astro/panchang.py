@@ -0,0 +1,166 @@
+import math
+from typing import Any, Callable, Dict
+import numpy as np
+from astro.chebyshev import sidereal_longitudes
+
+TITHIS = ['Pratipada', 'Dwitiya', 'Tritiya', 'Chaturthi', 'Panchami', 'Shashthi', 'Saptami', 'Ashtami', 'Navami', 'Dashami', 'Ekadashi', 'Dwadashi', 'Trayodashi', 'Chaturdashi', 'Purnima', 'Pratipada', 'Dwitiya', 'Tritiya', 'Chaturthi', 'Panchami', 'Shashthi', 'Saptami', 'Ashtami', 'Navami', 'Dashami', 'Ekadashi', 'Dwadashi', 'Trayodashi', 'Chaturdashi', 'Amavasya']
+
+NAKSHATRAS = ['Ashwini', 'Bharani', 'Krittika', 'Rohini', 'Mrigashira', 'Ardra', 'Punarvasu', 'Pushya', 'Ashlesha', 'Magha', 'Purva Phalguni', 'Uttara Phalguni', 'Hasta', 'Chitra', 'Swati', 'Vishakha', 'Anuradha', 'Jyeshtha', 'Mula', 'Purva Ashadha', 'Uttara Ashadha', 'Shravana', 'Dhanishta', 'Shatabhisha', 'Purva Bhadrapada', 'Uttara Bhadrapada', 'Revati']
+
+YOGAS = ['Vishkumbha', 'Priti', 'Ayushman', 'Saubhagya', 'Shobhana', 'Atiganda', 'Sukarman', 'Dhriti', 'Shula', 'Ganda', 'Vriddhi', 'Dhruva', 'Vyaghata', 'Harshana', 'Vajra', 'Siddhi', 'Vyatipata', 'Variyan', 'Parigha', 'Shiva', 'Siddha', 'Sadhya', 'Shubha', 'Shukla', 'Brahma', 'Indra', 'Vaidhriti']
+
+# The seven movable karanas repeat eight times from the second half of
+# Shukla Pratipada; the four fixed ones fill the remaining half-tithis
+# (Kimstughna first, then Shakuni, Chatushpada and Naga at the month's end).
+MOVABLE_KARANAS = ['Bava', 'Balava', 'Kaulava', 'Taitila', 'Garija', 'Vanija', 'Vishti']
+FIXED_KARANAS = ['Shakuni', 'Chatushpada', 'Naga']
+KARANAS = ['Kimstughna'] + MOVABLE_KARANAS + FIXED_KARANAS
+
+TITHI_SPAN = 12.0
+KARANA_SPAN = 6.0
+NAKSHATRA_SPAN = 360.0 / 27
+
+# Mean daily motion of each quantity, the secant search's first step
+_ELONGATION_RATE = 12.19
+_MOON_RATE = 13.18
+_YOGA_RATE = 14.17
+
+_TOLERANCE_DEG = 1e-4   # ~1 second of lunar motion
+_MAX_ITERATIONS = 8
+
+def karana_name(half_tithi: int) -> str:
+    """Karana for a half-tithi index 0-59 counted from the new moon"""
+    if half_tithi == 0:
+        return 'Kimstughna'
+    if half_tithi >= 57:
+        return FIXED_KARANAS[half_tithi - 57]
+    return MOVABLE_KARANAS[(half_tithi - 1) % 7]
+
+def paksha_name(tithi_index: int) -> str:
+    return 'Shukla Paksha (Waxing Moon)' if tithi_index < 15 else 'Krishna Paksha (Waning Moon)'
+
+def _elongation(jd: float) -> float:
+    sun, moon = sidereal_longitudes(jd)
+    return (moon - sun) % 360.0
+
+def _moon(jd: float) -> float:
+    return sidereal_longitudes(jd)[1]
+
+def _yoga_sum(jd: float) -> float:
+    sun, moon = sidereal_longitudes(jd)
+    return (sun + moon) % 360.0
+
+# Angle, span and mean daily rate of each element; no element lasts less than
+# about nine hours, so a six-hour grid sees every transition
+_ELEMENTS = {
+    'tithi': (_elongation, TITHI_SPAN, _ELONGATION_RATE),
+    'karana': (_elongation, KARANA_SPAN, _ELONGATION_RATE),
+    'nakshatra': (_moon, NAKSHATRA_SPAN, _MOON_RATE),
+    'yoga': (_yoga_sum, NAKSHATRA_SPAN, _YOGA_RATE),
+}
+_TRANSITION_GRID_DAYS = 0.25
+
+def next_boundary(angle: Callable[[float], float], jd: float, value: float, span: float, rate: float) -> float:
+    """
+    Julian day at which `angle` (degrees, increasing, currently `value`)
+    next reaches a multiple of `span`, by secant iteration from jd.
+    """
+    target = (math.floor(value / span) + 1) * span
+    t0, g0 = jd, value - target
+    t1 = jd - g0 / rate
+    for _ in range(_MAX_ITERATIONS):
+        g1 = (angle(t1) - target + 180.0) % 360.0 - 180.0
+        if abs(g1) < _TOLERANCE_DEG or g1 == g0:
+            break
+        t0, g0, t1 = t1, g1, t1 - g1 * (t1 - t0) / (g1 - g0)
+    return t1
+
+def next_boundaries(angle: Callable, jd: np.ndarray, value: np.ndarray, span: float, rate: float) -> np.ndarray:
+    """next_boundary() for an array of start times, iterating all of them together"""
+    target = (np.floor(value / span) + 1) * span
+    t0, g0 = jd, value - target
+    t1 = jd - g0 / rate
+    for _ in range(_MAX_ITERATIONS):
+        g1 = (angle(t1) - target + 180.0) % 360.0 - 180.0
+        if np.all(np.abs(g1) < _TOLERANCE_DEG):
+            break
+        slope = g1 - g0
+        moving = slope != 0
+        step = np.divide(g1 * (t1 - t0), slope, out=np.zeros_like(g1), where=moving)
+        t0, g0, t1 = t1, g1, t1 - step
+    return t1
+
+def compute_panchang(jd: float) -> Dict[str, Any]:
+    """
+    Tithi, paksha, nakshatra, yoga and karana in force at Julian day `jd`,
+    each with the Julian day at which it ends.
+    """
+    sun, moon = sidereal_longitudes(jd)
+    elongation = (moon - sun) % 360.0
+    yoga_sum = (sun + moon) % 360.0
+
+    tithi_index = int(elongation // TITHI_SPAN)
+    half_tithi = int(elongation // KARANA_SPAN)
+    nakshatra_index = int(moon // NAKSHATRA_SPAN)
+    yoga_index = int(yoga_sum // NAKSHATRA_SPAN)
+
+    tithi_end = next_boundary(_elongation, jd, elongation, TITHI_SPAN, _ELONGATION_RATE)
+    # A tithi's second karana ends with the tithi itself
+    karana_end = tithi_end if half_tithi % 2 else next_boundary(_elongation, jd, elongation, KARANA_SPAN, _ELONGATION_RATE)
+
+    return {
+        'tithiIndex': tithi_index,
+        'tithi': TITHIS[tithi_index],
+        'tithiEnd': tithi_end,
+        'paksha': paksha_name(tithi_index),
+        'nakshatraIndex': nakshatra_index,
+        'nakshatra': NAKSHATRAS[nakshatra_index],
+        'nakshatraEnd': next_boundary(_moon, jd, moon, NAKSHATRA_SPAN, _MOON_RATE),
+        'yogaIndex': yoga_index,
+        'yoga': YOGAS[yoga_index],
+        'yogaEnd': next_boundary(_yoga_sum, jd, yoga_sum, NAKSHATRA_SPAN, _YOGA_RATE),
+        'karanaIndex': half_tithi,
+        'karana': karana_name(half_tithi),
+        'karanaEnd': karana_end,
+        'sunLongitude': sun,
+        'moonLongitude': moon,
+    }
+
+def compute_panchang_range(jd: np.ndarray) -> Dict[str, np.ndarray]:
+    """
+    compute_panchang() for an array of Julian days in one vectorized pass:
+    element indices (into TITHIS, NAKSHATRAS, YOGAS, karana_name) and end times.
+    """
+    sun, moon = sidereal_longitudes(jd)
+    elongation = (moon - sun) % 360.0
+    yoga_sum = (sun + moon) % 360.0
+
+    half_tithi = (elongation // KARANA_SPAN).astype(int)
+    tithi_end = next_boundaries(_elongation, jd, elongation, TITHI_SPAN, _ELONGATION_RATE)
+    half_end = next_boundaries(_elongation, jd, elongation, KARANA_SPAN, _ELONGATION_RATE)
+
+    return {
+        'tithiIndex': (elongation // TITHI_SPAN).astype(int),
+        'tithiEnd': tithi_end,
+        'nakshatraIndex': (moon // NAKSHATRA_SPAN).astype(int),
+        'nakshatraEnd': next_boundaries(_moon, jd, moon, NAKSHATRA_SPAN, _MOON_RATE),
+        'yogaIndex': (yoga_sum // NAKSHATRA_SPAN).astype(int),
+        'yogaEnd': next_boundaries(_yoga_sum, jd, yoga_sum, NAKSHATRA_SPAN, _YOGA_RATE),
+        'karanaIndex': half_tithi,
+        'karanaEnd': np.where(half_tithi % 2 == 1, tithi_end, half_end),
+    }
+
+def element_intervals(element: str, jd_start: float, jd_end: float):
+    """
+    Every transition of a panchang element ('tithi', 'karana', 'nakshatra' or
+    'yoga') between two Julian days: sorted boundary times and the element
+    index in force before, between and after them. Look a time up with
+    labels[np.searchsorted(boundaries, jd, side='right')].
+    """
+    angle, span, rate = _ELEMENTS[element]
+    grid = np.arange(jd_start, jd_end + _TRANSITION_GRID_DAYS, _TRANSITION_GRID_DAYS)
+    values = angle(grid)
+    index = (values // span).astype(int)
+    changes = np.nonzero(index[1:] != index[:-1])[0]
+    boundaries = next_boundaries(angle, grid[changes], values[changes], span, rate)
+    return boundaries, np.concatenate([index[:1], index[changes + 1]])
@@ -0,0 +1,105 @@
+from typing import Optional, Tuple
+
+# Birth places that can be given by name instead of coordinates: city ->
+# (latitude, longitude, IANA timezone). Anything else needs latitude,
+# longitude and tz from the client.
+PLACES = {
+    # India
+    'new delhi': (28.6139, 77.2090, 'Asia/Kolkata'),
+    'mumbai': (19.0760, 72.8777, 'Asia/Kolkata'),
+    'kolkata': (22.5726, 88.3639, 'Asia/Kolkata'),
+    'chennai': (13.0827, 80.2707, 'Asia/Kolkata'),
+    'bengaluru': (12.9716, 77.5946, 'Asia/Kolkata'),
+    'hyderabad': (17.3850, 78.4867, 'Asia/Kolkata'),
+    'ahmedabad': (23.0225, 72.5714, 'Asia/Kolkata'),
+    'pune': (18.5204, 73.8567, 'Asia/Kolkata'),
+    'jaipur': (26.9124, 75.7873, 'Asia/Kolkata'),
+    'lucknow': (26.8467, 80.9462, 'Asia/Kolkata'),
+    'kanpur': (26.4499, 80.3319, 'Asia/Kolkata'),
+    'nagpur': (21.1458, 79.0882, 'Asia/Kolkata'),
+    'indore': (22.7196, 75.8577, 'Asia/Kolkata'),
+    'bhopal': (23.2599, 77.4126, 'Asia/Kolkata'),
+    'patna': (25.5941, 85.1376, 'Asia/Kolkata'),
+    'varanasi': (25.3176, 82.9739, 'Asia/Kolkata'),
+    'chandigarh': (30.7333, 76.7794, 'Asia/Kolkata'),
+    'surat': (21.1702, 72.8311, 'Asia/Kolkata'),
+    'kochi': (9.9312, 76.2673, 'Asia/Kolkata'),
+    'thiruvananthapuram': (8.5241, 76.9366, 'Asia/Kolkata'),
+    'guwahati': (26.1445, 91.7362, 'Asia/Kolkata'),
+    'bhubaneswar': (20.2961, 85.8245, 'Asia/Kolkata'),
+    'amritsar': (31.6340, 74.8723, 'Asia/Kolkata'),
+    'dehradun': (30.3165, 78.0322, 'Asia/Kolkata'),
+    'visakhapatnam': (17.6868, 83.2185, 'Asia/Kolkata'),
+    'coimbatore': (11.0168, 76.9558, 'Asia/Kolkata'),
+    'madurai': (9.9252, 78.1198, 'Asia/Kolkata'),
+    'mysuru': (12.2958, 76.6394, 'Asia/Kolkata'),
+    'ujjain': (23.1765, 75.7885, 'Asia/Kolkata'),
+    'haridwar': (29.9457, 78.1642, 'Asia/Kolkata'),
+    'srinagar': (34.0837, 74.7973, 'Asia/Kolkata'),
+    # South Asia
+    'kathmandu': (27.7172, 85.3240, 'Asia/Kathmandu'),
+    'dhaka': (23.8103, 90.4125, 'Asia/Dhaka'),
+    'karachi': (24.8607, 67.0011, 'Asia/Karachi'),
+    'lahore': (31.5204, 74.3587, 'Asia/Karachi'),
+    'colombo': (6.9271, 79.8612, 'Asia/Colombo'),
+    # Rest of the world
+    'dubai': (25.2048, 55.2708, 'Asia/Dubai'),
+    'singapore': (1.3521, 103.8198, 'Asia/Singapore'),
+    'kuala lumpur': (3.1390, 101.6869, 'Asia/Kuala_Lumpur'),
+    'bangkok': (13.7563, 100.5018, 'Asia/Bangkok'),
+    'hong kong': (22.3193, 114.1694, 'Asia/Hong_Kong'),
+    'beijing': (39.9042, 116.4074, 'Asia/Shanghai'),
+    'shanghai': (31.2304, 121.4737, 'Asia/Shanghai'),
+    'tokyo': (35.6762, 139.6503, 'Asia/Tokyo'),
+    'sydney': (-33.8688, 151.2093, 'Australia/Sydney'),
+    'melbourne': (-37.8136, 144.9631, 'Australia/Melbourne'),
+    'auckland': (-36.8485, 174.7633, 'Pacific/Auckland'),
+    'london': (51.5074, -0.1278, 'Europe/London'),
+    'paris': (48.8566, 2.3522, 'Europe/Paris'),
+    'berlin': (52.5200, 13.4050, 'Europe/Berlin'),
+    'moscow': (55.7558, 37.6173, 'Europe/Moscow'),
+    'cairo': (30.0444, 31.2357, 'Africa/Cairo'),
+    'nairobi': (-1.2921, 36.8219, 'Africa/Nairobi'),
+    'johannesburg': (-26.2041, 28.0473, 'Africa/Johannesburg'),
+    'new york': (40.7128, -74.0060, 'America/New_York'),
+    'chicago': (41.8781, -87.6298, 'America/Chicago'),
+    'houston': (29.7604, -95.3698, 'America/Chicago'),
+    'los angeles': (34.0522, -118.2437, 'America/Los_Angeles'),
+    'san francisco': (37.7749, -122.4194, 'America/Los_Angeles'),
+    'toronto': (43.6532, -79.3832, 'America/Toronto'),
+    'vancouver': (49.2827, -123.1207, 'America/Vancouver'),
+    'mexico city': (19.4326, -99.1332, 'America/Mexico_City'),
+    'sao paulo': (-23.5505, -46.6333, 'America/Sao_Paulo'),
+}
+
+# Other spellings and former names
+ALIASES = {
+    'delhi': 'new delhi',
+    'bombay': 'mumbai',
+    'calcutta': 'kolkata',
+    'madras': 'chennai',
+    'bangalore': 'bengaluru',
+    'mysore': 'mysuru',
+    'trivandrum': 'thiruvananthapuram',
+    'cochin': 'kochi',
+    'benares': 'varanasi',
+    'banaras': 'varanasi',
+    'vizag': 'visakhapatnam',
+    'new york city': 'new york',
+    'nyc': 'new york',
+    'são paulo': 'sao paulo',
+}
+
+def resolve_place(place: Optional[str]) -> Optional[Tuple[str, float, float, str]]:
+    """
+    (name, latitude, longitude, timezone) for a known city, matched on the
+    text before the first comma ("Pune, India" -> Pune), else None.
+    """
+    if not place:
+        return None
+    name = ' '.join(str(place).split(',')[0].lower().split())
+    name = ALIASES.get(name, name)
+    if name not in PLACES:
+        return None
+    latitude, longitude, tz = PLACES[name]
+    return name.title(), latitude, longitude, tz
@@ -0,0 +1,87 @@
+from datetime import date, datetime
+from typing import Optional, Tuple
+import numpy as np
+from astro.ephemeris import J2000, julian_day, ops_for
+from services.cache import TTLCache
+
+# Sunrise and sunset from the NOAA solar calculator equations (Meeus,
+# "Astronomical Algorithms"), good to about a minute between +/-72 degrees
+# latitude. Times are minutes after local midnight.
+
+SUNRISE_ALTITUDE = -0.833   # refraction plus the Sun's semi-diameter
+
+# Locations are snapped to a 0.05 degree grid (about 5 km, under 15 s of
+# sunrise time) so every request for the same city shares one cache entry.
+GRID_DEGREES = 0.05
+
+sun_times_cache = TTLCache(ttl=7 * 86400, maxsize=4096)
+
+def solar_declination_and_equation_of_time(jd):
+    """Apparent solar declination (degrees) and equation of time (minutes)"""
+    xp = ops_for(jd)
+    T = (jd - J2000) / 36525.0
+    L0 = (280.46646 + T * (36000.76983 + T * 0.0003032)) % 360.0
+    M = 357.52911 + T * (35999.05029 - 0.0001537 * T)
+    e = 0.016708634 - T * (0.000042037 + 0.0000001267 * T)
+    center = (xp.sind(M) * (1.914602 - T * (0.004817 + 0.000014 * T))
+              + xp.sind(2 * M) * (0.019993 - 0.000101 * T)
+              + xp.sind(3 * M) * 0.000289)
+    omega = 125.04 - 1934.136 * T
+    apparent_longitude = L0 + center - 0.00569 - 0.00478 * xp.sind(omega)
+    mean_obliquity = 23.0 + (26.0 + (21.448 - T * (46.815 + T * (0.00059 - T * 0.001813))) / 60.0) / 60.0
+    obliquity = mean_obliquity + 0.00256 * xp.cosd(omega)
+
+    declination = xp.asind(xp.sind(obliquity) * xp.sind(apparent_longitude))
+    y = xp.tand(obliquity / 2.0) ** 2
+    equation_of_time = 4.0 * xp.degrees(
+        y * xp.sind(2 * L0)
+        - 2 * e * xp.sind(M)
+        + 4 * e * y * xp.sind(M) * xp.cosd(2 * L0)
+        - 0.5 * y * y * xp.sind(4 * L0)
+        - 1.25 * e * e * xp.sind(2 * M))
+    return declination, equation_of_time
+
+def sunrise_sunset(jd_noon, latitude: float, longitude: float, utc_offset_hours) -> Tuple:
+    """
+    Sunrise and sunset in minutes after local midnight for the day whose
+    local noon is `jd_noon` (float or array). Where the Sun does not rise or
+    set (polar day/night) the result is None for floats and NaN in arrays.
+    """
+    xp = ops_for(jd_noon)
+    declination, equation_of_time = solar_declination_and_equation_of_time(jd_noon)
+    cos_hour_angle = ((xp.sind(SUNRISE_ALTITUDE) - xp.sind(latitude) * xp.sind(declination))
+                      / (xp.cosd(latitude) * xp.cosd(declination)))
+    solar_noon = 720.0 - 4.0 * longitude - equation_of_time + utc_offset_hours * 60.0
+
+    if isinstance(cos_hour_angle, np.ndarray):
+        hour_angle = np.degrees(np.arccos(np.clip(cos_hour_angle, -1.0, 1.0)))
+        hour_angle = np.where(np.abs(cos_hour_angle) > 1.0, np.nan, hour_angle)
+    elif abs(cos_hour_angle) > 1.0:
+        return None, None
+    else:
+        hour_angle = xp.acosd(cos_hour_angle)
+    return solar_noon - 4.0 * hour_angle, solar_noon + 4.0 * hour_angle
+
+def local_noon_jd(day: date, utc_offset_hours: float) -> float:
+    return julian_day(datetime(day.year, day.month, day.day, 12)) - utc_offset_hours / 24.0
+
+def snap_to_grid(latitude: float, longitude: float) -> Tuple[float, float]:
+    return round(latitude / GRID_DEGREES) * GRID_DEGREES, round(longitude / GRID_DEGREES) * GRID_DEGREES
+
+def cached_sunrise_sunset(day: date, latitude: float, longitude: float,
+                          utc_offset_hours: float) -> Tuple[Optional[float], Optional[float]]:
+    """sunrise_sunset() for one date, memoized per grid cell, UTC offset and date"""
+    latitude, longitude = snap_to_grid(latitude, longitude)
+    key = (round(latitude, 4), round(longitude, 4), utc_offset_hours, day.toordinal())
+    times = sun_times_cache.get(key)
+    if times is None:
+        times = sunrise_sunset(local_noon_jd(day, utc_offset_hours), latitude, longitude, utc_offset_hours)
+        sun_times_cache.set(key, times)
+    return times
+
+def format_clock(minutes: Optional[float]) -> Optional[str]:
+    """Minutes after local midnight as HH:MM (None stays None)"""
+    if minutes is None:
+        return None
+    total = int(round(minutes)) % 1440
+    return f"{total // 60:02d}:{total % 60:02d}"
@@ -0,0 +1,128 @@
+from datetime import date, timedelta
+from typing import Any, Dict, List, Optional
+import numpy as np
+from astro.location import Location
+from astro.sun import format_clock, local_noon_jd, snap_to_grid, sunrise_sunset
+
+# Daily muhurta periods derived from sunrise, sunset and the weekday. All
+# tables are indexed from Sunday (0) to Saturday (6); times are minutes
+# after local midnight and may exceed 1440 for periods after midnight.
+
+# Which eighth of the daytime (1-8) each period occupies
+RAHU_KAAL_SEGMENT = np.array([8, 2, 7, 5, 6, 4, 3])
+YAMAGANDA_SEGMENT = np.array([5, 4, 3, 2, 1, 7, 6])
+GULIKA_SEGMENT = np.array([7, 6, 5, 4, 3, 2, 1])
+
+CHOGHADIYA_NAMES = ['Udveg', 'Char', 'Labh', 'Amrit', 'Kaal', 'Shubh', 'Rog']
+CHOGHADIYA_QUALITY = {
+    'Amrit': 'Good', 'Shubh': 'Good', 'Labh': 'Good', 'Char': 'Neutral',
+    'Udveg': 'Bad', 'Kaal': 'Bad', 'Rog': 'Bad',
+}
+# Index into CHOGHADIYA_NAMES of the first daytime choghadiya; the day steps
+# forward by one, the night starts five later and steps back by two.
+CHOGHADIYA_DAY_START = np.array([0, 3, 6, 2, 5, 1, 4])
+
+# Chaldean order; each hora's lord is the next in the list, and the first
+# hora after sunrise belongs to the weekday's lord.
+HORA_LORDS = ['Saturn', 'Jupiter', 'Mars', 'Sun', 'Venus', 'Mercury', 'Moon']
+HORA_DAY_START = np.array([3, 6, 2, 5, 1, 4, 0])
+
+MUHURTA_MINUTES = 48
+
+def sunday_first(day: date) -> int:
+    """Weekday index with Sunday = 0 (date.weekday() has Monday = 0)"""
+    return (day.weekday() + 1) % 7
+
+def compute_timings(sunrise: np.ndarray, sunset: np.ndarray, next_sunrise: np.ndarray,
+                    weekday: np.ndarray) -> Dict[str, np.ndarray]:
+    """
+    Muhurta periods for a batch of days. `next_sunrise` is the following
+    sunrise in minutes after the same midnight (i.e. about 1440 + sunrise);
+    `weekday` is Sunday-first. Each period comes back as start/end arrays.
+    """
+    daytime = sunset - sunrise
+    night = next_sunrise - sunset
+    eighth = daytime / 8.0
+
+    def segment(table):
+        start = sunrise + (table[weekday] - 1) * eighth
+        return start, start + eighth
+
+    steps = np.arange(8)
+    hours = np.arange(24)
+    day_start = CHOGHADIYA_DAY_START[weekday][:, None]
+    hora_start = np.where(hours < 12,
+                          sunrise[:, None] + hours * (daytime / 12.0)[:, None],
+                          sunset[:, None] + (hours - 12) * (night / 12.0)[:, None])
+    hora_duration = np.where(hours < 12, (daytime / 12.0)[:, None], (night / 12.0)[:, None])
+    abhijit_start = sunrise + 7 * daytime / 15.0
+
+    return {
+        'rahuKaal': segment(RAHU_KAAL_SEGMENT),
+        'yamaganda': segment(YAMAGANDA_SEGMENT),
+        'gulikaKaal': segment(GULIKA_SEGMENT),
+        'abhijitMuhurta': (abhijit_start, abhijit_start + daytime / 15.0),
+        'brahmaMuhurta': (sunrise - 2 * MUHURTA_MINUTES, sunrise - MUHURTA_MINUTES),
+        'choghadiyaDay': (sunrise[:, None] + steps * eighth[:, None],
+                          sunrise[:, None] + (steps + 1) * eighth[:, None],
+                          (day_start + steps) % 7),
+        'choghadiyaNight': (sunset[:, None] + steps * (night / 8.0)[:, None],
+                            sunset[:, None] + (steps + 1) * (night / 8.0)[:, None],
+                            (day_start + 5 - 2 * steps) % 7),
+        'hora': (hora_start, hora_start + hora_duration, (HORA_DAY_START[weekday][:, None] + hours) % 7),
+    }
+
+def _clock(minutes: float) -> Optional[str]:
+    return None if np.isnan(minutes) else format_clock(minutes)
+
+def _period(start: float, end: float) -> Dict[str, Optional[str]]:
+    return {'start': _clock(start), 'end': _clock(end)}
+
+def day_timings(timings: Dict[str, np.ndarray], i: int) -> Dict[str, Any]:
+    """JSON-ready timings for the i-th day of a compute_timings() batch"""
+    result: Dict[str, Any] = {}
+    for name in ('rahuKaal', 'yamaganda', 'gulikaKaal', 'abhijitMuhurta', 'brahmaMuhurta'):
+        start, end = timings[name]
+        result[name] = _period(start[i], end[i])
+
+    for name, key in (('day', 'choghadiyaDay'), ('night', 'choghadiyaNight')):
+        starts, ends, names = timings[key]
+        result.setdefault('choghadiya', {})[name] = [
+            dict(_period(starts[i][k], ends[i][k]), name=CHOGHADIYA_NAMES[names[i][k]],
+                 quality=CHOGHADIYA_QUALITY[CHOGHADIYA_NAMES[names[i][k]]])
+            for k in range(8)
+        ]
+
+    starts, ends, lords = timings['hora']
+    result['hora'] = [dict(_period(starts[i][k], ends[i][k]), lord=HORA_LORDS[lords[i][k]]) for k in range(24)]
+    return result
+
+def daily_tables(start_date: date, days: int, location: Location) -> Dict[str, Any]:
+    """
+    Per-day arrays for `days` consecutive local dates: the Julian day of local
+    midnight, sunrise/sunset (minutes, NaN where the Sun does not rise), the
+    Sunday-first weekday and the compute_timings() periods.
+    """
+    dates = [start_date + timedelta(days=i) for i in range(days + 1)]
+    offsets = np.array([location.utc_offset_hours(day) for day in dates])
+    latitude, longitude = snap_to_grid(location.latitude, location.longitude)
+    jd_noon = local_noon_jd(start_date, 0.0) + np.arange(days + 1, dtype=float) - offsets / 24.0
+    sunrise, sunset = sunrise_sunset(jd_noon, latitude, longitude, offsets)
+    weekday = np.array([sunday_first(day) for day in dates[:-1]])
+    return {
+        'dates': dates[:-1],
+        'midnight': jd_noon[:-1] - 0.5,
+        'sunrise': sunrise[:-1],
+        'sunset': sunset[:-1],
+        'weekday': weekday,
+        'timings': compute_timings(sunrise[:-1], sunset[:-1], sunrise[1:] + 1440.0, weekday),
+    }
+
+def timings_for_dates(start_date: date, days: int, location: Location) -> List[Dict[str, Any]]:
+    """Sunrise, sunset and muhurta timings for consecutive days in one batched call"""
+    tables = daily_tables(start_date, days, location)
+    return [
+        dict(day_timings(tables['timings'], i), date=day.strftime('%Y-%m-%d'), dayName=day.strftime('%A'),
+             sunrise=_clock(tables['sunrise'][i]), sunset=_clock(tables['sunset'][i]))
+        for i, day in enumerate(tables['dates'])
+    ]
@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+"""
+Local stand-in for the Gemini generateContent endpoint, used by the
+benchmarks so upstream latency is controlled and no network is needed.
+
+    python -m benchmarks.gemini_stub --port 8089 --latency 0.5 --distribution lognormal \
+        --error-rate 0.05 --malformed-rate 0.02
+
+Point the API at it with GEMINI_API_URL=http://127.0.0.1:8089/generate
+(and GEMINI_STREAM_API_URL=http://127.0.0.1:8089/stream?alt=sse for SSE).
+"""
+
+import argparse
+import json
+import math
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, Optional
+
+SIGNS = ['Aries', 'Taurus', 'Gemini', 'Cancer', 'Leo', 'Virgo',
+         'Libra', 'Scorpio', 'Sagittarius', 'Capricorn', 'Aquarius', 'Pisces']
+
+def canned_answer(prompt: str) -> Any:
+    """Return a plausible JSON answer for whichever route built the prompt"""
+    text = prompt.lower()
+    if 'tarot' in text:
+        cards = [{'name': name, 'image': '*', 'meaning': 'Upright meaning.', 'reversed': 'Reversed meaning.',
+                  'isReversed': False, 'position': position, 'suit': 'Major Arcana'}
+                 for name, position in [('The Fool', 'Past'), ('The Star', 'Present'), ('The World', 'Future')]]
+        return {'cards': cards, 'interpretation': 'Stub interpretation.', 'message': 'Stub message.'}
+    if 'for each of these zodiac signs' in text:
+        return [dict(canned_answer('daily horoscope'), sign=sign) for sign in SIGNS if sign.lower() in text]
+    if 'json array' in text:
+        return [{'id': str(i), 'name': f'Stub item {i}', 'date': '2025-01-0%d' % i, 'title': f'Stub event {i}',
+                 'description': 'Stub description.', 'type': 'cosmic', 'significance': 'Stub significance.',
+                 'category': 'general', 'solutions': ['Step one'], 'benefits': ['Peace'],
+                 'sanskrit': 'ॐ', 'transliteration': 'Om', 'meaning': 'Stub meaning.', 'bestTime': 'Sunrise',
+                 'repetitions': 108}
+                for i in range(1, 6)]
+    return {
+        'prediction': 'The stars favour steady progress today.', 'love': 'Stub love.', 'career': 'Stub career.',
+        'finance': 'Stub finance.', 'health': 'Stub health.', 'luckyColor': 'Blue', 'luckyNumber': 7,
+        'compatibility': 75, 'planetaryInfluence': 'Sun', 'element': 'Fire', 'quality': 'Fixed',
+        'message': 'Stub compatibility summary.', 'loveCompatibility': 'Stub.', 'friendshipCompatibility': 'Stub.',
+        'businessCompatibility': 'Stub.', 'tips': ['Talk more'],
+        'weekStart': '2025-01-06', 'weekEnd': '2025-01-12', 'overallEnergy': 'Medium', 'predictions': ['Stub'],
+        'luckyDays': ['Monday'], 'challengingDays': ['Friday'],
+    }
+
+class StubSettings:
+    """Behaviour knobs shared by every handler thread"""
+
+    DISTRIBUTIONS = ('fixed', 'uniform', 'lognormal')
+
+    def __init__(self, latency: float = 0.5, distribution: str = 'fixed', jitter: float = 0.5,
+                 error_rate: float = 0.0, malformed_rate: float = 0.0, seed: Optional[int] = None):
+        if distribution not in self.DISTRIBUTIONS:
+            raise ValueError(f"distribution must be one of {', '.join(self.DISTRIBUTIONS)}")
+        self.latency = latency
+        self.distribution = distribution
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.malformed_rate = malformed_rate
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def next_latency(self) -> float:
+        """
+        fixed: always `latency`; uniform: latency +/- jitter*latency;
+        lognormal: median `latency` with shape `jitter`, giving a long tail.
+        """
+        if self.distribution == 'fixed' or self.latency <= 0:
+            return self.latency
+        with self._lock:
+            if self.distribution == 'uniform':
+                return max(0.0, self._random.uniform(self.latency * (1 - self.jitter), self.latency * (1 + self.jitter)))
+            return self._random.lognormvariate(math.log(self.latency), self.jitter)
+
+    def next_outcome(self) -> str:
+        """'error', 'malformed' or 'ok' for the next response"""
+        with self._lock:
+            roll = self._random.random()
+        if roll < self.error_rate:
+            return 'error'
+        if roll < self.error_rate + self.malformed_rate:
+            return 'malformed'
+        return 'ok'
+
+def make_handler(settings: StubSettings):
+    class GeminiStubHandler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+
+        def log_message(self, format, *args):
+            pass
+
+        def do_POST(self):
+            length = int(self.headers.get('Content-Length', 0))
+            body: Dict[str, Any] = json.loads(self.rfile.read(length) or b'{}')
+            parts = body.get('contents', [{}])[0].get('parts', [])
+            prompt = ' '.join(part.get('text', '') for part in parts)
+
+            latency = settings.next_latency()
+            outcome = settings.next_outcome()
+            if outcome == 'error':
+                time.sleep(latency)
+                self._send(503, {'error': {'code': 503, 'message': 'The model is overloaded.', 'status': 'UNAVAILABLE'}})
+                return
+            text = '```json\n' + json.dumps(canned_answer(prompt)) + '\n```'
+            if outcome == 'malformed':
+                # Truncated mid-object, as when the model stops early
+                text = text[:len(text) // 2]
+            usage = {'promptTokenCount': len(prompt) // 4, 'candidatesTokenCount': len(text) // 4,
+                     'totalTokenCount': (len(prompt) + len(text)) // 4}
+            if 'stream' in self.path:
+                self._send_stream(text, usage, latency)
+                return
+            time.sleep(latency)
+            payload = {
+                'candidates': [{'content': {'parts': [{'text': text}]}}],
+                'usageMetadata': usage,
+            }
+            self._send(200, payload)
+
+        def _send_stream(self, text: str, usage: Dict[str, Any], latency: float, pieces: int = 8):
+            # Spread the latency over the chunks, like a model generating tokens
+            size = max(1, -(-len(text) // pieces))
+            chunks = [text[i:i + size] for i in range(0, len(text), size)]
+            self.send_response(200)
+            self.send_header('Content-Type', 'text/event-stream')
+            self.send_header('Connection', 'close')
+            self.end_headers()
+            self.close_connection = True
+            for index, chunk in enumerate(chunks):
+                time.sleep(latency / len(chunks))
+                event = {'candidates': [{'content': {'parts': [{'text': chunk}]}}]}
+                if index == len(chunks) - 1:
+                    event['usageMetadata'] = usage
+                self.wfile.write(f"data: {json.dumps(event)}\r\n\r\n".encode())
+                self.wfile.flush()
+
+        def _send(self, status: int, payload: Any):
+            data = json.dumps(payload).encode()
+            self.send_response(status)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+    return GeminiStubHandler
+
+def start_stub(port: int, settings: StubSettings) -> ThreadingHTTPServer:
+    """Start the stub on a daemon thread and return the server"""
+    server = ThreadingHTTPServer(('127.0.0.1', port), make_handler(settings))
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+def add_stub_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument('--latency', type=float, default=0.5, help='median upstream latency in seconds')
+    parser.add_argument('--distribution', choices=StubSettings.DISTRIBUTIONS, default='fixed')
+    parser.add_argument('--jitter', type=float, default=0.5, help='uniform spread (fraction) or lognormal sigma')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='fraction of calls answered with 503')
+    parser.add_argument('--malformed-rate', type=float, default=0.0, help='fraction of calls with truncated JSON')
+    parser.add_argument('--seed', type=int, default=None)
+
+def settings_from_args(args) -> StubSettings:
+    return StubSettings(args.latency, args.distribution, args.jitter, args.error_rate, args.malformed_rate, args.seed)
+
+def main():
+    parser = argparse.ArgumentParser(description='Local Gemini stand-in server')
+    parser.add_argument('--port', type=int, default=8089)
+    add_stub_arguments(parser)
+    args = parser.parse_args()
+
+    server = ThreadingHTTPServer(('127.0.0.1', args.port), make_handler(settings_from_args(args)))
+    server.daemon_threads = True
+    print(f"Gemini stub listening on http://127.0.0.1:{args.port}/generate")
+    server.serve_forever()
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""
+Offline load test for every API blueprint.
+
+Starts the local Gemini stub (latency distribution, error and malformed-JSON
+rates are configurable), points Config.EXTERNAL_APIS at it, serves the app
+in-process or under gunicorn, then drives each route in turn with N
+concurrent clients and reports throughput and p50/p95/p99 per route.
+
+    python -m benchmarks.load_test --concurrency 20 --duration 10 \
+        --latency 0.4 --distribution lognormal --error-rate 0.05
+    python -m benchmarks.load_test --server gevent --routes horoscope,panchang
+"""
+
+import argparse
+import logging
+import os
+import random
+import tempfile
+import threading
+from contextlib import contextmanager
+from datetime import date, timedelta
+from typing import Any, Callable, Dict, List, Optional
+from benchmarks.gemini_stub import SIGNS, add_stub_arguments, settings_from_args, start_stub
+from benchmarks.worker_benchmark import drive, gunicorn_server
+
+class Route:
+    """One endpoint to drive: how to build its path and (for POST) its body"""
+
+    def __init__(self, name: str, method: str, path: Callable[[bool], str],
+                 body: Optional[Callable[[bool], Dict[str, Any]]] = None):
+        self.name = name
+        self.method = method
+        self.path = path
+        self.body = body
+
+def _sign(vary: bool) -> str:
+    return random.choice(SIGNS).lower() if vary else 'leo'
+
+def _day(vary: bool) -> str:
+    offset = random.randint(0, 364) if vary else 0
+    return (date(2025, 1, 1) + timedelta(days=offset)).strftime('%Y-%m-%d')
+
+# With vary=True each request picks a random sign / date / category so caches
+# see a realistic key spread; with vary=False every request is identical.
+ROUTES: List[Route] = [
+    Route('health', 'GET', lambda vary: '/api/health'),
+    Route('zodiac', 'GET', lambda vary: '/api/zodiac'),
+    Route('horoscope', 'POST', lambda vary: '/api/horoscope',
+          lambda vary: {'fullName': 'Load Test', 'dateOfBirth': '1990-01-01', 'zodiacSign': _sign(vary),
+                        'gender': random.choice(['male', 'female']) if vary else 'female'}),
+    Route('horoscope_daily', 'GET', lambda vary: f'/api/horoscope/daily/{_sign(vary)}'),
+    Route('horoscope_ai', 'POST', lambda vary: '/api/horoscope/ai', lambda vary: {'zodiacSign': _sign(vary)}),
+    Route('panchang', 'GET', lambda vary: f'/api/panchang?date={_day(vary)}'),
+    Route('panchang_range', 'GET', lambda vary: f'/api/panchang/range?start={_day(vary)}&end=2025-12-31'),
+    Route('matchmaking', 'POST', lambda vary: '/api/matchmaking',
+          lambda vary: {'zodiacSign1': _sign(vary), 'zodiacSign2': _sign(vary)}),
+    Route('calendar', 'GET', lambda vary: f'/api/calendar?month={random.randint(1, 12) if vary else 1}&year=2025'),
+    Route('calendar_weekly', 'GET', lambda vary: '/api/calendar/weekly'),
+    Route('calendar_timings', 'GET', lambda vary: f'/api/calendar/timings?month={random.randint(1, 12) if vary else 1}&year=2025'),
+    Route('tarot', 'GET', lambda vary: '/api/tarot'),
+    Route('muhurta', 'POST', lambda vary: '/api/muhurta/search',
+          lambda vary: {'start': _day(vary), 'end': '2025-12-31', 'weekdays': ['Monday', 'Thursday'], 'paksha': 'Shukla'}),
+    Route('mantra', 'GET', lambda vary: '/api/mantra?category=' + (random.choice(['planetary', 'healing', 'zodiac']) if vary else 'planetary')),
+    Route('remedy', 'GET', lambda vary: '/api/remedy'),
+    Route('birth_chart', 'POST', lambda vary: '/api/birth-chart',
+          lambda vary: {'name': 'Load Test', 'date': _day(vary), 'time': '06:30', 'place': 'Delhi'}),
+    Route('birth_chart_batch', 'POST', lambda vary: '/api/birth-chart/batch',
+          lambda vary: [{'name': f'Load Test {i}', 'date': _day(vary), 'time': '06:30', 'place': 'Delhi'} for i in range(100)]),
+]
+
+@contextmanager
+def inprocess_server(port: int, stub_url: str, stream_url: str, cache_path: str):
+    """Serve the app on a threaded Werkzeug server in this process, wired to the stub"""
+    from config import Config
+    Config.EXTERNAL_APIS['gemini_api'] = stub_url
+    Config.EXTERNAL_APIS['gemini_stream_api'] = stream_url
+    Config.GEMINI_API_KEY = Config.GEMINI_API_KEY or 'benchmark'
+    Config.AI_LATENCY_BUDGET_MS = int(os.getenv('AI_LATENCY_BUDGET_MS', '0'))
+    Config.ENABLE_DAILY_PREGENERATION = False
+    Config.GEMINI_RPM = int(os.getenv('GEMINI_RPM', '0'))
+    Config.GEMINI_TPM = int(os.getenv('GEMINI_TPM', '0'))
+    Config.PERSISTENT_CACHE_PATH = cache_path
+
+    from werkzeug.serving import make_server
+    from app import app
+    logging.getLogger('werkzeug').setLevel(logging.ERROR)
+    server = make_server('127.0.0.1', port, app, threaded=True)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield f"http://127.0.0.1:{port}"
+    finally:
+        server.shutdown()
+
+def main():
+    parser = argparse.ArgumentParser(description='Load-test every blueprint against the local Gemini stub')
+    parser.add_argument('--server', default='inprocess',
+                        help="'inprocess' (threaded Werkzeug) or a gunicorn worker class such as sync or gevent")
+    parser.add_argument('--workers', type=int, default=1, help='gunicorn workers')
+    parser.add_argument('--routes', default='', help='comma-separated route names (default: all)')
+    parser.add_argument('--concurrency', type=int, default=20)
+    parser.add_argument('--duration', type=float, default=10.0, help='seconds per route')
+    parser.add_argument('--no-vary', dest='vary', action='store_false',
+                        help='send identical requests (measures the fully cached path)')
+    parser.add_argument('--port', type=int, default=5056)
+    parser.add_argument('--stub-port', type=int, default=8090)
+    add_stub_arguments(parser)
+    args = parser.parse_args()
+
+    wanted = {name.strip() for name in args.routes.split(',') if name.strip()}
+    unknown = wanted - {route.name for route in ROUTES}
+    if unknown:
+        parser.error(f"unknown routes: {', '.join(sorted(unknown))}")
+    routes = [route for route in ROUTES if not wanted or route.name in wanted]
+
+    stub = start_stub(args.stub_port, settings_from_args(args))
+    stub_url = f"http://127.0.0.1:{args.stub_port}/generate"
+    stream_url = f"http://127.0.0.1:{args.stub_port}/stream?alt=sse"
+    # A fresh persistent cache per run, so results do not depend on earlier runs
+    cache_dir = tempfile.mkdtemp(prefix='load-test-')
+    cache_path = os.path.join(cache_dir, 'response_cache.db')
+
+    if args.server == 'inprocess':
+        server = inprocess_server(args.port, stub_url, stream_url, cache_path)
+    else:
+        server = gunicorn_server(args.server, args.port, args.workers, stub_url, {
+            'GEMINI_STREAM_API_URL': stream_url,
+            'PERSISTENT_CACHE_PATH': cache_path,
+        })
+
+    print(f"server={args.server}  concurrency={args.concurrency}  duration={args.duration:.0f}s/route  "
+          f"upstream={args.distribution} {args.latency * 1000:.0f}ms  errors={args.error_rate:.0%}  "
+          f"malformed={args.malformed_rate:.0%}  vary={args.vary}")
+    print(f"{'route':<18}{'req':>8}{'err':>6}{'req/s':>9}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}")
+    try:
+        with server as base_url:
+            for route in routes:
+                body = (lambda route=route: route.body(args.vary)) if route.body else None
+                r = drive(base_url, lambda route=route: route.path(args.vary), args.concurrency, args.duration,
+                          method=route.method, body=body)
+                print(f"{route.name:<18}{r['requests']:>8}{r['errors']:>6}{r['throughput']:>9.1f}"
+                      f"{r['p50'] * 1000:>9.0f}{r['p95'] * 1000:>9.0f}{r['p99'] * 1000:>9.0f}")
+    finally:
+        stub.shutdown()
+
+if __name__ == '__main__':
+    main()
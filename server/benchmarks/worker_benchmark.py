@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""
+Compare gunicorn worker classes against the local Gemini stub.
+
+Starts the stub, then for each worker class boots gunicorn with
+gunicorn.conf.py, drives an uncached AI endpoint with N concurrent clients
+for a fixed duration and reports throughput and latency percentiles.
+
+    python -m benchmarks.worker_benchmark --worker-classes sync,gevent --concurrency 50
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, List, Optional, Union
+import requests
+from benchmarks.gemini_stub import add_stub_arguments, settings_from_args, start_stub
+
+SERVER_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def percentile(values: List[float], pct: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(pct / 100.0 * (len(ordered) - 1))))
+    return ordered[index]
+
+def wait_for_server(base_url: str, timeout: float = 30.0) -> bool:
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            if requests.get(f"{base_url}/api/health", timeout=1).status_code == 200:
+                return True
+        except requests.RequestException:
+            pass
+        time.sleep(0.2)
+    return False
+
+def drive(base_url: str, path: Union[str, Callable[[], str]], concurrency: int, duration: float, method: str = 'GET',
+          body: Optional[Callable[[], Any]] = None) -> Dict[str, float]:
+    """
+    Hammer one endpoint with `concurrency` closed-loop clients for `duration`
+    seconds. `path` may be a callable returning a fresh path per request and
+    `body` builds the JSON payload for each request (POST routes).
+    """
+    latencies: List[float] = []
+    errors = [0]
+    lock = threading.Lock()
+    deadline = time.time() + duration
+
+    def client():
+        session = requests.Session()
+        while time.time() < deadline:
+            start = time.perf_counter()
+            try:
+                ok = session.request(method, base_url + (path() if callable(path) else path), json=body() if body else None,
+                                     timeout=60).status_code == 200
+            except requests.RequestException:
+                ok = False
+            elapsed = time.perf_counter() - start
+            with lock:
+                if ok:
+                    latencies.append(elapsed)
+                else:
+                    errors[0] += 1
+
+    threads = [threading.Thread(target=client) for _ in range(concurrency)]
+    started = time.time()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    wall = time.time() - started
+    return {
+        'requests': len(latencies),
+        'errors': errors[0],
+        'throughput': len(latencies) / wall if wall else 0.0,
+        'p50': percentile(latencies, 50),
+        'p95': percentile(latencies, 95),
+        'p99': percentile(latencies, 99),
+    }
+
+@contextmanager
+def gunicorn_server(worker_class: str, port: int, workers: int, stub_url: str, extra_env: Optional[Dict[str, str]] = None):
+    """Run gunicorn with gunicorn.conf.py pointed at the stub; yields the base URL"""
+    env = dict(os.environ)
+    env.update({
+        'PORT': str(port),
+        'GUNICORN_WORKER_CLASS': worker_class,
+        'GUNICORN_WORKERS': str(workers),
+        'GEMINI_API_URL': stub_url,
+        'GEMINI_API_KEY': env.get('GEMINI_API_KEY') or 'benchmark',
+        # Measure raw upstream concurrency: no budget cut-off, no warm-up jobs and
+        # no client-side quota unless GEMINI_RPM / GEMINI_TPM are set explicitly
+        'AI_LATENCY_BUDGET_MS': '0',
+        'ENABLE_DAILY_PREGENERATION': 'false',
+        'GEMINI_RPM': os.environ.get('GEMINI_RPM', '0'),
+        'GEMINI_TPM': os.environ.get('GEMINI_TPM', '0'),
+    })
+    env.update(extra_env or {})
+    proc = subprocess.Popen(
+        [sys.executable, '-m', 'gunicorn', 'wsgi:app', '--config', 'gunicorn.conf.py'],
+        cwd=SERVER_DIR, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    base_url = f"http://127.0.0.1:{port}"
+    try:
+        if not wait_for_server(base_url):
+            raise RuntimeError(f"gunicorn ({worker_class}) did not start")
+        yield base_url
+    finally:
+        proc.terminate()
+        proc.wait(timeout=30)
+
+def run_worker_class(worker_class: str, args, stub_url: str) -> Dict[str, float]:
+    with gunicorn_server(worker_class, args.port, args.workers, stub_url) as base_url:
+        return drive(base_url, args.path, args.concurrency, args.duration)
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark gunicorn worker classes against the Gemini stub')
+    parser.add_argument('--worker-classes', default='sync,gevent')
+    parser.add_argument('--workers', type=int, default=1)
+    parser.add_argument('--concurrency', type=int, default=50)
+    parser.add_argument('--duration', type=float, default=15.0)
+    parser.add_argument('--path', default='/api/tarot', help='endpoint to drive (should not be cached)')
+    parser.add_argument('--port', type=int, default=5055)
+    parser.add_argument('--stub-port', type=int, default=8089)
+    add_stub_arguments(parser)
+    args = parser.parse_args()
+
+    stub = start_stub(args.stub_port, settings_from_args(args))
+    stub_url = f"http://127.0.0.1:{args.stub_port}/generate"
+
+    print(f"GET {args.path}  concurrency={args.concurrency}  duration={args.duration:.0f}s  "
+          f"upstream latency={args.latency * 1000:.0f}ms  workers={args.workers}")
+    print(f"{'worker':<10}{'req':>8}{'err':>6}{'req/s':>9}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}")
+    try:
+        for worker_class in [w.strip() for w in args.worker_classes.split(',') if w.strip()]:
+            r = run_worker_class(worker_class, args, stub_url)
+            print(f"{worker_class:<10}{r['requests']:>8}{r['errors']:>6}{r['throughput']:>9.1f}"
+                  f"{r['p50'] * 1000:>9.0f}{r['p95'] * 1000:>9.0f}{r['p99'] * 1000:>9.0f}")
+    finally:
+        stub.shutdown()
+
+if __name__ == '__main__':
+    main()
@@ -1,4 +1,5 @@
 import os
+import tempfile
 from typing import Dict, Any
 
 class Config:
@@ -9,7 +10,8 @@ class Config:
     
     # External API endpoints
     EXTERNAL_APIS = {
-        'gemini_api': 'https://generativelanguage.googleapis.com/v1beta/models/gemini-2.0-flash:generateContent',
+        'gemini_api': os.getenv('GEMINI_API_URL', 'https://generativelanguage.googleapis.com/v1beta/models/gemini-2.0-flash:generateContent'),
+        'gemini_stream_api': os.getenv('GEMINI_STREAM_API_URL', 'https://generativelanguage.googleapis.com/v1beta/models/gemini-2.0-flash:streamGenerateContent?alt=sse'),
     }
     
     # AI Model configurations
@@ -21,9 +23,83 @@ class Config:
         },
     }
     
+    # Shared Gemini HTTP client (connection pooling / keep-alive)
+    GEMINI_POOL_CONNECTIONS = int(os.getenv('GEMINI_POOL_CONNECTIONS', '4'))
+    GEMINI_POOL_MAXSIZE = int(os.getenv('GEMINI_POOL_MAXSIZE', '32'))
+    GEMINI_CONNECT_TIMEOUT = float(os.getenv('GEMINI_CONNECT_TIMEOUT', '3.05'))
+    GEMINI_READ_TIMEOUT = float(os.getenv('GEMINI_READ_TIMEOUT', '15'))
+    
+    # Circuit breaker around Gemini (one breaker per calling endpoint)
+    CIRCUIT_FAILURE_RATE = float(os.getenv('CIRCUIT_FAILURE_RATE', '0.5'))
+    CIRCUIT_SLOW_CALL_SECONDS = float(os.getenv('CIRCUIT_SLOW_CALL_SECONDS', '8'))
+    CIRCUIT_SLOW_CALL_RATE = float(os.getenv('CIRCUIT_SLOW_CALL_RATE', '0.5'))
+    CIRCUIT_WINDOW_SECONDS = float(os.getenv('CIRCUIT_WINDOW_SECONDS', '60'))
+    CIRCUIT_MINIMUM_CALLS = int(os.getenv('CIRCUIT_MINIMUM_CALLS', '4'))
+    CIRCUIT_OPEN_SECONDS = float(os.getenv('CIRCUIT_OPEN_SECONDS', '30'))
+    CIRCUIT_HALF_OPEN_PROBES = int(os.getenv('CIRCUIT_HALF_OPEN_PROBES', '1'))
+    
+    # Latency budget for AI-backed routes (stale-while-revalidate). 0 disables;
+    # clients can override per request with the X-Latency-Budget-Ms header.
+    AI_LATENCY_BUDGET_MS = int(os.getenv('AI_LATENCY_BUDGET_MS', '800'))
+    AI_LATENCY_BUDGET_MAX_MS = int(os.getenv('AI_LATENCY_BUDGET_MAX_MS', '20000'))
+    BACKGROUND_WORKERS = int(os.getenv('BACKGROUND_WORKERS', '8'))
+    
+    # Shared deadline when horoscope providers are raced and the client sent no
+    # X-Latency-Budget-Ms header (AI_LATENCY_BUDGET_MS is not used for the race);
+    # kept below gunicorn's 30 s worker timeout.
+    PROVIDER_DEADLINE_SECONDS = float(os.getenv('PROVIDER_DEADLINE_SECONDS', '25'))
+    PROVIDER_RACE_WORKERS = int(os.getenv('PROVIDER_RACE_WORKERS', '8'))
+    
+    # /api/metrics: each worker writes a snapshot here every METRICS_FLUSH_SECONDS
+    # (from a background thread) and the endpoint merges them across workers
+    METRICS_DIR = os.getenv('METRICS_DIR', os.path.join(tempfile.gettempdir(), 'horoscope_api_metrics'))
+    METRICS_FLUSH_SECONDS = float(os.getenv('METRICS_FLUSH_SECONDS', '1'))
+    
+    # Per-request profiling: send X-Profile: <PROFILE_TOKEN> to any /api route
+    # (header only, so the token stays out of access logs). Disabled while empty.
+    PROFILE_TOKEN = os.getenv('PROFILE_TOKEN', '')
+    PROFILE_DIR = os.getenv('PROFILE_DIR', os.path.join(tempfile.gettempdir(), 'horoscope_api_profiles'))
+    PROFILE_SAMPLE_INTERVAL_MS = float(os.getenv('PROFILE_SAMPLE_INTERVAL_MS', '5'))
+    
+    # Client-side Gemini quota shared by all workers (0 disables a bucket, the
+    # default). Set them to your key's limits, e.g. GEMINI_RPM=15 and
+    # GEMINI_TPM=1000000 for the gemini-2.0-flash free tier.
+    GEMINI_RPM = int(os.getenv('GEMINI_RPM', '0'))
+    GEMINI_TPM = int(os.getenv('GEMINI_TPM', '0'))
+    GEMINI_EXPECTED_OUTPUT_TOKENS = int(os.getenv('GEMINI_EXPECTED_OUTPUT_TOKENS', '400'))
+    QUOTA_MAX_WAIT_SECONDS = float(os.getenv('QUOTA_MAX_WAIT_SECONDS', '2'))
+    QUOTA_DB_PATH = os.getenv('QUOTA_DB_PATH', os.path.join(os.path.dirname(os.path.abspath(__file__)), 'gemini_quota.db'))
+    
     # Fallback settings
     ENABLE_FALLBACK = True
     CACHE_DURATION = 3600  # 1 hour in seconds
+    CACHE_MAX_ENTRIES = int(os.getenv('CACHE_MAX_ENTRIES', '512'))
+    CALENDAR_CACHE_DURATION = int(os.getenv('CALENDAR_CACHE_DURATION', '86400'))
+    PANCHANG_RANGE_MAX_DAYS = int(os.getenv('PANCHANG_RANGE_MAX_DAYS', '1830'))  # about five years
+    MUHURTA_MAX_DAYS = int(os.getenv('MUHURTA_MAX_DAYS', '366'))
+    MANTRA_CACHE_DURATION = int(os.getenv('MANTRA_CACHE_DURATION', '86400'))
+    BIRTH_CHART_NODE = os.getenv('BIRTH_CHART_NODE', 'mean')  # 'mean' or 'true' lunar node for Rahu/Ketu
+    BIRTH_CHART_BATCH_MAX = int(os.getenv('BIRTH_CHART_BATCH_MAX', '10000'))
+
+    # Browser/CDN Cache-Control max-age (seconds)
+    HTTP_MAX_AGE_PAST = int(os.getenv('HTTP_MAX_AGE_PAST', str(30 * 86400)))  # past dates never change
+    HTTP_MAX_AGE_STATIC = int(os.getenv('HTTP_MAX_AGE_STATIC', '86400'))  # static catalogs
+    HTTP_MAX_AGE_DAILY = int(os.getenv('HTTP_MAX_AGE_DAILY', '3600'))  # today and future dates
+    
+    # Persistent cache tier shared by all workers and kept across restarts
+    # (SQLite in WAL mode, next to accuracy_tracker.db). Empty path disables it.
+    PERSISTENT_CACHE_PATH = os.getenv('PERSISTENT_CACHE_PATH', os.path.join(os.path.dirname(os.path.abspath(__file__)), 'response_cache.db'))
+    PERSISTENT_CACHE_STALE_SECONDS = int(os.getenv('PERSISTENT_CACHE_STALE_SECONDS', str(7 * 86400)))
+    # Chebyshev ephemeris table built by `python -m astro.chebyshev` (analytic series when absent)
+    EPHEMERIS_TABLE_PATH = os.getenv('EPHEMERIS_TABLE_PATH', os.path.join(os.path.dirname(os.path.abspath(__file__)), 'ephemeris.bin'))
+    
+    # Daily horoscope pre-generation before midnight. Every worker starts the job,
+    # but only the one holding the lock file generates; the others stand by.
+    ENABLE_DAILY_PREGENERATION = os.getenv('ENABLE_DAILY_PREGENERATION', 'true').lower() == 'true'
+    PREGENERATION_LOCK_PATH = os.getenv('PREGENERATION_LOCK_PATH', os.path.join(tempfile.gettempdir(), 'horoscope_pregeneration.lock'))
+    PREGENERATION_LEAD_MINUTES = int(os.getenv('PREGENERATION_LEAD_MINUTES', '15'))
+    PREGENERATION_RETRY_SECONDS = int(os.getenv('PREGENERATION_RETRY_SECONDS', '300'))
+    HOROSCOPE_BATCH_TIMEOUT = 45  # one prompt answers for all twelve signs
     
     @classmethod
     def get_api_key(cls, service: str) -> str:
@@ -1,20 +1,40 @@
 # Gunicorn configuration for Render deployment
 import os
 
+if os.environ.get("GUNICORN_WORKER_CLASS", "sync") == "gevent":
+    # preload_app imports requests/ssl in the master, so patch before that
+    # happens rather than letting the worker patch too late.
+    from gevent import monkey
+    monkey.patch_all()
+
 # Server socket
 bind = "0.0.0.0:" + str(int(os.environ.get("PORT", 5000)))
 backlog = 2048
 
 # Worker processes
-workers = 1  # Free tier limitation - single worker
-worker_class = "sync"
-worker_connections = 1000
+workers = int(os.environ.get("GUNICORN_WORKERS", 1))  # Free tier limitation - single worker
+# "sync" handles one request at a time per worker. "gevent" lets hundreds of
+# requests waiting on Gemini share one process (see DEPLOYMENT.md).
+worker_class = os.environ.get("GUNICORN_WORKER_CLASS", "sync")
+worker_connections = int(os.environ.get("GUNICORN_WORKER_CONNECTIONS", 1000))
 max_requests = 1000
 max_requests_jitter = 50
 preload_app = True
 timeout = 30
 keepalive = 2
 
+# Server hooks
+def on_starting(server):
+    # Start /api/metrics from zero rather than merging a previous run's workers
+    from services import metrics
+    metrics.reset()
+
+def post_fork(server, worker):
+    # preload_app imports the app in the master; background threads started
+    # there would not exist in the forked workers, so start them here.
+    from app import start_background_jobs
+    start_background_jobs()
+
 # Logging
 accesslog = "-"
 errorlog = "-"
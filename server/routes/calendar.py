@@ -1,14 +1,90 @@
 from flask import Blueprint, request, jsonify
-from datetime import datetime, timedelta
+from datetime import date, datetime, timedelta
+import calendar
 import random
-import requests
 import json
 from typing import List, Dict, Any, Optional
 from config import Config
+from services import gemini_client, prompts
+from services import metrics
+from services.http_cache import cacheable, max_age_for_date, today_in
+from services.latency_budget import call_with_budget, get_latency_budget
+from services.persistent_cache import TieredCache
+from services.singleflight import upstream_flight
+from astro.location import location_from_args
+from astro.timings import timings_for_dates
 
 calendar_bp = Blueprint('calendar', __name__)
 
-def ai_generate_calendar_events(month: Optional[int] = None, year: Optional[int] = None) -> Optional[List[Dict[str, Any]]]:
+# Generated events for a month, shared across workers and restarts
+ai_calendar_cache = TieredCache('calendar', ttl=Config.CALENDAR_CACHE_DURATION, maxsize=Config.CACHE_MAX_ENTRIES)
+metrics.track_cache('calendar', ai_calendar_cache)
+
+CALENDAR_PROMPT = prompts.register('calendar', """
+    You are an expert astrologer who lists the notable cosmic events of a month.
+
+    Return ONLY a JSON array of 5-8 realistic events. Each object MUST have these fields:
+    - id: unique string (e.g., "1", "2")
+    - date: date in YYYY-MM-DD format (within the requested month)
+    - title: event title (e.g., "New Moon in Capricorn", "Mercury Retrograde")
+    - description: brief description (1-2 sentences)
+    - type: one of "cosmic", "zodiac", "planetary"
+    - significance: astrological significance (1-2 sentences)
+
+    Include a mix of:
+    - New/Full moons
+    - Planetary movements (retrogrades, transits)
+    - Zodiac sign changes
+    - Eclipses (if applicable)
+    - Major planetary aspects
+""", """
+    Generate the cosmic events for {month_name} {year}.
+""")
+
+WEEKLY_FORECAST_PROMPT = prompts.register('weekly_forecast', """
+    You are an expert astrologer who writes weekly forecasts.
+
+    Return ONLY a JSON object with these fields:
+    {
+      "weekStart": "first day of the week, YYYY-MM-DD",
+      "weekEnd": "last day of the week, YYYY-MM-DD",
+      "overallEnergy": "High|Medium|Low with brief explanation",
+      "predictions": ["4-6 specific predictions for the week"],
+      "luckyDays": ["3-4 days of the week"],
+      "challengingDays": ["2-3 days of the week"]
+    }
+
+    Make predictions specific to this week's astrological influences.
+""", """
+    Generate the weekly forecast for {week_range} (weekStart {week_start}, weekEnd {week_end}).
+""")
+
+def refresh_ai_calendar_events(month: int, year: int) -> Optional[List[Dict[str, Any]]]:
+    """Fetch a month's events from Gemini, coalescing concurrent requests for it, and cache them"""
+    cached = ai_calendar_cache.get((year, month))
+    if cached is not None:
+        return cached
+    events = upstream_flight.do(('calendar', year, month), get_gemini_calendar_events, month, year)
+    if events:
+        # Another worker may have generated the month first; everyone serves that one
+        events = ai_calendar_cache.set_shared((year, month), events)
+    return events
+
+def ai_generate_calendar_events(month: Optional[int] = None, year: Optional[int] = None,
+                                budget: Optional[float] = None) -> Optional[List[Dict[str, Any]]]:
+    """Generate calendar events using Gemini, cached per month, within an optional latency budget (seconds)"""
+    # Determine month and year
+    if month is None:
+        month = datetime.now().month
+    if year is None:
+        year = datetime.now().year
+    cached = ai_calendar_cache.get((year, month))
+    if cached is not None:
+        return list(cached)
+    events = call_with_budget(budget, refresh_ai_calendar_events, month, year) or ai_calendar_cache.get_stale((year, month))
+    return list(events) if events else None
+
+def get_gemini_calendar_events(month: int, year: int) -> Optional[List[Dict[str, Any]]]:
     """Generate calendar events using Gemini"""
     try:
         api_key = Config.get_api_key('gemini')
@@ -16,60 +92,14 @@ def ai_generate_calendar_events(month: Optional[int] = None, year: Optional[int]
             print("No valid Gemini API key found for calendar events")
             return None
 
-        # Determine month and year
-        if month is None:
-            month = datetime.now().month
-        if year is None:
-            year = datetime.now().year
-
         month_name = datetime(year, month, 1).strftime('%B')
         
-        prompt = f"""
-        You are an expert astrologer. Generate 5-8 realistic cosmic events for {month_name} {year}.
-        
-        Return ONLY a JSON array. Each object MUST have these fields:
-        - id: unique string (e.g., "1", "2")
-        - date: date in YYYY-MM-DD format (within {month_name} {year})
-        - title: event title (e.g., "New Moon in Capricorn", "Mercury Retrograde")
-        - description: brief description (1-2 sentences)
-        - type: one of "cosmic", "zodiac", "planetary"
-        - significance: astrological significance (1-2 sentences)
-        
-        Include a mix of:
-        - New/Full moons
-        - Planetary movements (retrogrades, transits)
-        - Zodiac sign changes
-        - Eclipses (if applicable)
-        - Major planetary aspects
-        """
-        
-        headers = {
-            'X-goog-api-key': Config.get_api_key("gemini"),
-            'Content-Type': 'application/json'
-        }
-        data = {
-            'contents': [
-                {
-                    'parts': [
-                        {
-                            'text': prompt
-                        }
-                    ]
-                }
-            ]
-        }
+        prompt = CALENDAR_PROMPT.render(month_name=month_name, year=year)
         
-        resp = requests.post(Config.get_api_endpoint('gemini_api'), headers=headers, json=data, timeout=15)
-        if resp.status_code != 200:
+        content = gemini_client.generate_text(prompt, timeout=15, kind='calendar')
+        if content is None:
             return None
-            
-        result = resp.json()
-        content = result['candidates'][0]['content']['parts'][0]['text'].strip()
-        if content.startswith('```json'):
-            content = content[7:]
-        if content.endswith('```'):
-            content = content[:-3]
-        content = content.strip()
+        content = gemini_client.strip_code_fences(content)
         
         events = json.loads(content)
         if not isinstance(events, list):
@@ -113,49 +143,16 @@ def ai_generate_weekly_forecast(week_start: Optional[str] = None) -> Optional[Di
             
         end_date = start_date + timedelta(days=6)
         
-        prompt = f"""
-        You are an expert astrologer. Generate a weekly forecast for {start_date.strftime('%B %d')} - {end_date.strftime('%B %d, %Y')}.
-        
-        Return ONLY a JSON object with these fields:
-        {{
-          "weekStart": "{start_date.strftime('%Y-%m-%d')}",
-          "weekEnd": "{end_date.strftime('%Y-%m-%d')}",
-          "overallEnergy": "High|Medium|Low with brief explanation",
-          "predictions": ["4-6 specific predictions for the week"],
-          "luckyDays": ["3-4 days of the week"],
-          "challengingDays": ["2-3 days of the week"]
-        }}
-        
-        Make predictions specific to this week's astrological influences.
-        """
-        
-        headers = {
-            'X-goog-api-key': Config.get_api_key("gemini"),
-            'Content-Type': 'application/json'
-        }
-        data = {
-            'contents': [
-                {
-                    'parts': [
-                        {
-                            'text': prompt
-                        }
-                    ]
-                }
-            ]
-        }
+        prompt = WEEKLY_FORECAST_PROMPT.render(
+            week_range=f"{start_date.strftime('%B %d')} - {end_date.strftime('%B %d, %Y')}",
+            week_start=start_date.strftime('%Y-%m-%d'),
+            week_end=end_date.strftime('%Y-%m-%d'),
+        )
         
-        resp = requests.post(Config.get_api_endpoint('gemini_api'), headers=headers, json=data, timeout=15)
-        if resp.status_code != 200:
+        content = gemini_client.generate_text(prompt, timeout=15, kind='weekly_forecast')
+        if content is None:
             return None
-            
-        result = resp.json()
-        content = result['candidates'][0]['content']['parts'][0]['text'].strip()
-        if content.startswith('```json'):
-            content = content[7:]
-        if content.endswith('```'):
-            content = content[:-3]
-        content = content.strip()
+        content = gemini_client.strip_code_fences(content)
         
         forecast = json.loads(content)
         
@@ -173,6 +170,15 @@ def ai_generate_weekly_forecast(week_start: Optional[str] = None) -> Optional[Di
     except Exception:
         return None
 
+def month_max_age(month: Optional[int], year: Optional[int], tzinfo=None) -> int:
+    """Cache-Control max-age for a month's data: long once the month is over (in tzinfo, if given)"""
+    today = today_in(tzinfo)
+    try:
+        next_month = (date(year or today.year, month or today.month, 1) + timedelta(days=31)).replace(day=1)
+    except (ValueError, OverflowError):
+        return Config.HTTP_MAX_AGE_DAILY
+    return max_age_for_date(next_month - timedelta(days=1), tzinfo)
+
 @calendar_bp.route('/calendar', methods=['GET'])
 def get_calendar_events():
     """Get calendar events for specified month and year"""
@@ -197,12 +203,13 @@ def get_calendar_events():
                 year_int = None
         
         # Try AI-generated events first
-        ai_events = ai_generate_calendar_events(month_int, year_int)
+        ai_events = ai_generate_calendar_events(month_int, year_int, budget=get_latency_budget())
         if ai_events and len(ai_events) > 0:
-            return jsonify({
+            # Without the shared store each worker has its own events, so their ETags would disagree
+            return cacheable(jsonify({
                 'success': True,
                 'data': ai_events
-            })
+            }), month_max_age(month_int, year_int), etag=ai_calendar_cache.shared)
         
         # No AI data available - return error
         return jsonify({
@@ -241,3 +248,43 @@ def get_weekly_forecast():
             'success': False,
             'error': str(e)
         }), 500
+
+@calendar_bp.route('/calendar/timings', methods=['GET'])
+def get_month_timings():
+    """Sunrise, Rahu Kaal, Yamaganda, Gulika, Abhijit, Choghadiya and Hora for every day of a month"""
+    try:
+        try:
+            location = location_from_args(request.args)
+        except ValueError as e:
+            return jsonify({
+                'success': False,
+                'error': str(e)
+            }), 400
+        # The current month is the requested location's, not the server's
+        today = today_in(location.tzinfo)
+        try:
+            month_int = int(request.args.get('month', today.month))
+            year_int = int(request.args.get('year', today.year))
+            first_day = date(year_int, month_int, 1)
+        except ValueError:
+            return jsonify({
+                'success': False,
+                'error': 'month (1-12) and year must be valid integers'
+            }), 400
+        
+        days = calendar.monthrange(year_int, month_int)[1]
+        return cacheable(jsonify({
+            'success': True,
+            'data': {
+                'month': month_int,
+                'year': year_int,
+                'location': {'lat': location.latitude, 'lon': location.longitude},
+                'days': timings_for_dates(first_day, days, location),
+            }
+        }), month_max_age(month_int, year_int, location.tzinfo))
+        
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
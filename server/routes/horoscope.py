@@ -1,16 +1,38 @@
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, Response, request, jsonify
 from datetime import datetime, timedelta
 import random
 import uuid
 import requests
 import os
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Iterator, List
 import json
 from config import Config
+from services import gemini_client, prompts
+from services import metrics
+from services.persistent_cache import TieredCache
+from services.json_stream import JsonFieldStream
+from services.latency_budget import call_with_budget, get_latency_budget
+from services.provider_chain import race_providers
+from services.scheduler import DailyPregenerator
+from services.singleflight import upstream_flight
 
 horoscope_bp = Blueprint('horoscope', __name__)
 
-def get_real_horoscope_from_api(zodiac_sign: str, date: str = None) -> Optional[Dict[str, Any]]:
+# AI horoscopes only vary by sign, date and the optional personal details, so
+# identical requests within CACHE_DURATION are served without calling Gemini.
+ai_horoscope_cache = TieredCache('horoscope', ttl=Config.CACHE_DURATION, maxsize=Config.CACHE_MAX_ENTRIES)
+metrics.track_cache('horoscope', ai_horoscope_cache)
+
+def get_horoscope_cache_key(zodiac_sign: str, user_details: Dict[str, Any], date: Optional[str] = None) -> tuple:
+    """Build the cache key for an AI horoscope: normalized sign, date and personalization"""
+    return (
+        zodiac_sign.strip().lower(),
+        date or datetime.now().strftime('%Y-%m-%d'),
+        str(user_details.get('gender') or '').strip().lower(),
+        str(user_details.get('dateOfBirth') or '').strip(),
+    )
+
+def get_real_horoscope_from_api(zodiac_sign: str, date: str = None, timeout: float = 10) -> Optional[Dict[str, Any]]:
     """Get real horoscope data from external astrology API"""
     try:
         if not Config.has_api_key('astrology'):
@@ -24,7 +46,7 @@ def get_real_horoscope_from_api(zodiac_sign: str, date: str = None) -> Optional[
         
         # Get daily horoscope
         daily_endpoint = f"{Config.get_api_endpoint('astrology_api')}/horoscope_prediction/{zodiac_sign}"
-        response = requests.get(daily_endpoint, headers=headers, timeout=10)
+        response = requests.get(daily_endpoint, headers=headers, timeout=timeout)
         
         if response.status_code == 200:
             data = response.json()
@@ -42,94 +64,114 @@ def get_real_horoscope_from_api(zodiac_sign: str, date: str = None) -> Optional[
     
     return None
 
-def get_ai_generated_horoscope(zodiac_sign: str, user_details: Dict[str, Any]) -> Optional[Dict[str, Any]]:
-    """Generate horoscope using AI models (Gemini)"""
+def refresh_ai_horoscope(zodiac_sign: str, user_details: Dict[str, Any], date: str, cache_key: tuple) -> Optional[Dict[str, Any]]:
+    """Fetch a horoscope from Gemini and store it in the cache"""
+    cached = ai_horoscope_cache.get(cache_key)
+    if cached is not None:
+        return cached
+    # Concurrent misses for the same key share one upstream call
+    horoscope_data = upstream_flight.do(('horoscope',) + cache_key, get_gemini_horoscope, zodiac_sign, user_details, date)
+    if horoscope_data:
+        ai_horoscope_cache.set(cache_key, horoscope_data)
+    return horoscope_data
+
+def get_ai_generated_horoscope(zodiac_sign: str, user_details: Dict[str, Any], date: Optional[str] = None,
+                               budget: Optional[float] = None) -> Optional[Dict[str, Any]]:
+    """
+    Generate horoscope using AI models (Gemini), served from the TTL cache when possible.
+    With a latency budget (seconds), returns the last cached value or None once the
+    budget is spent while the Gemini call finishes in the background.
+    """
     try:
         if Config.has_api_key('gemini'):
-            return get_gemini_horoscope(zodiac_sign, user_details)
+            date = date or datetime.now().strftime('%Y-%m-%d')
+            cache_key = get_horoscope_cache_key(zodiac_sign, user_details, date)
+            cached = ai_horoscope_cache.get(cache_key)
+            if cached is not None:
+                return dict(cached)
+            horoscope_data = call_with_budget(budget, refresh_ai_horoscope, zodiac_sign, user_details, date, cache_key)
+            if not horoscope_data:
+                horoscope_data = ai_horoscope_cache.get_stale(cache_key)
+            return dict(horoscope_data) if horoscope_data else None
     except Exception as e:
         print(f"Error generating AI horoscope: {e}")
     
     return None
 
-def get_gemini_horoscope(zodiac_sign: str, user_details: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+def race_horoscope_providers(zodiac_sign: str, user_details: Dict[str, Any], api_date: Optional[str] = None) -> Optional[Dict[str, Any]]:
+    """
+    Query the external astrology API and Gemini concurrently and take the first
+    usable result by priority. Both share one deadline: the X-Latency-Budget-Ms
+    header when the client sent one, else PROVIDER_DEADLINE_SECONDS (the 800 ms
+    AI_LATENCY_BUDGET_MS default does not apply here). When nothing arrives in
+    time the last cached AI horoscope is served, if any.
+    """
+    today = datetime.now().strftime('%Y-%m-%d')
+    deadline = get_latency_budget(default=Config.PROVIDER_DEADLINE_SECONDS)
+    winner = race_providers([
+        ('astrology_api', Config.has_api_key('astrology'),
+         lambda remaining: get_real_horoscope_from_api(zodiac_sign, api_date, timeout=min(10, remaining or 10))),
+        # Past the deadline the Gemini call carries on in the background pool
+        # and warms the cache, while this leg returns
+        ('gemini', Config.has_api_key('gemini'),
+         lambda remaining: get_ai_generated_horoscope(zodiac_sign, user_details, today, budget=remaining)),
+    ], deadline)
+    if winner:
+        return winner[1]
+    stale = ai_horoscope_cache.get_stale(get_horoscope_cache_key(zodiac_sign, user_details, today))
+    return dict(stale) if stale else None
+
+HOROSCOPE_PROMPT = prompts.register('horoscope', """
+    You are an expert astrologer with deep knowledge of zodiac signs, planetary influences, and astrological principles. Provide accurate, personalized horoscope readings. Always respond with valid JSON only.
+
+    Please provide a JSON response with the following structure:
+    {
+        "prediction": "A detailed daily prediction (2-3 sentences)",
+        "love": "Love forecast and relationship advice",
+        "career": "Career advice and professional insights",
+        "finance": "Financial outlook and money advice",
+        "health": "Health recommendations and wellness tips",
+        "luckyColor": "Lucky color for today",
+        "luckyNumber": "Lucky number (integer)",
+        "compatibility": "Compatible zodiac signs",
+        "planetaryInfluence": "Ruling planet of the sign",
+        "element": "Element associated with the sign",
+        "quality": "Quality (Cardinal, Fixed, or Mutable) of the sign"
+    }
+
+    Make it personal, insightful, and based on astrological principles. Be encouraging and practical.
+    Return ONLY the JSON object, no additional text.
+""", """
+    Generate a personalized daily horoscope for {date} for a {gender} born on {date_of_birth}
+    with zodiac sign {sign}.
+""")
+
+def build_horoscope_prompt(zodiac_sign: str, user_details: Dict[str, Any], date: str) -> str:
+    """Prompt asking Gemini for one personalized daily horoscope as a JSON object"""
+    return HOROSCOPE_PROMPT.render(
+        date=date,
+        gender=user_details.get('gender', 'person'),
+        date_of_birth=user_details.get('dateOfBirth', ''),
+        sign=zodiac_sign.capitalize(),
+    )
+
+def get_gemini_horoscope(zodiac_sign: str, user_details: Dict[str, Any], date: Optional[str] = None) -> Optional[Dict[str, Any]]:
     """Generate horoscope using Gemini model"""
     try:
-        prompt = f"""
-        You are an expert astrologer with deep knowledge of zodiac signs, planetary influences, and astrological principles. Provide accurate, personalized horoscope readings. Always respond with valid JSON only.
-        
-        Generate a personalized daily horoscope for a {user_details.get('gender', 'person')} born on {user_details.get('dateOfBirth', '')} 
-        with zodiac sign {zodiac_sign.capitalize()}. 
-        
-        Please provide a JSON response with the following structure:
-        {{
-            "prediction": "A detailed daily prediction (2-3 sentences)",
-            "love": "Love forecast and relationship advice",
-            "career": "Career advice and professional insights",
-            "finance": "Financial outlook and money advice",
-            "health": "Health recommendations and wellness tips",
-            "luckyColor": "Lucky color for today",
-            "luckyNumber": "Lucky number (integer)",
-            "compatibility": "Compatible zodiac signs",
-            "planetaryInfluence": "Ruling planet for {zodiac_sign.capitalize()}",
-            "element": "Element associated with {zodiac_sign.capitalize()}",
-            "quality": "Quality (Cardinal, Fixed, or Mutable) of {zodiac_sign.capitalize()}"
-        }}
+        date = date or datetime.now().strftime('%Y-%m-%d')
+        prompt = build_horoscope_prompt(zodiac_sign, user_details, date)
+        content = gemini_client.generate_text(prompt, timeout=15, kind='horoscope')
         
-        Make it personal, insightful, and based on astrological principles. Be encouraging and practical.
-        Return ONLY the JSON object, no additional text.
-        """
-        
-        headers = {
-            'X-goog-api-key': Config.get_api_key("gemini"),
-            'Content-Type': 'application/json'
-        }
-        
-        data = {
-            'contents': [
-                {
-                    'parts': [
-                        {
-                            'text': prompt
-                        }
-                    ]
-                }
-            ]
-        }
-        
-        response = requests.post(Config.get_api_endpoint('gemini_api'), headers=headers, json=data, timeout=15)
-        
-        if response.status_code == 200:
-            result = response.json()
-            content = result['candidates'][0]['content']['parts'][0]['text']
-            
+        if content is not None:
             # Parse the JSON response from Gemini
             try:
                 # Clean the response to extract JSON
-                content = content.strip()
-                if content.startswith('```json'):
-                    content = content[7:]
-                if content.endswith('```'):
-                    content = content[:-3]
-                content = content.strip()
+                content = gemini_client.strip_code_fences(content)
                 
                 horoscope_data = json.loads(content)
                 
                 # Ensure all required fields are present
-                return {
-                    'prediction': horoscope_data.get('prediction', ''),
-                    'love': horoscope_data.get('love', ''),
-                    'career': horoscope_data.get('career', ''),
-                    'finance': horoscope_data.get('finance', ''),
-                    'health': horoscope_data.get('health', ''),
-                    'lucky_color': horoscope_data.get('luckyColor', ''),
-                    'lucky_number': horoscope_data.get('luckyNumber', 7),
-                    'compatibility': horoscope_data.get('compatibility', ''),
-                    'planetaryInfluence': horoscope_data.get('planetaryInfluence', ''),
-                    'element': horoscope_data.get('element', ''),
-                    'quality': horoscope_data.get('quality', ''),
-                    'dataSource': 'AI Generated (Gemini)'
-                }
+                return normalize_gemini_horoscope(horoscope_data)
             except json.JSONDecodeError as e:
                 print(f"Error parsing Gemini response: {e}")
                 print(f"Raw response: {content}")
@@ -140,6 +182,96 @@ def get_gemini_horoscope(zodiac_sign: str, user_details: Dict[str, Any]) -> Opti
     
     return None
 
+def normalize_gemini_horoscope(horoscope_data: Dict[str, Any]) -> Dict[str, Any]:
+    """Map Gemini's camelCase horoscope JSON onto the internal field names"""
+    return {
+        'prediction': horoscope_data.get('prediction', ''),
+        'love': horoscope_data.get('love', ''),
+        'career': horoscope_data.get('career', ''),
+        'finance': horoscope_data.get('finance', ''),
+        'health': horoscope_data.get('health', ''),
+        'lucky_color': horoscope_data.get('luckyColor', ''),
+        'lucky_number': horoscope_data.get('luckyNumber', 7),
+        'compatibility': horoscope_data.get('compatibility', ''),
+        'planetaryInfluence': horoscope_data.get('planetaryInfluence', ''),
+        'element': horoscope_data.get('element', ''),
+        'quality': horoscope_data.get('quality', ''),
+        'dataSource': 'AI Generated (Gemini)'
+    }
+
+HOROSCOPE_BATCH_PROMPT = prompts.register('horoscope_batch', """
+    You are an expert astrologer with deep knowledge of zodiac signs, planetary influences, and astrological principles. Provide accurate horoscope readings. Always respond with valid JSON only.
+
+    Return a JSON array with exactly one object per sign, each with the following structure:
+    {
+        "sign": "Zodiac sign name",
+        "prediction": "A detailed daily prediction (2-3 sentences)",
+        "love": "Love forecast and relationship advice",
+        "career": "Career advice and professional insights",
+        "finance": "Financial outlook and money advice",
+        "health": "Health recommendations and wellness tips",
+        "luckyColor": "Lucky color for today",
+        "luckyNumber": "Lucky number (integer)",
+        "compatibility": "Compatible zodiac signs",
+        "planetaryInfluence": "Ruling planet of the sign",
+        "element": "Element associated with the sign",
+        "quality": "Quality (Cardinal, Fixed, or Mutable) of the sign"
+    }
+
+    Be insightful, encouraging and practical, and make each sign's reading distinct.
+    Return ONLY the JSON array, no additional text.
+""", """
+    Generate the daily horoscope for {date} for each of these zodiac signs: {sign_names}.
+""")
+
+def get_gemini_daily_batch(date: str, zodiac_signs: List[str]) -> Dict[str, Dict[str, Any]]:
+    """Generate the generic daily horoscopes for several signs in a single Gemini call"""
+    try:
+        sign_names = ', '.join(sign.capitalize() for sign in zodiac_signs)
+        prompt = HOROSCOPE_BATCH_PROMPT.render(date=date, sign_names=sign_names)
+        
+        content = gemini_client.generate_text(prompt, timeout=Config.HOROSCOPE_BATCH_TIMEOUT, kind='horoscope_batch')
+        if content is None:
+            return {}
+        
+        entries = json.loads(gemini_client.strip_code_fences(content))
+        if isinstance(entries, dict):
+            entries = entries.get('horoscopes', [entries])
+        
+        # Keep only well-formed entries for the signs we asked for
+        wanted = set(zodiac_signs)
+        horoscopes: Dict[str, Dict[str, Any]] = {}
+        for entry in entries if isinstance(entries, list) else []:
+            if not isinstance(entry, dict):
+                continue
+            sign = str(entry.get('sign', '')).strip().lower()
+            if sign in wanted and sign not in horoscopes and str(entry.get('prediction', '')).strip():
+                horoscopes[sign] = normalize_gemini_horoscope(entry)
+        return horoscopes
+    except Exception as e:
+        print(f"Error with Gemini batch horoscope: {e}")
+    
+    return {}
+
+def warm_daily_horoscopes(zodiac_signs: List[str], date: str) -> Dict[str, Dict[str, Any]]:
+    """Fill the daily cache for the given signs with one batched Gemini call"""
+    if not Config.has_api_key('gemini'):
+        return {}
+    horoscopes: Dict[str, Dict[str, Any]] = {}
+    missing = []
+    for sign in zodiac_signs:
+        cached = ai_horoscope_cache.get(get_horoscope_cache_key(sign, {}, date))
+        if cached is not None:
+            horoscopes[sign] = cached
+        else:
+            missing.append(sign)
+    if missing:
+        batch = upstream_flight.do(('horoscope_batch', date) + tuple(missing), get_gemini_daily_batch, date, missing)
+        for sign, horoscope_data in batch.items():
+            ai_horoscope_cache.set(get_horoscope_cache_key(sign, {}, date), horoscope_data)
+            horoscopes[sign] = horoscope_data
+    return {sign: dict(data) for sign, data in horoscopes.items()}
+
 def get_fallback_horoscope(zodiac_sign: str) -> Dict[str, Any]:
     """Fallback horoscope data if external APIs fail"""
     fallback_data = {
@@ -303,6 +435,29 @@ def get_fallback_horoscope(zodiac_sign: str) -> Dict[str, Any]:
     
     return fallback_data.get(zodiac_sign, fallback_data['aries'])
 
+ZODIAC_SIGNS = ['aries', 'taurus', 'gemini', 'cancer', 'leo', 'virgo',
+                'libra', 'scorpio', 'sagittarius', 'capricorn', 'aquarius', 'pisces']
+
+def pregenerate_daily_horoscope(zodiac_sign: str, date: str) -> Optional[Dict[str, Any]]:
+    """Generate the generic daily horoscope for one sign ahead of time"""
+    return get_ai_generated_horoscope(zodiac_sign, {'zodiacSign': zodiac_sign}, date)
+
+# Generates all twelve daily horoscopes shortly before midnight so the first
+# visitor of the day is served instantly: one batched prompt for every sign,
+# then per-sign retries for any the batch missed. Started per worker (see app.py),
+# but only one worker at a time holds the lock and generates; the results reach
+# the other workers through the shared disk tier of ai_horoscope_cache.
+daily_pregenerator = DailyPregenerator(
+    'daily-horoscope',
+    ZODIAC_SIGNS,
+    pregenerate_daily_horoscope,
+    generate_batch=warm_daily_horoscopes,
+    lead_time=timedelta(minutes=Config.PREGENERATION_LEAD_MINUTES),
+    retry_interval=Config.PREGENERATION_RETRY_SECONDS,
+    enabled=lambda: Config.ENABLE_DAILY_PREGENERATION and Config.has_api_key('gemini'),
+    lock_path=Config.PREGENERATION_LOCK_PATH,
+)
+
 @horoscope_bp.route('/horoscope', methods=['POST'])
 def get_horoscope():
     """Get real horoscope prediction using external APIs and AI models"""
@@ -325,24 +480,16 @@ def get_horoscope():
         place_of_birth = data.get('placeOfBirth')
         gender = data.get('gender')
         
-        # Try to get real data from external APIs first
-        horoscope_data = None
-        
-        # 1. Try external astrology API
-        if not horoscope_data:
-            horoscope_data = get_real_horoscope_from_api(zodiac_sign, date_of_birth)
-        
-        # 2. Try AI-generated horoscope
-        if not horoscope_data:
-            user_details = {
-                'fullName': full_name,
-                'dateOfBirth': date_of_birth,
-                'timeOfBirth': time_of_birth,
-                'placeOfBirth': place_of_birth,
-                'gender': gender,
-                'zodiacSign': zodiac_sign
-            }
-            horoscope_data = get_ai_generated_horoscope(zodiac_sign, user_details)
+        # 1-2. Race the external astrology API against the AI-generated horoscope
+        user_details = {
+            'fullName': full_name,
+            'dateOfBirth': date_of_birth,
+            'timeOfBirth': time_of_birth,
+            'placeOfBirth': place_of_birth,
+            'gender': gender,
+            'zodiacSign': zodiac_sign
+        }
+        horoscope_data = race_horoscope_providers(zodiac_sign, user_details, date_of_birth)
         
         # 3. Use fallback data if all else fails
         if not horoscope_data:
@@ -368,6 +515,7 @@ def get_horoscope():
             'dataSource': 'External API' if 'dataSource' not in horoscope_data else horoscope_data['dataSource'],
             'createdAt': datetime.now().isoformat()
         }
+        metrics.record_data_source(horoscope_response['dataSource'])
         
         return jsonify({
             'success': True,
@@ -385,14 +533,14 @@ def get_daily_horoscope(zodiac_sign):
     """Get daily horoscope for a specific zodiac sign from external APIs"""
     try:
         zodiac_sign = zodiac_sign.lower()
+        today = datetime.now().strftime('%Y-%m-%d')
         
-        # Try to get real daily horoscope
-        horoscope_data = get_real_horoscope_from_api(zodiac_sign)
+        # Serve the pre-generated horoscope when the scheduler already has it
+        horoscope_data = daily_pregenerator.get(today, zodiac_sign)
         
         if not horoscope_data:
-            # Fallback to AI generation
-            user_details = {'zodiacSign': zodiac_sign}
-            horoscope_data = get_ai_generated_horoscope(zodiac_sign, user_details)
+            # Race the real daily horoscope API against AI generation
+            horoscope_data = race_horoscope_providers(zodiac_sign, {'zodiacSign': zodiac_sign})
         
         if not horoscope_data:
             # Final fallback
@@ -400,12 +548,13 @@ def get_daily_horoscope(zodiac_sign):
         
         daily_horoscope = {
             'zodiacSign': zodiac_sign,
-            'date': datetime.now().strftime('%Y-%m-%d'),
+            'date': today,
             'prediction': horoscope_data.get('prediction', ''),
             'luckyColor': horoscope_data.get('lucky_color', ''),
             'luckyNumber': horoscope_data.get('lucky_number', ''),
             'dataSource': horoscope_data.get('dataSource', 'Fallback')
         }
+        metrics.record_data_source(daily_horoscope['dataSource'])
         
         return jsonify({
             'success': True,
@@ -418,6 +567,113 @@ def get_daily_horoscope(zodiac_sign):
             'error': str(e)
         }), 500
 
+# Fields of the /horoscope/ai response, in the order Gemini is asked to write them
+STREAM_FIELDS = ['prediction', 'love', 'career', 'finance', 'health', 'luckyColor', 'luckyNumber',
+                 'compatibility', 'planetaryInfluence', 'element', 'quality']
+
+def build_ai_horoscope_response(zodiac_sign: str, horoscope_data: Dict[str, Any], base: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """Create response with proper structure matching frontend expectations"""
+    base = base or {
+        'id': str(uuid.uuid4()),
+        'fullName': f'AI Generated for {zodiac_sign.capitalize()}',
+        'zodiacSign': zodiac_sign,
+        'date': datetime.now().strftime('%Y-%m-%d'),
+    }
+    return dict(base, **{
+        'prediction': horoscope_data.get('prediction', ''),
+        'luckyColor': horoscope_data.get('lucky_color', ''),
+        'luckyNumber': horoscope_data.get('lucky_number', 7),
+        'compatibility': horoscope_data.get('compatibility', ''),
+        'health': horoscope_data.get('health', ''),
+        'career': horoscope_data.get('career', ''),
+        'love': horoscope_data.get('love', ''),
+        'finance': horoscope_data.get('finance', ''),
+        'planetaryInfluence': horoscope_data.get('planetaryInfluence', ''),
+        'element': horoscope_data.get('element', ''),
+        'quality': horoscope_data.get('quality', ''),
+        'dataSource': horoscope_data.get('dataSource', 'AI Generated'),
+        'createdAt': datetime.now().isoformat()
+    })
+
+def format_sse(event: str, data: Any) -> str:
+    """Encode one server-sent event"""
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+def wants_event_stream() -> bool:
+    """Streaming is opt-in via ?stream=1 or an Accept: text/event-stream header"""
+    if request.args.get('stream', '').lower() in ('1', 'true', 'yes'):
+        return True
+    return 'text/event-stream' in request.headers.get('Accept', '')
+
+def stream_gemini_horoscope(zodiac_sign: str, user_details: Dict[str, Any], date: str, sent: Dict[str, Any]) -> Iterator[str]:
+    """
+    Stream a horoscope from Gemini, yielding a `field` event as soon as each JSON
+    field is complete. Completed fields are recorded in `sent`; returns the parsed
+    JSON object once Gemini has finished, or None if the stream failed.
+    """
+    try:
+        chunks = gemini_client.stream_text(build_horoscope_prompt(zodiac_sign, user_details, date),
+                                           timeout=15, kind='horoscope_stream')
+        if chunks is None:
+            return None
+        parser = JsonFieldStream()
+        try:
+            for chunk in chunks:
+                for field, value in parser.feed(chunk):
+                    if field in STREAM_FIELDS and field not in sent:
+                        sent[field] = value
+                        yield format_sse('field', {'field': field, 'value': value})
+        finally:
+            # Settle the upstream call now, also when our own client disconnected
+            chunks.close()
+        return parser.fields if parser.fields.get('prediction') else None
+    except Exception as e:
+        print(f"Error streaming Gemini horoscope: {e}")
+    return None
+
+def stream_ai_horoscope(zodiac_sign: str) -> Response:
+    """Server-sent events version of /horoscope/ai: meta, one field event per field, then done"""
+    today = datetime.now().strftime('%Y-%m-%d')
+    user_details = {'zodiacSign': zodiac_sign}
+    cache_key = get_horoscope_cache_key(zodiac_sign, user_details, today)
+    endpoint = request.endpoint
+    base = {
+        'id': str(uuid.uuid4()),
+        'fullName': f'AI Generated for {zodiac_sign.capitalize()}',
+        'zodiacSign': zodiac_sign,
+        'date': today,
+    }
+
+    def events() -> Iterator[str]:
+        yield format_sse('meta', base)
+        sent: Dict[str, Any] = {}
+        horoscope_data = None
+        if Config.has_api_key('gemini'):
+            horoscope_data = ai_horoscope_cache.get(cache_key)
+            if horoscope_data is None:
+                streamed = yield from stream_gemini_horoscope(zodiac_sign, user_details, today, sent)
+                if streamed:
+                    horoscope_data = normalize_gemini_horoscope(streamed)
+                    ai_horoscope_cache.set(cache_key, horoscope_data)
+                else:
+                    horoscope_data = ai_horoscope_cache.get_stale(cache_key)
+        if not horoscope_data:
+            horoscope_data = get_fallback_horoscope(zodiac_sign)
+
+        # Fields already streamed stay as sent; the rest come from the cache or fallback
+        horoscope_response = build_ai_horoscope_response(zodiac_sign, horoscope_data, base)
+        horoscope_response.update(sent)
+        for field in STREAM_FIELDS:
+            if field not in sent:
+                yield format_sse('field', {'field': field, 'value': horoscope_response[field]})
+        metrics.record_data_source(horoscope_response['dataSource'], endpoint=endpoint)
+        yield format_sse('done', horoscope_response)
+
+    return Response(events(), mimetype='text/event-stream', headers={
+        'Cache-Control': 'no-cache',
+        'X-Accel-Buffering': 'no',
+    })
+
 @horoscope_bp.route('/horoscope/ai', methods=['POST'])
 def generate_ai_horoscope():
     """Generate custom AI horoscope with specific requirements"""
@@ -432,33 +688,18 @@ def generate_ai_horoscope():
                 'error': 'Zodiac sign is required'
             }), 400
         
+        if wants_event_stream():
+            return stream_ai_horoscope(zodiac_sign)
+        
         # Generate AI horoscope with custom prompt
         user_details = {'zodiacSign': zodiac_sign}
-        horoscope_data = get_ai_generated_horoscope(zodiac_sign, user_details)
+        horoscope_data = get_ai_generated_horoscope(zodiac_sign, user_details, budget=get_latency_budget())
         
         if not horoscope_data:
             horoscope_data = get_fallback_horoscope(zodiac_sign)
         
-        # Create response with proper structure matching frontend expectations
-        horoscope_response = {
-            'id': str(uuid.uuid4()),
-            'fullName': f'AI Generated for {zodiac_sign.capitalize()}',
-            'zodiacSign': zodiac_sign,
-            'date': datetime.now().strftime('%Y-%m-%d'),
-            'prediction': horoscope_data.get('prediction', ''),
-            'luckyColor': horoscope_data.get('lucky_color', ''),
-            'luckyNumber': horoscope_data.get('lucky_number', 7),
-            'compatibility': horoscope_data.get('compatibility', ''),
-            'health': horoscope_data.get('health', ''),
-            'career': horoscope_data.get('career', ''),
-            'love': horoscope_data.get('love', ''),
-            'finance': horoscope_data.get('finance', ''),
-            'planetaryInfluence': horoscope_data.get('planetaryInfluence', ''),
-            'element': horoscope_data.get('element', ''),
-            'quality': horoscope_data.get('quality', ''),
-            'dataSource': horoscope_data.get('dataSource', 'AI Generated'),
-            'createdAt': datetime.now().isoformat()
-        }
+        horoscope_response = build_ai_horoscope_response(zodiac_sign, horoscope_data)
+        metrics.record_data_source(horoscope_response['dataSource'])
         
         return jsonify({
             'success': True,
@@ -1,12 +1,22 @@
 from flask import Blueprint, request, jsonify
+from datetime import date
 import random
-import requests
 import json
 from typing import List, Dict, Any, Optional
 from config import Config
+from services import gemini_client, prompts
+from services import metrics
+from services.http_cache import STARTED_AT, cacheable, max_age_for_date
+from services.latency_budget import call_with_budget, get_latency_budget
+from services.persistent_cache import TieredCache
+from services.singleflight import upstream_flight
 
 mantra_bp = Blueprint('mantra', __name__)
 
+# Today's generated set per category, so the list (and its ETag) is stable for the day
+ai_mantra_cache = TieredCache('mantra', ttl=Config.MANTRA_CACHE_DURATION, maxsize=Config.CACHE_MAX_ENTRIES)
+metrics.track_cache('mantra', ai_mantra_cache)
+
 # Mantras data
 MANTRAS = [
     {
@@ -58,7 +68,46 @@ def normalize_category(category: Optional[str]) -> Optional[str]:
         return 'prosperity'
     return c
 
-def ai_generate_mantras(category: Optional[str]) -> Optional[List[Dict[str, Any]]]:
+MANTRA_PROMPT = prompts.register('mantra', """
+    You are a learned Vedic scholar who compiles daily sets of Hindu mantras.
+
+    Return ONLY a JSON array of objects. Each object MUST have exactly these fields:
+    - id: a short stable slug (kebab-case) based on the mantra name
+    - name: mantra name (e.g., "Gayatri Mantra")
+    - sanskrit: the mantra text in Devanagari
+    - transliteration: IAST transliteration
+    - meaning: brief meaning in English (1-2 sentences)
+    - benefits: array of 3-5 concise strings
+    - bestTime: a concise time recommendation (e.g., "Sunrise", "Morning or evening")
+    - repetitions: a reasonable integer count (e.g., 11, 21, 108)
+    - category: one of "planetary", "zodiac", "healing", "prosperity"
+""", """
+    Generate today's set of mantras.
+    {focus}
+    {count_hint}
+""")
+
+def refresh_ai_mantras(key: tuple, category: Optional[str]) -> Optional[List[Dict[str, Any]]]:
+    """Fetch a day's mantras from Gemini, coalescing concurrent requests for them, and cache them"""
+    cached = ai_mantra_cache.get(key)
+    if cached is not None:
+        return cached
+    mantras = upstream_flight.do(('mantra',) + key, get_gemini_mantras, category)
+    if mantras:
+        # Another worker may have generated the day's set first; everyone serves that one
+        mantras = ai_mantra_cache.set_shared(key, mantras)
+    return mantras
+
+def ai_generate_mantras(category: Optional[str], budget: Optional[float] = None) -> Optional[List[Dict[str, Any]]]:
+    """Today's mantras for a category, cached per day, within an optional latency budget (seconds)"""
+    key = (date.today().isoformat(), category or 'all')
+    cached = ai_mantra_cache.get(key)
+    if cached is not None:
+        return list(cached)
+    mantras = call_with_budget(budget, refresh_ai_mantras, key, category) or ai_mantra_cache.get_stale(key)
+    return list(mantras) if mantras else None
+
+def get_gemini_mantras(category: Optional[str]) -> Optional[List[Dict[str, Any]]]:
     try:
         if not Config.has_api_key('gemini'):
             return None
@@ -77,48 +126,12 @@ def ai_generate_mantras(category: Optional[str]) -> Optional[List[Dict[str, Any]
         if category:
             count_hint = 'Provide 4-6 mantras in this category.'
 
-        prompt = f"""
-        You are a learned Vedic scholar. Generate a daily set of Hindu mantras.
-        {cat_text}
-        {count_hint}
-
-        Return ONLY a JSON array of objects. Each object MUST have exactly these fields:
-        - id: a short stable slug (kebab-case) based on the mantra name
-        - name: mantra name (e.g., "Gayatri Mantra")
-        - sanskrit: the mantra text in Devanagari
-        - transliteration: IAST transliteration
-        - meaning: brief meaning in English (1-2 sentences)
-        - benefits: array of 3-5 concise strings
-        - bestTime: a concise time recommendation (e.g., "Sunrise", "Morning or evening")
-        - repetitions: a reasonable integer count (e.g., 11, 21, 108)
-        - category: one of "planetary", "zodiac", "healing", "prosperity"
-        """
-
-        headers = {
-            'X-goog-api-key': Config.get_api_key("gemini"),
-            'Content-Type': 'application/json'
-        }
-        data = {
-            'contents': [
-                {
-                    'parts': [
-                        {
-                            'text': prompt
-                        }
-                    ]
-                }
-            ]
-        }
-        resp = requests.post(Config.get_api_endpoint('gemini_api'), headers=headers, json=data, timeout=15)
-        if resp.status_code != 200:
+        prompt = MANTRA_PROMPT.render(focus=cat_text, count_hint=count_hint)
+
+        content = gemini_client.generate_text(prompt, timeout=15, kind='mantra')
+        if content is None:
             return None
-        result = resp.json()
-        content = result['candidates'][0]['content']['parts'][0]['text'].strip()
-        if content.startswith('```json'):
-            content = content[7:]
-        if content.endswith('```'):
-            content = content[:-3]
-        content = content.strip()
+        content = gemini_client.strip_code_fences(content)
         parsed = json.loads(content)
         items = parsed if isinstance(parsed, list) else [parsed]
 
@@ -152,12 +165,13 @@ def get_mantras():
         category = normalize_category(raw_category)
 
         # Try AI-generated daily mantras first
-        ai_list = ai_generate_mantras(category)
+        ai_list = ai_generate_mantras(category, budget=get_latency_budget())
         if ai_list and len(ai_list) > 0:
-            return jsonify({
+            # Without the shared store each worker has its own set, so their ETags would disagree
+            return cacheable(jsonify({
                 'success': True,
                 'data': ai_list
-            })
+            }), max_age_for_date(None), etag=ai_mantra_cache.shared)
 
         # Fallback to static list, with tolerant matching
         if category:
@@ -177,10 +191,10 @@ def get_mantras():
         else:
             mantras = MANTRAS
         
-        return jsonify({
+        return cacheable(jsonify({
             'success': True,
             'data': mantras
-        })
+        }), max_age_for_date(None))
         
     except Exception as e:
         return jsonify({
@@ -200,10 +214,10 @@ def get_mantra(mantra_id):
                 'error': 'Mantra not found'
             }), 404
         
-        return jsonify({
+        return cacheable(jsonify({
             'success': True,
             'data': mantra
-        })
+        }), Config.HTTP_MAX_AGE_STATIC, last_modified=STARTED_AT)
         
     except Exception as e:
         return jsonify({
@@ -1,12 +1,20 @@
 from flask import Blueprint, request, jsonify
 import random
-import requests
 import json
 from typing import Optional, Dict, Any
 from config import Config
+from services import gemini_client, prompts
+from services import metrics
+from services.persistent_cache import TieredCache
+from services.latency_budget import call_with_budget, get_latency_budget
+from services.singleflight import upstream_flight
 
 matchmaking_bp = Blueprint('matchmaking', __name__)
 
+# AI matchmaking keyed by sign pair; also the stale fallback when the latency budget runs out
+ai_matchmaking_cache = TieredCache('matchmaking', ttl=Config.CACHE_DURATION, maxsize=Config.CACHE_MAX_ENTRIES)
+metrics.track_cache('matchmaking', ai_matchmaking_cache)
+
 # Compatibility matrix
 COMPATIBILITY_MATRIX = {
     'aries': {
@@ -81,7 +89,47 @@ COMPATIBILITY_MESSAGES = {
     ]
 }
 
-def get_ai_matchmaking(zodiac_sign1: str, zodiac_sign2: str) -> Optional[Dict[str, Any]]:
+MATCHMAKING_PROMPT = prompts.register('matchmaking', """
+    You are an expert Vedic astrologer who assesses kundali (zodiac) compatibility between two signs.
+
+    Return ONLY a JSON object with this exact schema:
+    {
+      "compatibility": 0-100 integer overall score,
+      "message": "one-paragraph high-level summary",
+      "loveCompatibility": "short paragraph focusing on romantic compatibility",
+      "friendshipCompatibility": "short paragraph focusing on friendship dynamics",
+      "businessCompatibility": "short paragraph focusing on professional synergy",
+      "tips": ["5 concise, practical tips to improve the relationship"]
+    }
+
+    Keep content encouraging, specific to the two signs' traits, and based on astrological principles. Do not include any text before or after the JSON.
+""", """
+    Assess the compatibility between {sign1} and {sign2}.
+""")
+
+def refresh_ai_matchmaking(zodiac_sign1: str, zodiac_sign2: str) -> Optional[Dict[str, Any]]:
+    """Fetch compatibility from Gemini, coalescing concurrent requests for the same pair, and cache it"""
+    key = (zodiac_sign1.lower(), zodiac_sign2.lower())
+    cached = ai_matchmaking_cache.get(key)
+    if cached is not None:
+        return cached
+    result = upstream_flight.do(('matchmaking',) + key, get_gemini_matchmaking, zodiac_sign1, zodiac_sign2)
+    if result:
+        ai_matchmaking_cache.set(key, result)
+    return result
+
+def get_ai_matchmaking(zodiac_sign1: str, zodiac_sign2: str, budget: Optional[float] = None) -> Optional[Dict[str, Any]]:
+    """Generate matchmaking compatibility using Gemini, within an optional latency budget (seconds)"""
+    key = (zodiac_sign1.lower(), zodiac_sign2.lower())
+    cached = ai_matchmaking_cache.get(key)
+    if cached is not None:
+        return dict(cached)
+    result = call_with_budget(budget, refresh_ai_matchmaking, zodiac_sign1, zodiac_sign2)
+    if not result:
+        result = ai_matchmaking_cache.get_stale(key)
+    return dict(result) if result else None
+
+def get_gemini_matchmaking(zodiac_sign1: str, zodiac_sign2: str) -> Optional[Dict[str, Any]]:
     """Generate matchmaking compatibility using Gemini"""
     try:
         if not Config.has_api_key('gemini'):
@@ -90,52 +138,14 @@ def get_ai_matchmaking(zodiac_sign1: str, zodiac_sign2: str) -> Optional[Dict[st
         sign1 = zodiac_sign1.capitalize()
         sign2 = zodiac_sign2.capitalize()
 
-        prompt = f"""
-        You are an expert Vedic astrologer. Assess kundali (zodiac) compatibility between {sign1} and {sign2}.
+        prompt = MATCHMAKING_PROMPT.render(sign1=sign1, sign2=sign2)
 
-        Return ONLY a JSON object with this exact schema:
-        {{
-          "compatibility": 0-100 integer overall score,
-          "message": "one-paragraph high-level summary",
-          "loveCompatibility": "short paragraph focusing on romantic compatibility",
-          "friendshipCompatibility": "short paragraph focusing on friendship dynamics",
-          "businessCompatibility": "short paragraph focusing on professional synergy",
-          "tips": ["5 concise, practical tips to improve the relationship"]
-        }}
-
-        Keep content encouraging, specific to {sign1}–{sign2} traits, and based on astrological principles. Do not include any text before or after the JSON.
-        """
-
-        headers = {
-            'X-goog-api-key': Config.get_api_key("gemini"),
-            'Content-Type': 'application/json'
-        }
-
-        data = {
-            'contents': [
-                {
-                    'parts': [
-                        {
-                            'text': prompt
-                        }
-                    ]
-                }
-            ]
-        }
-
-        response = requests.post(Config.get_api_endpoint('gemini_api'), headers=headers, json=data, timeout=15)
-        if response.status_code != 200:
+        content = gemini_client.generate_text(prompt, timeout=15, kind='matchmaking')
+        if content is None:
             return None
 
-        result = response.json()
-        content = result['candidates'][0]['content']['parts'][0]['text'].strip()
-
         # Strip code fences if present
-        if content.startswith('```json'):
-            content = content[7:]
-        if content.endswith('```'):
-            content = content[:-3]
-        content = content.strip()
+        content = gemini_client.strip_code_fences(content)
 
         ai_data = json.loads(content)
 
@@ -191,7 +201,7 @@ def get_compatibility():
             }), 400
         
         # Try AI-generated matchmaking first
-        ai_result = get_ai_matchmaking(zodiac_sign1, zodiac_sign2)
+        ai_result = get_ai_matchmaking(zodiac_sign1, zodiac_sign2, budget=get_latency_budget())
         if ai_result:
             response = ai_result
         else:
@@ -0,0 +1,119 @@
+from flask import Blueprint, request, jsonify
+from datetime import datetime
+import calendar
+from typing import Any, List, Optional
+from config import Config
+from services import metrics
+from astro.location import location_from_args
+from astro.muhurta import search_muhurta
+from astro.panchang import NAKSHATRAS, TITHIS
+
+muhurta_bp = Blueprint('muhurta', __name__)
+
+# Sunday-first, matching astro.timings
+WEEKDAYS = [calendar.day_name[(i + 6) % 7].lower() for i in range(7)]
+PAKSHAS = ('shukla', 'krishna')
+
+def parse_names(values: Any, names: List[str], field: str) -> Optional[List[int]]:
+    """Indexes of every entry in `names` matching the given names (case-insensitive)"""
+    if values is None:
+        return None
+    if not isinstance(values, list):
+        raise ValueError(f'{field} must be a list of names')
+    wanted = {str(value).strip().lower() for value in values}
+    indexes = [i for i, name in enumerate(names) if name.lower() in wanted]
+    unknown = wanted - {name.lower() for name in names}
+    if unknown:
+        raise ValueError(f"Unknown {field}: {', '.join(sorted(unknown))}")
+    return indexes
+
+def parse_int(data: dict, field: str, default: int, low: int, high: int) -> int:
+    try:
+        value = int(data.get(field, default))
+    except (TypeError, ValueError):
+        raise ValueError(f'{field} must be an integer')
+    if not low <= value <= high:
+        raise ValueError(f'{field} must be between {low} and {high}')
+    return value
+
+def parse_bool(data: dict, field: str, default: bool) -> bool:
+    """A JSON boolean, or the strings "true"/"false"; anything else is rejected"""
+    value = data.get(field, default)
+    if isinstance(value, bool):
+        return value
+    if isinstance(value, str) and value.strip().lower() in ('true', 'false'):
+        return value.strip().lower() == 'true'
+    raise ValueError(f'{field} must be true or false')
+
+@muhurta_bp.route('/muhurta/search', methods=['POST'])
+def find_muhurta():
+    """Find ranked auspicious windows in a date range that satisfy the given constraints"""
+    try:
+        data = request.get_json(silent=True) or {}
+
+        # Validate required fields
+        for field in ('start', 'end'):
+            if not data.get(field):
+                return jsonify({
+                    'success': False,
+                    'error': f'Missing required field: {field}'
+                }), 400
+
+        try:
+            start_date = datetime.strptime(data['start'], '%Y-%m-%d').date()
+            end_date = datetime.strptime(data['end'], '%Y-%m-%d').date()
+            days = (end_date - start_date).days + 1
+            if days < 1 or days > Config.MUHURTA_MAX_DAYS:
+                raise ValueError(f'end must not be before start, and a search covers at most {Config.MUHURTA_MAX_DAYS} days')
+
+            location = location_from_args({key: str(data[key]) for key in ('lat', 'lon', 'tz') if key in data})
+            tithis = parse_names(data.get('tithis'), TITHIS, 'tithis')
+            nakshatras = parse_names(data.get('nakshatras'), NAKSHATRAS, 'nakshatras')
+            weekdays = parse_names(data.get('weekdays'), WEEKDAYS, 'weekdays')
+            paksha = data.get('paksha')
+            if paksha is not None:
+                paksha = str(paksha).lower().replace(' paksha', '')
+                if paksha not in PAKSHAS:
+                    raise ValueError("paksha must be 'Shukla' or 'Krishna'")
+            min_minutes = parse_int(data, 'minDurationMinutes', 30, 1, 1440)
+            limit = parse_int(data, 'limit', 20, 1, 100)
+            daytime_only = parse_bool(data, 'daytimeOnly', True)
+            avoid = [name for name, flag, default in (
+                ('rahuKaal', 'avoidRahuKaal', True),
+                ('yamaganda', 'avoidYamaganda', False),
+                ('gulikaKaal', 'avoidGulikaKaal', False),
+            ) if parse_bool(data, flag, default)]
+        except ValueError as e:
+            return jsonify({
+                'success': False,
+                'error': str(e)
+            }), 400
+
+        windows = search_muhurta(
+            start_date, days, location,
+            tithis=tithis,
+            nakshatras=nakshatras,
+            weekdays=weekdays,
+            paksha=paksha,
+            avoid=avoid,
+            daytime_only=daytime_only,
+            min_minutes=min_minutes,
+            limit=limit,
+        )
+
+        metrics.record_data_source('Astronomical Calculation')
+        return jsonify({
+            'success': True,
+            'data': {
+                'windows': windows,
+                'searchedDays': days,
+                'location': {'lat': location.latitude, 'lon': location.longitude},
+                'dataSource': 'Astronomical Calculation'
+            }
+        })
+
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
@@ -1,21 +1,27 @@
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, Response, request, jsonify
 from datetime import datetime, timedelta
+import calendar
 import hashlib
-import requests
 import json
-import os
+from typing import Any, Dict, Iterator, List
+import numpy as np
 from config import Config
+from services import metrics
+from services.http_cache import STARTED_AT, cacheable, max_age_for_date, today_in
+from astro.ephemeris import UNIX_EPOCH_JD, julian_day, from_julian_day
+from astro.location import Location, location_from_args
+from astro.panchang import NAKSHATRAS, TITHIS, YOGAS, compute_panchang, compute_panchang_range, karana_name, paksha_name
+from astro.sun import cached_sunrise_sunset, format_clock, local_noon_jd, snap_to_grid, sun_times_cache, sunrise_sunset
+from astro.timings import timings_for_dates
 
 panchang_bp = Blueprint('panchang', __name__)
+metrics.track_cache('sun_times', sun_times_cache)
 
-# Sample Panchang data
-TITHIS = ['Pratipada', 'Dwitiya', 'Tritiya', 'Chaturthi', 'Panchami', 'Shashthi', 'Saptami', 'Ashtami', 'Navami', 'Dashami', 'Ekadashi', 'Dwadashi', 'Trayodashi', 'Chaturdashi', 'Purnima', 'Pratipada', 'Dwitiya', 'Tritiya', 'Chaturthi', 'Panchami', 'Shashthi', 'Saptami', 'Ashtami', 'Navami', 'Dashami', 'Ekadashi', 'Dwadashi', 'Trayodashi', 'Chaturdashi', 'Amavasya']
+# Panchang elements are those in force at local sunrise; where the Sun does
+# not rise (polar day or night) they are taken at 06:00 local time instead.
+FALLBACK_SUNRISE_MINUTES = 6 * 60
 
-NAKSHATRAS = ['Ashwini', 'Bharani', 'Krittika', 'Rohini', 'Mrigashira', 'Ardra', 'Punarvasu', 'Pushya', 'Ashlesha', 'Magha', 'Purva Phalguni', 'Uttara Phalguni', 'Hasta', 'Chitra', 'Swati', 'Vishakha', 'Anuradha', 'Jyeshtha', 'Mula', 'Purva Ashadha', 'Uttara Ashadha', 'Shravana', 'Dhanishta', 'Shatabhisha', 'Purva Bhadrapada', 'Uttara Bhadrapada', 'Revati']
-
-YOGAS = ['Vishkumbha', 'Priti', 'Ayushman', 'Saubhagya', 'Shobhana', 'Atiganda', 'Sukarman', 'Dhriti', 'Shula', 'Ganda', 'Vriddhi', 'Dhruva', 'Vyaghata', 'Harshana', 'Vajra', 'Siddhi', 'Vyatipata', 'Variyan', 'Parigha', 'Shiva', 'Siddha', 'Sadhya', 'Shubha', 'Shukla', 'Brahma', 'Indra', 'Vaidhriti']
-
-KARANAS = ['Bava', 'Balava', 'Kaulava', 'Taitila', 'Garija', 'Vanija', 'Vishti', 'Shakuni', 'Chatushpada', 'Naga']
+TIMING_FIELDS = ('rahuKaal', 'yamaganda', 'gulikaKaal', 'abhijitMuhurta', 'brahmaMuhurta', 'choghadiya', 'hora')
 
 DAILY_WISDOMS = [
     "Today is auspicious for starting new ventures. Trust in the divine timing.",
@@ -93,266 +99,196 @@ def get_deterministic_choice(items, seed_string):
     hash_int = int(hash_hex, 16)
     return items[hash_int % len(items)]
 
-def get_auspicious_timings(date_str):
-    """Generate auspicious timings based on date"""
-    base_timings = [
-        '06:00 - 08:00 (Brahma Muhurta)',
-        '09:00 - 11:00 (Abhijit Muhurta)',
-        '15:00 - 17:00 (Godhuli Kaal)',
-        '18:00 - 20:00 (Nishita Kaal)',
-        '21:00 - 23:00 (Ardha Ratri)',
-        '03:00 - 05:00 (Usha Kaal)'
+def describe_period(period: Dict[str, Any], label: str) -> str:
+    return f"{period['start']} - {period['end']} ({label})"
+
+def get_auspicious_timings(timings: Dict[str, Any]) -> List[str]:
+    """Brahma and Abhijit muhurtas plus the day's Amrit choghadiya"""
+    periods = [
+        describe_period(timings['brahmaMuhurta'], 'Brahma Muhurta'),
+        describe_period(timings['abhijitMuhurta'], 'Abhijit Muhurta'),
     ]
-    
-    # Use date to determine which timings to include
-    hash_object = hashlib.md5(f"auspicious_{date_str}".encode())
-    hash_hex = hash_object.hexdigest()
-    hash_int = int(hash_hex, 16)
-    
-    # Select 3-4 timings based on hash
-    num_timings = 3 + (hash_int % 2)  # 3 or 4 timings
-    selected_indices = [(hash_int + i * 7) % len(base_timings) for i in range(num_timings)]
-    return [base_timings[i] for i in selected_indices]
+    periods += [describe_period(slot, 'Amrit Choghadiya') for slot in timings['choghadiya']['day'] if slot['name'] == 'Amrit']
+    return periods
 
-def get_inauspicious_timings(date_str):
-    """Generate inauspicious timings based on date"""
-    base_timings = [
-        '12:00 - 13:00 (Rahu Kaal)',
-        '16:00 - 17:30 (Yamaganda)',
-        '18:00 - 19:30 (Gulika Kaal)',
-        '14:00 - 15:30 (Kantaka)',
-        '10:00 - 11:30 (Bhadra)',
-        '08:00 - 09:30 (Vishti)'
+def get_inauspicious_timings(timings: Dict[str, Any]) -> List[str]:
+    """Rahu Kaal, Yamaganda and Gulika Kaal for the day"""
+    return [
+        describe_period(timings['rahuKaal'], 'Rahu Kaal'),
+        describe_period(timings['yamaganda'], 'Yamaganda'),
+        describe_period(timings['gulikaKaal'], 'Gulika Kaal'),
     ]
-    
-    # Use date to determine which timings to include
-    hash_object = hashlib.md5(f"inauspicious_{date_str}".encode())
-    hash_hex = hash_object.hexdigest()
-    hash_int = int(hash_hex, 16)
-    
-    # Select 2-3 timings based on hash
-    num_timings = 2 + (hash_int % 2)  # 2 or 3 timings
-    selected_indices = [(hash_int + i * 5) % len(base_timings) for i in range(num_timings)]
-    return [base_timings[i] for i in selected_indices]
 
-def get_ai_generated_panchang(date_obj):
-    """Generate panchang data using Gemini"""
-    try:
-        if not Config.has_api_key('gemini'):
-            return None
-            
-        date_str = date_obj.strftime('%Y-%m-%d')
-        day_name = date_obj.strftime('%A')
-        
-        prompt = f"""
-        You are an expert in Hindu astrology and Panchang calculations. Provide accurate, authentic Panchang data based on traditional Hindu calendar principles. Always respond with valid JSON only.
-        
-        Generate authentic Hindu Panchang data for {date_str} ({day_name}). 
-        
-        Please provide a JSON response with the following structure:
-        {{
-            "date": "{date_str}",
-            "tithi": "One of the 30 tithis (e.g., 'Pratipada', 'Dwitiya', 'Tritiya', 'Chaturthi', 'Panchami', 'Shashthi', 'Saptami', 'Ashtami', 'Navami', 'Dashami', 'Ekadashi', 'Dwadashi', 'Trayodashi', 'Chaturdashi', 'Purnima', 'Amavasya')",
-            "nakshatra": "One of the 27 nakshatras (e.g., 'Ashwini', 'Bharani', 'Krittika', 'Rohini', 'Mrigashira', 'Ardra', 'Punarvasu', 'Pushya', 'Ashlesha', 'Magha', 'Purva Phalguni', 'Uttara Phalguni', 'Hasta', 'Chitra', 'Swati', 'Vishakha', 'Anuradha', 'Jyeshtha', 'Mula', 'Purva Ashadha', 'Uttara Ashadha', 'Shravana', 'Dhanishta', 'Shatabhisha', 'Purva Bhadrapada', 'Uttara Bhadrapada', 'Revati')",
-            "yoga": "One of the 27 yogas (e.g., 'Vishkumbha', 'Priti', 'Ayushman', 'Saubhagya', 'Shobhana', 'Atiganda', 'Sukarman', 'Dhriti', 'Shula', 'Ganda', 'Vriddhi', 'Dhruva', 'Vyaghata', 'Harshana', 'Vajra', 'Siddhi', 'Vyatipata', 'Variyan', 'Parigha', 'Shiva', 'Siddha', 'Sadhya', 'Shubha', 'Shukla', 'Brahma', 'Indra', 'Vaidhriti')",
-            "karana": "One of the 11 karanas (e.g., 'Bava', 'Balava', 'Kaulava', 'Taitila', 'Garija', 'Vanija', 'Vishti', 'Shakuni', 'Chatushpada', 'Naga')",
-            "sunrise": "Realistic sunrise time in HH:MM format (considering seasonal changes)",
-            "sunset": "Realistic sunset time in HH:MM format (considering seasonal changes)",
-            "auspiciousTimings": ["3-4 auspicious muhurtas with times and names"],
-            "inauspiciousTimings": ["2-3 inauspicious periods with times and names"],
-            "dailyWisdom": "A spiritual wisdom message for the day",
-            "paksha": "Either 'Shukla Paksha (Waxing Moon)' or 'Krishna Paksha (Waning Moon)' based on tithi",
-            "dayName": "{day_name}",
-            "tithiSignificance": "Brief explanation of what this tithi is auspicious for",
-            "nakshatraSignificance": "Brief explanation of what this nakshatra represents and is good for"
-        }}
-        
-        Make the data authentic and spiritually meaningful. Consider the season and day of the week.
-        Return ONLY the JSON object, no additional text.
-        """
-        
-        headers = {
-            'X-goog-api-key': Config.get_api_key("gemini"),
-            'Content-Type': 'application/json'
-        }
-        
-        data = {
-            'contents': [
-                {
-                    'parts': [
-                        {
-                            'text': prompt
-                        }
-                    ]
-                }
-            ]
-        }
-        
-        response = requests.post(Config.get_api_endpoint('gemini_api'), headers=headers, json=data, timeout=15)
-        
-        if response.status_code == 200:
-            result = response.json()
-            content = result['candidates'][0]['content']['parts'][0]['text']
-            
-            # Parse the JSON response from GPT
-            try:
-                # Clean the response to extract JSON
-                content = content.strip()
-                if content.startswith('```json'):
-                    content = content[7:]
-                if content.endswith('```'):
-                    content = content[:-3]
-                content = content.strip()
-                
-                panchang_data = json.loads(content)
-                
-                # Ensure all required fields are present
-                result_obj = {
-                    'date': panchang_data.get('date', date_str),
-                    'tithi': panchang_data.get('tithi', ''),
-                    'nakshatra': panchang_data.get('nakshatra', ''),
-                    'yoga': panchang_data.get('yoga', ''),
-                    'karana': panchang_data.get('karana', ''),
-                    'sunrise': panchang_data.get('sunrise', '06:00'),
-                    'sunset': panchang_data.get('sunset', '18:00'),
-                    'auspiciousTimings': panchang_data.get('auspiciousTimings', []),
-                    'inauspiciousTimings': panchang_data.get('inauspiciousTimings', []),
-                    'dailyWisdom': panchang_data.get('dailyWisdom', ''),
-                    'paksha': panchang_data.get('paksha', ''),
-                    'dayName': panchang_data.get('dayName', day_name),
-                    'tithiSignificance': panchang_data.get('tithiSignificance', ''),
-                    'nakshatraSignificance': panchang_data.get('nakshatraSignificance', ''),
-                }
-                result_obj['dataSource'] = 'AI Generated (Gemini)'
-                return result_obj
-            except json.JSONDecodeError as e:
-                print(f"Error parsing Gemini response: {e}")
-                print(f"Raw response: {content}")
-                return None
-                
-    except Exception as e:
-        print(f"Error with Gemini API: {e}")
-    
-    return None
+def format_local_time(jd: float, tzinfo) -> str:
+    """Julian day as an ISO 8601 minute in the given timezone"""
+    return from_julian_day(jd).astimezone(tzinfo).isoformat(timespec='minutes')
 
-def get_sunrise_sunset(date_obj):
-    """Generate realistic sunrise and sunset times based on date"""
-    # Simple algorithm to simulate seasonal changes
-    day_of_year = date_obj.timetuple().tm_yday
-    
-    # Base times (around equinox)
-    base_sunrise = 6.0  # 6:00 AM
-    base_sunset = 18.0  # 6:00 PM
-    
-    # Seasonal variation (simplified)
-    # Summer solstice around day 172, winter solstice around day 355
-    if day_of_year < 80 or day_of_year > 300:  # Winter
-        sunrise_hour = base_sunrise + 0.5
-        sunset_hour = base_sunset - 1.0
-    elif day_of_year < 172:  # Spring
-        sunrise_hour = base_sunrise + 0.25
-        sunset_hour = base_sunset - 0.5
-    elif day_of_year < 266:  # Summer
-        sunrise_hour = base_sunrise - 0.25
-        sunset_hour = base_sunset + 0.5
-    else:  # Fall
-        sunrise_hour = base_sunrise + 0.25
-        sunset_hour = base_sunset - 0.5
-    
-    # Add some variation based on date hash
-    hash_object = hashlib.md5(f"sun_{date_obj.strftime('%Y-%m-%d')}".encode())
-    hash_hex = hash_object.hexdigest()
-    hash_int = int(hash_hex, 16)
-    
-    # Add ±15 minutes variation
-    variation = ((hash_int % 30) - 15) / 60.0
-    sunrise_hour += variation
-    sunset_hour += variation
-    
-    # Format times
-    sunrise = f"{int(sunrise_hour):02d}:{int((sunrise_hour % 1) * 60):02d}"
-    sunset = f"{int(sunset_hour):02d}:{int((sunset_hour % 1) * 60):02d}"
+def format_offset(minutes: int) -> str:
+    sign = '+' if minutes >= 0 else '-'
+    return f"{sign}{abs(minutes) // 60:02d}:{abs(minutes) % 60:02d}"
+
+def format_local_times(jd: np.ndarray, offset_minutes: np.ndarray) -> List[str]:
+    """format_local_time() for arrays of Julian days and per-day UTC offsets"""
+    minutes = np.floor((jd - UNIX_EPOCH_JD) * 1440 + offset_minutes).astype('int64')
+    texts = np.datetime_as_string(minutes.astype('datetime64[m]'), unit='m')
+    return [text + format_offset(int(offset)) for text, offset in zip(texts, offset_minutes)]
+
+def calculate_panchang(date_obj, location: Location) -> Dict[str, Any]:
+    """Compute the panchang for a date from Sun and Moon positions at local sunrise"""
+    date_str = date_obj.strftime('%Y-%m-%d')
+    offset = location.utc_offset_hours(date_obj)
+    sunrise, sunset = cached_sunrise_sunset(date_obj, location.latitude, location.longitude, offset)
+    local_midnight = local_noon_jd(date_obj, offset) - 0.5
+    elements = compute_panchang(local_midnight + (FALLBACK_SUNRISE_MINUTES if sunrise is None else sunrise) / 1440.0)
+    tithi = elements['tithi']
+    nakshatra = elements['nakshatra']
+    timings = timings_for_dates(date_obj, 1, location)[0]
     
-    return sunrise, sunset
+    return {
+        'date': date_str,
+        'tithi': tithi,
+        'tithiEndTime': format_local_time(elements['tithiEnd'], location.tzinfo),
+        'nakshatra': nakshatra,
+        'nakshatraEndTime': format_local_time(elements['nakshatraEnd'], location.tzinfo),
+        'yoga': elements['yoga'],
+        'yogaEndTime': format_local_time(elements['yogaEnd'], location.tzinfo),
+        'karana': elements['karana'],
+        'karanaEndTime': format_local_time(elements['karanaEnd'], location.tzinfo),
+        'sunrise': format_clock(sunrise),
+        'sunset': format_clock(sunset),
+        'auspiciousTimings': get_auspicious_timings(timings) if sunrise is not None else [],
+        'inauspiciousTimings': get_inauspicious_timings(timings) if sunrise is not None else [],
+        'timings': {name: timings[name] for name in TIMING_FIELDS},
+        'dailyWisdom': get_deterministic_choice(DAILY_WISDOMS, f"wisdom_{date_str}"),
+        'paksha': elements['paksha'],
+        'dayName': date_obj.strftime('%A'),
+        'tithiSignificance': TITHI_SIGNIFICANCE.get(tithi, 'Auspicious for spiritual practices and positive activities.'),
+        'nakshatraSignificance': NAKSHATRA_SIGNIFICANCE.get(nakshatra, 'Favorable for general activities and personal growth.'),
+        'location': {'lat': location.latitude, 'lon': location.longitude, 'utcOffsetHours': offset},
+        'dataSource': 'Astronomical Calculation'
+    }
 
 @panchang_bp.route('/panchang', methods=['GET'])
 def get_panchang():
-    """Get Panchang data for today or specified date"""
+    """Get Panchang data for today or specified date (optional lat, lon and tz)"""
     try:
         date_param = request.args.get('date')
         
+        try:
+            location = location_from_args(request.args)
+        except ValueError as e:
+            return jsonify({
+                'success': False,
+                'error': str(e)
+            }), 400
+        
         if date_param:
             try:
-                target_date = datetime.strptime(date_param, '%Y-%m-%d')
+                target_date = datetime.strptime(date_param, '%Y-%m-%d').date()
             except ValueError:
                 return jsonify({
                     'success': False,
                     'error': 'Invalid date format. Use YYYY-MM-DD'
                 }), 400
         else:
-            target_date = datetime.now()
-        
-        date_str = target_date.strftime('%Y-%m-%d')
+            # "Today" is the requested location's date, not the server's
+            target_date = today_in(location.tzinfo)
         
-        # Try to get AI-generated panchang data first
-        panchang_data = get_ai_generated_panchang(target_date)
+        panchang_data = calculate_panchang(target_date, location)
+        metrics.record_data_source(panchang_data['dataSource'])
         
-        # If AI generation fails, use fallback deterministic data
-        if not panchang_data:
-            # Generate deterministic Panchang data based on date
-            tithi = get_deterministic_choice(TITHIS, f"tithi_{date_str}")
-            nakshatra = get_deterministic_choice(NAKSHATRAS, f"nakshatra_{date_str}")
-            yoga = get_deterministic_choice(YOGAS, f"yoga_{date_str}")
-            karana = get_deterministic_choice(KARANAS, f"karana_{date_str}")
-            daily_wisdom = get_deterministic_choice(DAILY_WISDOMS, f"wisdom_{date_str}")
-            
-            # Get sunrise/sunset times
-            sunrise, sunset = get_sunrise_sunset(target_date)
-            
-            # Get auspicious and inauspicious timings
-            auspicious_timings = get_auspicious_timings(date_str)
-            inauspicious_timings = get_inauspicious_timings(date_str)
-            
-            # Determine Paksha (Lunar Phase)
-            tithi_num = TITHIS.index(tithi) + 1
-            if tithi_num <= 15:
-                paksha = "Shukla Paksha (Waxing Moon)"
-            else:
-                paksha = "Krishna Paksha (Waning Moon)"
-            
-            # Get day name
-            day_name = target_date.strftime('%A')
-            
-            # Get significance information
-            tithi_significance = TITHI_SIGNIFICANCE.get(tithi, 'Auspicious for spiritual practices and positive activities.')
-            nakshatra_significance = NAKSHATRA_SIGNIFICANCE.get(nakshatra, 'Favorable for general activities and personal growth.')
-            
-            # Generate fallback Panchang data
-            panchang_data = {
-                'date': date_str,
-                'tithi': tithi,
-                'nakshatra': nakshatra,
-                'yoga': yoga,
-                'karana': karana,
-                'sunrise': sunrise,
-                'sunset': sunset,
-                'auspiciousTimings': auspicious_timings,
-                'inauspiciousTimings': inauspicious_timings,
-                'dailyWisdom': daily_wisdom,
-                'paksha': paksha,
-                'dayName': day_name,
-                'tithiSignificance': tithi_significance,
-                'nakshatraSignificance': nakshatra_significance,
-                'dataSource': 'Fallback Generated'
-            }
-        
-        return jsonify({
+        # An explicit date only changes with the code; "today" changes at midnight, so ETag only
+        if date_param:
+            return cacheable(jsonify({
+                'success': True,
+                'data': panchang_data
+            }), max_age_for_date(target_date, location.tzinfo), last_modified=STARTED_AT)
+        return cacheable(jsonify({
             'success': True,
             'data': panchang_data
-        })
+        }), max_age_for_date(None, location.tzinfo))
         
     except Exception as e:
         return jsonify({
             'success': False,
             'error': str(e)
         }), 500
+
+def panchang_range_lines(start_date, days: int, location: Location) -> Iterator[str]:
+    """
+    Panchang for `days` days from start_date as JSON lines. Sunrise and the
+    elements are computed up front in one vectorized pass; lines are
+    serialized as they stream.
+    """
+    dates = [start_date + timedelta(days=i) for i in range(days)]
+    offsets = np.array([location.utc_offset_hours(day) for day in dates])
+    latitude, longitude = snap_to_grid(location.latitude, location.longitude)
+    jd_noon = local_noon_jd(start_date, 0.0) + np.arange(days, dtype=float) - offsets / 24.0
+    sunrise, sunset = sunrise_sunset(jd_noon, latitude, longitude, offsets)
+    
+    rise_minutes = np.where(np.isnan(sunrise), FALLBACK_SUNRISE_MINUTES, sunrise)
+    elements = compute_panchang_range(jd_noon - 0.5 + rise_minutes / 1440.0)
+    offset_minutes = np.round(offsets * 60).astype(int)
+    ends = {name: format_local_times(elements[name], offset_minutes) for name in ('tithiEnd', 'nakshatraEnd', 'yogaEnd', 'karanaEnd')}
+    tithis = elements['tithiIndex'].tolist()
+    nakshatras = elements['nakshatraIndex'].tolist()
+    yogas = elements['yogaIndex'].tolist()
+    karanas = elements['karanaIndex'].tolist()
+    sunrises = [None if np.isnan(value) else value for value in sunrise.tolist()]
+    sunsets = [None if np.isnan(value) else value for value in sunset.tolist()]
+    
+    def lines() -> Iterator[str]:
+        for i, day in enumerate(dates):
+            yield json.dumps({
+                'date': day.strftime('%Y-%m-%d'),
+                'dayName': calendar.day_name[day.weekday()],
+                'sunrise': format_clock(sunrises[i]),
+                'sunset': format_clock(sunsets[i]),
+                'tithi': TITHIS[tithis[i]],
+                'tithiEndTime': ends['tithiEnd'][i],
+                'paksha': paksha_name(tithis[i]),
+                'nakshatra': NAKSHATRAS[nakshatras[i]],
+                'nakshatraEndTime': ends['nakshatraEnd'][i],
+                'yoga': YOGAS[yogas[i]],
+                'yogaEndTime': ends['yogaEnd'][i],
+                'karana': karana_name(karanas[i]),
+                'karanaEndTime': ends['karanaEnd'][i],
+            }) + '\n'
+    
+    return lines()
+
+@panchang_bp.route('/panchang/range', methods=['GET'])
+def get_panchang_range():
+    """Stream the panchang for every day from start to end (inclusive) as JSON lines"""
+    try:
+        start_date = datetime.strptime(request.args.get('start', ''), '%Y-%m-%d').date()
+        end_date = datetime.strptime(request.args.get('end', ''), '%Y-%m-%d').date()
+    except ValueError:
+        return jsonify({
+            'success': False,
+            'error': 'start and end are required. Use YYYY-MM-DD'
+        }), 400
+    
+    days = (end_date - start_date).days + 1
+    if days < 1 or days > Config.PANCHANG_RANGE_MAX_DAYS:
+        return jsonify({
+            'success': False,
+            'error': f'end must not be before start, and a range covers at most {Config.PANCHANG_RANGE_MAX_DAYS} days'
+        }), 400
+    
+    try:
+        location = location_from_args(request.args)
+    except ValueError as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 400
+    
+    try:
+        lines = panchang_range_lines(start_date, days, location)
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+    return Response(lines, mimetype='application/x-ndjson')
@@ -1,12 +1,20 @@
 from flask import Blueprint, request, jsonify
 import random
-import requests
 import json
 from typing import List, Dict, Any, Optional
 from config import Config
+from services import gemini_client, prompts
+from services import metrics
+from services.latency_budget import call_with_budget, get_latency_budget
+from services.persistent_cache import TieredCache
+from services.singleflight import upstream_flight
 
 remedy_bp = Blueprint('remedy', __name__)
 
+# Generated remedies per category; also the stale fallback when the latency budget runs out
+ai_remedy_cache = TieredCache('remedy', ttl=Config.CACHE_DURATION, maxsize=Config.CACHE_MAX_ENTRIES)
+metrics.track_cache('remedy', ai_remedy_cache)
+
 # Remedies data
 REMEDIES = [
     {
@@ -74,7 +82,43 @@ def normalize_category(category: Optional[str]) -> Optional[str]:
         return 'gemstones'
     return c
 
-def ai_generate_remedies(category: Optional[str]) -> Optional[List[Dict[str, Any]]]:
+REMEDY_PROMPT = prompts.register('remedy', """
+    You are an expert Vedic astrologer who recommends practical Hindu remedies.
+
+    Return ONLY a JSON array of 4-8 items. Each object MUST have these fields:
+    - id: short slug (kebab-case) based on name
+    - name: remedy title
+    - category: one of "general", "planetary", "zodiac", "gemstones"
+    - description: brief description (1-2 sentences)
+    - solutions: an array of 4-6 concrete steps (strings)
+    - gemstones: OPTIONAL array of gemstone objects with fields:
+        {"name","planet","color","finger","day","benefits","price","alternatives","mantra"}
+    - mantras: OPTIONAL array of mantra names (strings)
+""", """
+    Generate a list of remedies. {focus}
+""")
+
+def refresh_ai_remedies(category: Optional[str]) -> Optional[List[Dict[str, Any]]]:
+    """Fetch remedies from Gemini, coalescing concurrent requests for a category, and cache them"""
+    key = category or 'all'
+    cached = ai_remedy_cache.get(key)
+    if cached is not None:
+        return cached
+    remedies = upstream_flight.do(('remedy', key), get_gemini_remedies, category)
+    if remedies:
+        ai_remedy_cache.set(key, remedies)
+    return remedies
+
+def ai_generate_remedies(category: Optional[str], budget: Optional[float] = None) -> Optional[List[Dict[str, Any]]]:
+    """Remedies for a category from the cache or Gemini, within an optional latency budget (seconds)"""
+    key = category or 'all'
+    cached = ai_remedy_cache.get(key)
+    if cached is not None:
+        return list(cached)
+    remedies = call_with_budget(budget, refresh_ai_remedies, category) or ai_remedy_cache.get_stale(key)
+    return list(remedies) if remedies else None
+
+def get_gemini_remedies(category: Optional[str]) -> Optional[List[Dict[str, Any]]]:
     try:
         if not Config.has_api_key('gemini'):
             return None
@@ -89,46 +133,12 @@ def ai_generate_remedies(category: Optional[str]) -> Optional[List[Dict[str, Any
         elif category == 'gemstones':
             focus = 'Focus on gemstone-based remedies with proper details.'
 
-        prompt = f"""
-        You are an expert Vedic astrologer. Generate a list of practical Hindu remedies. {focus}
-        Provide 4-8 items.
-
-        Return ONLY a JSON array. Each object MUST have these fields:
-        - id: short slug (kebab-case) based on name
-        - name: remedy title
-        - category: one of "general", "planetary", "zodiac", "gemstones"
-        - description: brief description (1-2 sentences)
-        - solutions: an array of 4-6 concrete steps (strings)
-        - gemstones: OPTIONAL array of gemstone objects with fields:
-            {"name","planet","color","finger","day","benefits","price","alternatives","mantra"}
-        - mantras: OPTIONAL array of mantra names (strings)
-        """
-
-        headers = {
-            'X-goog-api-key': Config.get_api_key("gemini"),
-            'Content-Type': 'application/json'
-        }
-        data = {
-            'contents': [
-                {
-                    'parts': [
-                        {
-                            'text': prompt
-                        }
-                    ]
-                }
-            ]
-        }
-        resp = requests.post(Config.get_api_endpoint('gemini_api'), headers=headers, json=data, timeout=15)
-        if resp.status_code != 200:
+        prompt = REMEDY_PROMPT.render(focus=focus)
+
+        content = gemini_client.generate_text(prompt, timeout=15, kind='remedy')
+        if content is None:
             return None
-        result = resp.json()
-        content = result['candidates'][0]['content']['parts'][0]['text'].strip()
-        if content.startswith('```json'):
-            content = content[7:]
-        if content.endswith('```'):
-            content = content[:-3]
-        content = content.strip()
+        content = gemini_client.strip_code_fences(content)
         parsed = json.loads(content)
         items = parsed if isinstance(parsed, list) else [parsed]
 
@@ -179,7 +189,7 @@ def get_remedies():
         category = normalize_category(raw_category)
 
         # Try AI generated remedies first
-        ai_list = ai_generate_remedies(category)
+        ai_list = ai_generate_remedies(category, budget=get_latency_budget())
         if ai_list and len(ai_list) > 0:
             return jsonify({'success': True, 'data': ai_list})
 
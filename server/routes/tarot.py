@@ -1,8 +1,9 @@
 from flask import Blueprint, request, jsonify
 import random
-import requests
 import json
 from config import Config
+from services import gemini_client, prompts
+from services.latency_budget import call_with_budget, get_latency_budget
 
 tarot_bp = Blueprint('tarot', __name__)
 
@@ -31,13 +32,8 @@ TAROT_CARDS = [
     {'id': '21', 'name': 'The World', 'meaning': 'Completion, integration, accomplishment, travel', 'reversed': 'Seeking personal closure, short-cut to success', 'image': '🌍', 'suit': 'Major Arcana'}
 ]
 
-def get_ai_tarot_reading():
-    """Generate AI-powered tarot reading using Gemini"""
-    try:
-        if not Config.has_api_key('gemini'):
-            return None
-
-        prompt = f"""
+# The whole reading prompt is static, card list included, so it is built once
+TAROT_PROMPT = prompts.register('tarot', f"""
         You are an expert tarot reader with deep knowledge of the Major Arcana. Generate a personalized three-card tarot reading.
 
         Select 3 cards from this list and provide detailed interpretations:
@@ -79,39 +75,22 @@ def get_ai_tarot_reading():
         }}
 
         Make the reading personal, insightful, and spiritually meaningful. Consider the flow from past to present to future.
-        """
+""")
 
-        headers = {
-            'X-goog-api-key': Config.get_api_key("gemini"),
-            'Content-Type': 'application/json'
-        }
-        
-        data = {
-            'contents': [
-                {
-                    'parts': [
-                        {
-                            'text': prompt
-                        }
-                    ]
-                }
-            ]
-        }
-        
-        response = requests.post(Config.get_api_endpoint('gemini_api'), headers=headers, json=data, timeout=15)
+def get_ai_tarot_reading():
+    """Generate AI-powered tarot reading using Gemini"""
+    try:
+        if not Config.has_api_key('gemini'):
+            return None
+
+        prompt = TAROT_PROMPT.render()
+
+        content = gemini_client.generate_text(prompt, timeout=15, kind='tarot')
         
-        if response.status_code == 200:
-            result = response.json()
-            content = result['candidates'][0]['content']['parts'][0]['text'].strip()
-            
-            # Parse the JSON response
+        if content is not None:
             try:
                 # Clean the response to extract JSON
-                if content.startswith('```json'):
-                    content = content[7:]
-                if content.endswith('```'):
-                    content = content[:-3]
-                content = content.strip()
+                content = gemini_client.strip_code_fences(content)
                 
                 reading_data = json.loads(content)
                 
@@ -136,8 +115,8 @@ def get_ai_tarot_reading():
 def get_tarot_reading():
     """Get a three-card tarot reading"""
     try:
-        # Try AI-generated reading first
-        ai_reading = get_ai_tarot_reading()
+        # Try AI-generated reading first; past the latency budget the static draw is served
+        ai_reading = call_with_budget(get_latency_budget(), get_ai_tarot_reading)
         
         if ai_reading:
             return jsonify({
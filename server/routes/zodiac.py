@@ -1,12 +1,18 @@
 from flask import Blueprint, request, jsonify
 import uuid
+from config import Config
+from services.http_cache import STARTED_AT, cacheable
 
 zodiac_bp = Blueprint('zodiac', __name__)
 
+def sign_uuid(name: str) -> str:
+    """Stable per-sign id, so ids (and cached responses) survive restarts"""
+    return str(uuid.uuid5(uuid.NAMESPACE_URL, f'zodiac/{name.lower()}'))
+
 # Zodiac signs data
 ZODIAC_SIGNS = [
     {
-        'id': str(uuid.uuid4()),
+        'id': sign_uuid('Aries'),
         'name': 'Aries',
         'symbol': '♈',
         'element': 'Fire',
@@ -18,7 +24,7 @@ ZODIAC_SIGNS = [
         'luckyNumbers': [1, 9, 17]
     },
     {
-        'id': str(uuid.uuid4()),
+        'id': sign_uuid('Taurus'),
         'name': 'Taurus',
         'symbol': '♉',
         'element': 'Earth',
@@ -30,7 +36,7 @@ ZODIAC_SIGNS = [
         'luckyNumbers': [2, 6, 15]
     },
     {
-        'id': str(uuid.uuid4()),
+        'id': sign_uuid('Gemini'),
         'name': 'Gemini',
         'symbol': '♊',
         'element': 'Air',
@@ -42,7 +48,7 @@ ZODIAC_SIGNS = [
         'luckyNumbers': [3, 5, 12]
     },
     {
-        'id': str(uuid.uuid4()),
+        'id': sign_uuid('Cancer'),
         'name': 'Cancer',
         'symbol': '♋',
         'element': 'Water',
@@ -54,7 +60,7 @@ ZODIAC_SIGNS = [
         'luckyNumbers': [2, 7, 11]
     },
     {
-        'id': str(uuid.uuid4()),
+        'id': sign_uuid('Leo'),
         'name': 'Leo',
         'symbol': '♌',
         'element': 'Fire',
@@ -66,7 +72,7 @@ ZODIAC_SIGNS = [
         'luckyNumbers': [1, 5, 9]
     },
     {
-        'id': str(uuid.uuid4()),
+        'id': sign_uuid('Virgo'),
         'name': 'Virgo',
         'symbol': '♍',
         'element': 'Earth',
@@ -78,7 +84,7 @@ ZODIAC_SIGNS = [
         'luckyNumbers': [4, 6, 8]
     },
     {
-        'id': str(uuid.uuid4()),
+        'id': sign_uuid('Libra'),
         'name': 'Libra',
         'symbol': '♎',
         'element': 'Air',
@@ -90,7 +96,7 @@ ZODIAC_SIGNS = [
         'luckyNumbers': [2, 6, 7]
     },
     {
-        'id': str(uuid.uuid4()),
+        'id': sign_uuid('Scorpio'),
         'name': 'Scorpio',
         'symbol': '♏',
         'element': 'Water',
@@ -102,7 +108,7 @@ ZODIAC_SIGNS = [
         'luckyNumbers': [4, 8, 11]
     },
     {
-        'id': str(uuid.uuid4()),
+        'id': sign_uuid('Sagittarius'),
         'name': 'Sagittarius',
         'symbol': '♐',
         'element': 'Fire',
@@ -114,7 +120,7 @@ ZODIAC_SIGNS = [
         'luckyNumbers': [3, 9, 12]
     },
     {
-        'id': str(uuid.uuid4()),
+        'id': sign_uuid('Capricorn'),
         'name': 'Capricorn',
         'symbol': '♑',
         'element': 'Earth',
@@ -126,7 +132,7 @@ ZODIAC_SIGNS = [
         'luckyNumbers': [1, 4, 8]
     },
     {
-        'id': str(uuid.uuid4()),
+        'id': sign_uuid('Aquarius'),
         'name': 'Aquarius',
         'symbol': '♒',
         'element': 'Air',
@@ -138,7 +144,7 @@ ZODIAC_SIGNS = [
         'luckyNumbers': [2, 5, 7]
     },
     {
-        'id': str(uuid.uuid4()),
+        'id': sign_uuid('Pisces'),
         'name': 'Pisces',
         'symbol': '♓',
         'element': 'Water',
@@ -155,10 +161,10 @@ ZODIAC_SIGNS = [
 def get_zodiac_signs():
     """Get all zodiac signs"""
     try:
-        return jsonify({
+        return cacheable(jsonify({
             'success': True,
             'data': ZODIAC_SIGNS
-        })
+        }), Config.HTTP_MAX_AGE_STATIC, last_modified=STARTED_AT)
     except Exception as e:
         return jsonify({
             'success': False,
@@ -177,10 +183,10 @@ def get_zodiac_sign(sign_id):
                 'error': 'Zodiac sign not found'
             }), 404
         
-        return jsonify({
+        return cacheable(jsonify({
             'success': True,
             'data': sign
-        })
+        }), Config.HTTP_MAX_AGE_STATIC, last_modified=STARTED_AT)
     except Exception as e:
         return jsonify({
             'success': False,
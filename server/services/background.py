@@ -0,0 +1,45 @@
+import contextvars
+import os
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Optional
+from config import Config
+
+class ForkSafePool:
+    """
+    A thread pool created lazily in each process: executor threads do not
+    survive into gunicorn workers, so a pool inherited across fork is replaced.
+    """
+
+    def __init__(self, name: str, max_workers: Callable[[], int]):
+        self.name = name
+        self.max_workers = max_workers
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._pid: Optional[int] = None
+        self._lock = threading.Lock()
+
+    def executor(self) -> ThreadPoolExecutor:
+        pid = os.getpid()
+        if self._executor is not None and self._pid == pid:
+            return self._executor
+        with self._lock:
+            if self._executor is None or self._pid != pid:
+                self._executor = ThreadPoolExecutor(max_workers=self.max_workers(), thread_name_prefix=self.name)
+                self._pid = pid
+        return self._executor
+
+    def submit(self, fn: Callable[..., Any], *args, **kwargs) -> Future:
+        """Run fn on the pool, carrying over the caller's context variables"""
+        context = contextvars.copy_context()
+        return self.executor().submit(context.run, fn, *args, **kwargs)
+
+# Shared pool for work that may outlive the request that started it (e.g. a
+# Gemini call that overran its latency budget)
+_pool = ForkSafePool('background', lambda: Config.BACKGROUND_WORKERS)
+
+def get_executor() -> ThreadPoolExecutor:
+    return _pool.executor()
+
+def submit(fn: Callable[..., Any], *args, **kwargs) -> Future:
+    """Run fn on the shared pool, carrying over the caller's context variables"""
+    return _pool.submit(fn, *args, **kwargs)
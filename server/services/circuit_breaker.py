@@ -0,0 +1,153 @@
+import logging
+import threading
+import time
+from collections import deque
+from typing import Any, Dict
+from config import Config
+
+# Flask names app.logger after the application module
+logger = logging.getLogger('app')
+
+class CircuitBreaker:
+    """
+    Failure-rate / slow-call circuit breaker.
+
+    CLOSED: calls pass through and outcomes are recorded in a sliding time
+    window. When the window holds at least `minimum_calls` outcomes and the
+    failure or slow-call rate reaches its threshold, the breaker OPENs.
+    OPEN: calls are rejected immediately for `open_seconds`.
+    HALF_OPEN: up to `half_open_max_calls` probes are let through; a healthy
+    probe closes the breaker, a failed or slow one re-opens it.
+    """
+
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half_open'
+
+    def __init__(self, name: str, failure_rate_threshold: float = 0.5, slow_call_seconds: float = 8.0,
+                 slow_call_rate_threshold: float = 0.5, window_seconds: float = 60.0, minimum_calls: int = 4,
+                 open_seconds: float = 30.0, half_open_max_calls: int = 1):
+        self.name = name
+        self.failure_rate_threshold = failure_rate_threshold
+        self.slow_call_seconds = slow_call_seconds
+        self.slow_call_rate_threshold = slow_call_rate_threshold
+        self.window_seconds = window_seconds
+        self.minimum_calls = minimum_calls
+        self.open_seconds = open_seconds
+        self.half_open_max_calls = half_open_max_calls
+        self._state = self.CLOSED
+        self._outcomes: deque = deque()  # (timestamp, failed, slow)
+        self._opened_at = 0.0
+        self._probes_in_flight = 0
+        self._rejected = 0
+        self._lock = threading.Lock()
+
+    def _prune(self, now: float) -> None:
+        while self._outcomes and now - self._outcomes[0][0] > self.window_seconds:
+            self._outcomes.popleft()
+
+    def _trip(self, now: float) -> None:
+        self._state = self.OPEN
+        self._opened_at = now
+        self._probes_in_flight = 0
+        self._outcomes.clear()
+        logger.warning("Circuit breaker '%s' opened", self.name)
+
+    def allow_request(self) -> bool:
+        """Return True if a call may go upstream right now"""
+        now = time.monotonic()
+        with self._lock:
+            if self._state == self.OPEN and now - self._opened_at >= self.open_seconds:
+                self._state = self.HALF_OPEN
+                self._probes_in_flight = 0
+            if self._state == self.CLOSED:
+                return True
+            if self._state == self.HALF_OPEN and self._probes_in_flight < self.half_open_max_calls:
+                self._probes_in_flight += 1
+                return True
+            self._rejected += 1
+            return False
+
+    def record(self, success: bool, latency: float) -> None:
+        """Record the outcome of a call that allow_request() let through"""
+        now = time.monotonic()
+        slow = latency >= self.slow_call_seconds
+        with self._lock:
+            if self._state == self.HALF_OPEN:
+                self._probes_in_flight = max(0, self._probes_in_flight - 1)
+                if success and not slow:
+                    self._state = self.CLOSED
+                    self._outcomes.clear()
+                    logger.info("Circuit breaker '%s' closed", self.name)
+                else:
+                    self._trip(now)
+                return
+            if self._state == self.OPEN:
+                return
+
+            self._outcomes.append((now, not success, slow))
+            self._prune(now)
+            total = len(self._outcomes)
+            if total < self.minimum_calls:
+                return
+            failures = sum(1 for _, failed, _ in self._outcomes if failed)
+            slow_calls = sum(1 for _, _, was_slow in self._outcomes if was_slow)
+            if failures / total >= self.failure_rate_threshold or slow_calls / total >= self.slow_call_rate_threshold:
+                self._trip(now)
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            if self._state == self.OPEN and time.monotonic() - self._opened_at >= self.open_seconds:
+                return self.HALF_OPEN
+            return self._state
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Current state and window statistics, for /api/health"""
+        now = time.monotonic()
+        state = self.state
+        with self._lock:
+            self._prune(now)
+            total = len(self._outcomes)
+            failures = sum(1 for _, failed, _ in self._outcomes if failed)
+            slow_calls = sum(1 for _, _, was_slow in self._outcomes if was_slow)
+            retry_in = None
+            if state == self.OPEN:
+                retry_in = round(max(0.0, self.open_seconds - (now - self._opened_at)), 1)
+            return {
+                'state': state,
+                'calls': total,
+                'failureRate': round(failures / total, 3) if total else 0.0,
+                'slowCallRate': round(slow_calls / total, 3) if total else 0.0,
+                'rejected': self._rejected,
+                'retryInSeconds': retry_in,
+            }
+
+_breakers: Dict[str, CircuitBreaker] = {}
+_breakers_lock = threading.Lock()
+
+def get_breaker(name: str) -> CircuitBreaker:
+    """Return the breaker for an upstream endpoint, creating it from Config on first use"""
+    breaker = _breakers.get(name)
+    if breaker is None:
+        with _breakers_lock:
+            breaker = _breakers.get(name)
+            if breaker is None:
+                breaker = CircuitBreaker(
+                    name,
+                    failure_rate_threshold=Config.CIRCUIT_FAILURE_RATE,
+                    slow_call_seconds=Config.CIRCUIT_SLOW_CALL_SECONDS,
+                    slow_call_rate_threshold=Config.CIRCUIT_SLOW_CALL_RATE,
+                    window_seconds=Config.CIRCUIT_WINDOW_SECONDS,
+                    minimum_calls=Config.CIRCUIT_MINIMUM_CALLS,
+                    open_seconds=Config.CIRCUIT_OPEN_SECONDS,
+                    half_open_max_calls=Config.CIRCUIT_HALF_OPEN_PROBES,
+                )
+                _breakers[name] = breaker
+    return breaker
+
+def breaker_states() -> Dict[str, Dict[str, Any]]:
+    """Snapshot of every breaker created so far, keyed by endpoint"""
+    with _breakers_lock:
+        breakers = list(_breakers.values())
+    return {b.name: b.snapshot() for b in sorted(breakers, key=lambda b: b.name)}
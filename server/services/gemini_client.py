@@ -0,0 +1,186 @@
+import os
+import threading
+import time
+import json
+from typing import Optional, Dict, Any, Iterator, Union, Tuple
+import requests
+from requests.adapters import HTTPAdapter
+from config import Config
+from services import metrics
+from services.circuit_breaker import get_breaker
+from services.quota import quota
+
+# One pooled session per process. gunicorn forks workers after preloading the
+# app, so the owning pid is tracked and a fresh session is built in each child
+# instead of sharing sockets inherited from the master.
+_session: Optional[requests.Session] = None
+_session_pid: Optional[int] = None
+_session_lock = threading.Lock()
+
+Timeout = Union[float, Tuple[float, float]]
+
+def get_session() -> requests.Session:
+    """Return the process-wide keep-alive session used for Gemini calls"""
+    global _session, _session_pid
+    pid = os.getpid()
+    if _session is not None and _session_pid == pid:
+        return _session
+    with _session_lock:
+        if _session is None or _session_pid != pid:
+            session = requests.Session()
+            adapter = HTTPAdapter(
+                pool_connections=Config.GEMINI_POOL_CONNECTIONS,
+                pool_maxsize=Config.GEMINI_POOL_MAXSIZE,
+                max_retries=0,
+            )
+            session.mount('https://', adapter)
+            session.mount('http://', adapter)
+            session.headers.update({'Content-Type': 'application/json'})
+            _session = session
+            _session_pid = pid
+    return _session
+
+def _resolve_timeout(timeout: Optional[Timeout]) -> Timeout:
+    """Build a (connect, read) timeout tuple from a per-call read timeout"""
+    if timeout is None:
+        return (Config.GEMINI_CONNECT_TIMEOUT, Config.GEMINI_READ_TIMEOUT)
+    if isinstance(timeout, tuple):
+        return timeout
+    return (min(Config.GEMINI_CONNECT_TIMEOUT, timeout), timeout)
+
+def build_request(prompt: str) -> Dict[str, Any]:
+    """Build the generateContent request body for a single text prompt"""
+    return {
+        'contents': [
+            {
+                'parts': [
+                    {
+                        'text': prompt
+                    }
+                ]
+            }
+        ]
+    }
+
+def post(payload: Dict[str, Any], timeout: Optional[Timeout] = None, endpoint: str = 'gemini_api',
+         stream: bool = False) -> requests.Response:
+    """POST a payload to a Gemini endpoint over the pooled session"""
+    headers = {'X-goog-api-key': Config.get_api_key('gemini')}
+    return get_session().post(
+        Config.get_api_endpoint(endpoint),
+        headers=headers,
+        json=payload,
+        timeout=_resolve_timeout(timeout),
+        stream=stream,
+    )
+
+def _admit(prompt: str, kind: str):
+    """Take quota, then ask the breaker; returns the quota reservation or None"""
+    reservation = quota.acquire(prompt)
+    if reservation is None:
+        metrics.observe_upstream(kind, 'throttled')
+        return None
+    if not get_breaker(kind).allow_request():
+        reservation.cancel()
+        metrics.observe_upstream(kind, 'rejected')
+        return None
+    return reservation
+
+def _record(breaker, kind: str, success: bool, start: float, status: Optional[int] = None) -> None:
+    """Feed one call's outcome to the circuit breaker and the upstream metrics"""
+    latency = time.monotonic() - start
+    breaker.record(success, latency)
+    metrics.observe_upstream(kind, 'ok' if success else 'error', latency)
+    if status == 429:
+        # Our buckets under-estimated the real quota; make every worker back off
+        quota.exhaust()
+
+def generate_text(prompt: str, timeout: Optional[Timeout] = None, kind: str = 'default') -> Optional[str]:
+    """
+    Send a prompt to Gemini and return the first candidate's text.
+
+    Returns None on a non-200 response, when the client-side quota sheds the
+    call, or when the circuit breaker for `kind` (the calling endpoint) is open,
+    so callers drop straight to their fallbacks.
+    """
+    reservation = _admit(prompt, kind)
+    if reservation is None:
+        return None
+    breaker = get_breaker(kind)
+    start = time.monotonic()
+    try:
+        response = post(build_request(prompt), timeout=timeout)
+        if response.status_code != 200:
+            _record(breaker, kind, False, start, response.status_code)
+            return None
+        result = response.json()
+        text = result['candidates'][0]['content']['parts'][0]['text']
+    except Exception:
+        _record(breaker, kind, False, start)
+        raise
+    _record(breaker, kind, True, start)
+    usage = result.get('usageMetadata', {})
+    reservation.settle(usage.get('totalTokenCount'))
+    metrics.observe_tokens(getattr(prompt, 'template', kind), usage)
+    return text
+
+def stream_text(prompt: str, timeout: Optional[Timeout] = None, kind: str = 'default') -> Optional[Iterator[str]]:
+    """
+    Send a prompt to Gemini's streaming endpoint and return an iterator over the
+    text chunks as they arrive.
+
+    Returns None when the call is shed by the quota, the breaker for `kind` is
+    open or the request is refused, so callers can fall back before anything
+    has been sent to their client. The breaker outcome is recorded once the
+    stream has been fully consumed.
+    """
+    reservation = _admit(prompt, kind)
+    if reservation is None:
+        return None
+    breaker = get_breaker(kind)
+    start = time.monotonic()
+    try:
+        response = post(build_request(prompt), timeout=timeout, endpoint='gemini_stream_api', stream=True)
+    except Exception:
+        _record(breaker, kind, False, start)
+        raise
+    if response.status_code != 200:
+        response.close()
+        _record(breaker, kind, False, start, response.status_code)
+        return None
+
+    def chunks() -> Iterator[str]:
+        success = abandoned = False
+        usage: Dict[str, Any] = {}
+        try:
+            # Server-sent events: one "data: {...}" line per partial GenerateContentResponse
+            for line in response.iter_lines(decode_unicode=True):
+                if not line or not line.startswith('data:'):
+                    continue
+                event = json.loads(line[5:].strip())
+                usage = event.get('usageMetadata') or usage
+                for candidate in event.get('candidates', [])[:1]:
+                    for part in candidate.get('content', {}).get('parts', []):
+                        if part.get('text'):
+                            yield part['text']
+            success = True
+        except GeneratorExit:
+            # The downstream client went away mid-stream; Gemini itself was answering
+            abandoned = True
+            raise
+        finally:
+            response.close()
+            _record(breaker, kind, success or abandoned, start)
+            reservation.settle(usage.get('totalTokenCount'))
+            metrics.observe_tokens(getattr(prompt, 'template', kind), usage)
+
+    return chunks()
+
+def strip_code_fences(content: str) -> str:
+    """Remove the ```json fences Gemini tends to wrap JSON answers in"""
+    content = content.strip()
+    if content.startswith('```json'):
+        content = content[7:]
+    if content.endswith('```'):
+        content = content[:-3]
+    return content.strip()
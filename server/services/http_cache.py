@@ -0,0 +1,42 @@
+from datetime import date, datetime, timedelta, timezone
+from typing import Optional
+from flask import request
+from config import Config
+
+# Responses computed from code and static data can only change on deploy
+STARTED_AT = datetime.now(timezone.utc).replace(microsecond=0)
+
+def today_in(tzinfo=None) -> date:
+    """Today's date in a timezone (the server's local date when tzinfo is None)"""
+    return datetime.now(tzinfo).date()
+
+def seconds_until_midnight(tzinfo=None) -> int:
+    """Seconds until the next local midnight (server's, or in tzinfo), when "today" responses change"""
+    now = datetime.now(tzinfo).replace(tzinfo=None)
+    tomorrow = datetime.combine(now.date() + timedelta(days=1), datetime.min.time())
+    return max(1, int((tomorrow - now).total_seconds()))
+
+def max_age_for_date(day: Optional[date], tzinfo=None) -> int:
+    """Long-lived for past dates, until midnight for today (day=None), an hour otherwise"""
+    today = today_in(tzinfo)
+    if day is not None and day < today:
+        return Config.HTTP_MAX_AGE_PAST
+    if day is None or day == today:
+        return min(Config.HTTP_MAX_AGE_DAILY, seconds_until_midnight(tzinfo))
+    return Config.HTTP_MAX_AGE_DAILY
+
+def cacheable(response, max_age: int, last_modified: Optional[datetime] = None, etag: bool = True):
+    """
+    Add Cache-Control, an ETag of the body (unless etag is False) and
+    optionally Last-Modified to a 200 response, then answer a matching
+    If-None-Match / If-Modified-Since with 304 Not Modified and no body.
+    """
+    if response.status_code != 200:
+        return response
+    response.cache_control.public = True
+    response.cache_control.max_age = max_age
+    if etag:
+        response.add_etag()
+    if last_modified is not None:
+        response.last_modified = last_modified
+    return response.make_conditional(request)
@@ -0,0 +1,60 @@
+import json
+from typing import Any, List, Optional, Tuple
+
+class JsonFieldStream:
+    """
+    Incremental parser for a streamed JSON object.
+
+    Text is fed in arbitrary chunks (as Gemini streams it, possibly wrapped in
+    ```json fences) and each top-level "key": value pair is returned as soon as
+    its value is complete, without waiting for the closing brace.
+    """
+
+    def __init__(self):
+        self._buffer = ''
+        self._pos: Optional[int] = None
+        self._decoder = json.JSONDecoder()
+        self.fields: dict = {}
+
+    def _skip(self, pos: int, chars: str) -> int:
+        while pos < len(self._buffer) and self._buffer[pos] in chars:
+            pos += 1
+        return pos
+
+    def feed(self, chunk: str) -> List[Tuple[str, Any]]:
+        """Add a chunk of text and return the fields it completed, in order"""
+        self._buffer += chunk
+        completed: List[Tuple[str, Any]] = []
+        if self._pos is None:
+            start = self._buffer.find('{')
+            if start < 0:
+                return completed
+            self._pos = start + 1
+
+        buffer = self._buffer
+        while True:
+            pos = self._skip(self._pos, ' \t\r\n,')
+            if pos >= len(buffer) or buffer[pos] == '}':
+                break
+            try:
+                key, pos = self._decoder.raw_decode(buffer, pos)
+            except ValueError:
+                break
+            pos = self._skip(pos, ' \t\r\n')
+            if not isinstance(key, str) or pos >= len(buffer) or buffer[pos] != ':':
+                break
+            pos = self._skip(pos + 1, ' \t\r\n')
+            try:
+                value, end = self._decoder.raw_decode(buffer, pos)
+            except ValueError:
+                break
+            # A number is only complete once the delimiter after it has arrived:
+            # "1" may grow to "12", and "3." or "1e" decode as a shorter number
+            if isinstance(value, (int, float)) and not isinstance(value, bool):
+                after = self._skip(end, ' \t\r\n')
+                if after >= len(buffer) or buffer[after] not in ',}':
+                    break
+            self.fields[key] = value
+            completed.append((key, value))
+            self._pos = end
+        return completed
@@ -0,0 +1,51 @@
+from concurrent.futures import TimeoutError as FutureTimeout
+from typing import Any, Callable, Optional
+from flask import request, has_request_context
+from config import Config
+from services import background
+
+BUDGET_HEADER = 'X-Latency-Budget-Ms'
+
+def requested_latency_budget_ms() -> Optional[int]:
+    """The X-Latency-Budget-Ms header as an int, or None when the client sent none"""
+    if not has_request_context():
+        return None
+    raw = request.headers.get(BUDGET_HEADER)
+    if raw is None:
+        return None
+    try:
+        return int(raw)
+    except ValueError:
+        return None
+
+def get_latency_budget(default: Optional[float] = None) -> Optional[float]:
+    """
+    Latency budget in seconds for the current request's upstream AI call.
+
+    Taken from the X-Latency-Budget-Ms header when present (0 disables the
+    budget). Without the header, `default` seconds applies when given, else
+    Config.AI_LATENCY_BUDGET_MS. None means wait for the upstream call to finish.
+    """
+    budget_ms = requested_latency_budget_ms()
+    if budget_ms is None:
+        if default is not None:
+            return default or None
+        budget_ms = Config.AI_LATENCY_BUDGET_MS
+    if budget_ms <= 0:
+        return None
+    return min(budget_ms, Config.AI_LATENCY_BUDGET_MAX_MS) / 1000.0
+
+def call_with_budget(budget: Optional[float], fn: Callable[..., Any], *args, **kwargs) -> Any:
+    """
+    Call fn and return its result if it finishes within `budget` seconds.
+
+    When the budget runs out None is returned and fn keeps running on the
+    background pool, so whatever cache it fills is warm for the next request.
+    """
+    if not budget:
+        return fn(*args, **kwargs)
+    future = background.submit(fn, *args, **kwargs)
+    try:
+        return future.result(timeout=budget)
+    except FutureTimeout:
+        return None
@@ -0,0 +1,308 @@
+import json
+import os
+import threading
+import time
+from bisect import bisect_left
+from typing import Any, Dict, List, Optional, Tuple
+from config import Config
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - not available on Windows
+    fcntl = None
+
+# Request and upstream latencies span cached hits (ms) to slow Gemini calls (tens of s)
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 20.0, 30.0)
+
+Labels = Tuple[Tuple[str, str], ...]
+
+class Counter:
+    def __init__(self, name: str, help_text: str):
+        self.name = name
+        self.help = help_text
+        self.type = 'counter'
+        self.values: Dict[Labels, float] = {}
+
+    def inc(self, amount: float = 1.0, **labels: str) -> None:
+        key = tuple(sorted(labels.items()))
+        with _lock:
+            self.values[key] = self.values.get(key, 0.0) + amount
+
+    def set(self, value: float, **labels: str) -> None:
+        """Overwrite with a total tracked elsewhere (e.g. a cache's own hit counter)"""
+        key = tuple(sorted(labels.items()))
+        with _lock:
+            self.values[key] = value
+
+class Gauge(Counter):
+    """Point-in-time value; summed across workers when merged"""
+
+    def __init__(self, name: str, help_text: str):
+        super().__init__(name, help_text)
+        self.type = 'gauge'
+
+class Histogram:
+    def __init__(self, name: str, help_text: str, buckets: Tuple[float, ...] = LATENCY_BUCKETS):
+        self.name = name
+        self.help = help_text
+        self.type = 'histogram'
+        self.buckets = buckets
+        # labels -> [per-bucket counts (last is +Inf), sum]
+        self.values: Dict[Labels, List[Any]] = {}
+
+    def observe(self, value: float, **labels: str) -> None:
+        key = tuple(sorted(labels.items()))
+        index = bisect_left(self.buckets, value)
+        with _lock:
+            entry = self.values.get(key)
+            if entry is None:
+                entry = self.values[key] = [[0] * (len(self.buckets) + 1), 0.0]
+            entry[0][index] += 1
+            entry[1] += value
+
+_lock = threading.Lock()
+
+http_requests = Counter('http_requests_total', 'HTTP requests by endpoint, method and status')
+http_duration = Histogram('http_request_duration_seconds', 'HTTP request latency by endpoint')
+upstream_requests = Counter('gemini_requests_total', 'Gemini calls by prompt type and outcome (ok, error, rejected)')
+upstream_duration = Histogram('gemini_request_duration_seconds', 'Gemini call latency by prompt type')
+data_sources = Counter('response_data_source_total', 'Responses by endpoint and dataSource (AI, fallback, ...)')
+prompt_tokens = Counter('gemini_prompt_tokens_total', 'Prompt tokens billed by prompt template')
+response_tokens = Counter('gemini_response_tokens_total', 'Response tokens billed by prompt template')
+cached_tokens = Counter('gemini_cached_tokens_total', 'Prompt tokens served from the upstream context cache by prompt template')
+prompt_calls = Counter('gemini_template_calls_total', 'Gemini answers received by prompt template')
+cache_hits = Counter('cache_hits_total', 'Cache hits by cache')
+cache_misses = Counter('cache_misses_total', 'Cache misses by cache')
+cache_entries = Gauge('cache_entries', 'Entries currently held in memory by cache')
+
+METRICS = [http_requests, http_duration, upstream_requests, upstream_duration, data_sources,
+           prompt_tokens, response_tokens, cached_tokens, prompt_calls, cache_hits, cache_misses, cache_entries]
+
+_caches: Dict[str, Any] = {}
+_flusher_pid: Optional[int] = None
+_flusher_lock = threading.Lock()
+
+def track_cache(name: str, cache: Any) -> None:
+    """Export a TTLCache's hit/miss counters and size under the given name"""
+    _caches[name] = cache
+
+def observe_upstream(kind: str, outcome: str, latency: Optional[float] = None) -> None:
+    """Record one Gemini call (latency is None for calls the breaker rejected)"""
+    upstream_requests.inc(kind=kind, outcome=outcome)
+    if latency is not None:
+        upstream_duration.observe(latency, kind=kind)
+
+def record_data_source(source: Optional[str], endpoint: Optional[str] = None) -> None:
+    """
+    Count the dataSource (AI, fallback, ...) of the response being built. Within a
+    request it is counted once per distinct source when the response goes out;
+    streamed bodies, produced after that, pass their endpoint to count directly.
+    """
+    if not source:
+        return
+    if endpoint is not None:
+        data_sources.inc(endpoint=endpoint, source=str(source))
+        return
+    from flask import g, has_request_context
+    if has_request_context():
+        g.setdefault('data_sources', set()).add(str(source))
+
+def observe_tokens(template: str, usage: Optional[Dict[str, Any]]) -> None:
+    """Record Gemini's usageMetadata for one answer against the template that built the prompt"""
+    if not usage:
+        return
+    prompt_calls.inc(template=template)
+    prompt_tokens.inc(usage.get('promptTokenCount', 0), template=template)
+    response_tokens.inc(usage.get('candidatesTokenCount', 0), template=template)
+    cached_tokens.inc(usage.get('cachedContentTokenCount', 0), template=template)
+
+def _encode(labels: Labels) -> str:
+    return json.dumps(labels)
+
+def snapshot() -> Dict[str, Any]:
+    """This process's metrics as plain JSON-serializable data"""
+    for name, cache in list(_caches.items()):
+        stats = cache.stats()
+        cache_hits.set(float(stats['hits']), cache=name)
+        cache_misses.set(float(stats['misses']), cache=name)
+        cache_entries.set(float(stats['size']), cache=name)
+    with _lock:
+        return {metric.name: {_encode(k): v if metric.type != 'histogram' else [list(v[0]), v[1]]
+                              for k, v in metric.values.items()}
+                for metric in METRICS}
+
+def _merge(total: Dict[str, Any], part: Dict[str, Any], include_gauges: bool = True) -> None:
+    for metric in METRICS:
+        if metric.type == 'gauge' and not include_gauges:
+            continue
+        target = total.setdefault(metric.name, {})
+        for key, value in part.get(metric.name, {}).items():
+            if metric.type != 'histogram':
+                target[key] = target.get(key, 0.0) + value
+            elif key not in target:
+                target[key] = [list(value[0]), value[1]]
+            else:
+                target[key][0] = [a + b for a, b in zip(target[key][0], value[0])]
+                target[key][1] += value[1]
+
+def _path(name: str) -> str:
+    return os.path.join(Config.METRICS_DIR, name)
+
+def _read(path: str) -> Dict[str, Any]:
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+def _write(path: str, data: Dict[str, Any]) -> None:
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, 'w') as f:
+        json.dump(data, f)
+    os.replace(tmp, path)
+
+def flush() -> None:
+    """Write this worker's snapshot for the other workers"""
+    try:
+        os.makedirs(Config.METRICS_DIR, exist_ok=True)
+        _write(_path(f"worker-{os.getpid()}.json"), snapshot())
+    except OSError as e:
+        print(f"Error writing metrics snapshot: {e}")
+
+def _flush_periodically() -> None:
+    while True:
+        time.sleep(Config.METRICS_FLUSH_SECONDS)
+        flush()
+
+def start_flusher() -> None:
+    """Flush every METRICS_FLUSH_SECONDS from a thread of this process, off the request path"""
+    global _flusher_pid
+    pid = os.getpid()
+    if _flusher_pid == pid:
+        return
+    with _flusher_lock:
+        if _flusher_pid == pid:
+            return
+        _flusher_pid = pid
+        threading.Thread(target=_flush_periodically, name='metrics-flush', daemon=True).start()
+
+def _alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+def collect() -> Dict[str, Any]:
+    """
+    Merge the snapshots of every worker. Snapshots left by workers that have
+    exited (max_requests recycling) are folded into an archive so counters
+    stay monotonic across recycles.
+    """
+    flush()
+    total: Dict[str, Any] = {}
+    try:
+        names = os.listdir(Config.METRICS_DIR)
+    except OSError:
+        names = []
+    lock_file = open(_path('archive.lock'), 'a') if fcntl and names else None
+    try:
+        if lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+        archive = _read(_path('archive.json'))
+        dead = []
+        for name in names:
+            if not (name.startswith('worker-') and name.endswith('.json')):
+                continue
+            pid = int(name[len('worker-'):-len('.json')])
+            data = _read(_path(name))
+            if pid != os.getpid() and not _alive(pid) and lock_file:
+                # A dead worker's counters still count; its gauges no longer hold
+                _merge(archive, data, include_gauges=False)
+                dead.append(name)
+            else:
+                _merge(total, data)
+        if dead:
+            _write(_path('archive.json'), archive)
+            for name in dead:
+                os.remove(_path(name))
+        _merge(total, archive)
+    finally:
+        if lock_file:
+            lock_file.close()
+    return total
+
+def reset() -> None:
+    """Remove snapshots from a previous run (called once by the gunicorn master)"""
+    try:
+        for name in os.listdir(Config.METRICS_DIR):
+            if name.endswith('.json'):
+                os.remove(_path(name))
+    except OSError:
+        pass
+
+def _format_labels(labels: List[List[str]], extra: Optional[Tuple[str, str]] = None) -> str:
+    pairs = [tuple(pair) for pair in labels] + ([extra] if extra else [])
+    if not pairs:
+        return ''
+    escaped = ['%s="%s"' % (k, str(v).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n'))
+               for k, v in pairs]
+    return '{' + ','.join(escaped) + '}'
+
+def _format_value(value: float) -> str:
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+def render() -> str:
+    """All workers' metrics in the Prometheus text exposition format"""
+    data = collect()
+    lines: List[str] = []
+    for metric in METRICS:
+        lines.append(f"# HELP {metric.name} {metric.help}")
+        lines.append(f"# TYPE {metric.name} {metric.type}")
+        for key, value in sorted(data.get(metric.name, {}).items()):
+            labels = json.loads(key)
+            if metric.type != 'histogram':
+                lines.append(f"{metric.name}{_format_labels(labels)} {_format_value(value)}")
+                continue
+            counts, total = value
+            cumulative = 0
+            for bound, count in zip(list(metric.buckets) + ['+Inf'], counts):
+                cumulative += count
+                le = bound if bound == '+Inf' else _format_value(bound)
+                lines.append(f"{metric.name}_bucket{_format_labels(labels, ('le', le))} {cumulative}")
+            lines.append(f"{metric.name}_sum{_format_labels(labels)} {_format_value(total)}")
+            lines.append(f"{metric.name}_count{_format_labels(labels)} {cumulative}")
+
+    # Derived per-cache hit ratio over every worker's lifetime counters
+    lines.append('# HELP cache_hit_ratio Cache hits / (hits + misses) by cache')
+    lines.append('# TYPE cache_hit_ratio gauge')
+    hits = data.get('cache_hits_total', {})
+    misses = data.get('cache_misses_total', {})
+    for key in sorted(set(hits) | set(misses)):
+        lookups = hits.get(key, 0.0) + misses.get(key, 0.0)
+        ratio = hits.get(key, 0.0) / lookups if lookups else 0.0
+        lines.append(f"cache_hit_ratio{_format_labels(json.loads(key))} {round(ratio, 4)}")
+    return '\n'.join(lines) + '\n'
+
+def init_metrics(app) -> None:
+    """Time every request and count status codes and dataSource values per endpoint"""
+    from flask import g, request
+
+    @app.before_request
+    def _start_timer():
+        g.metrics_start = time.perf_counter()
+
+    @app.after_request
+    def _record_request(response):
+        start = g.pop('metrics_start', None)
+        endpoint = request.endpoint or 'unmatched'
+        http_requests.inc(endpoint=endpoint, method=request.method, status=str(response.status_code))
+        if start is not None:
+            http_duration.observe(time.perf_counter() - start, endpoint=endpoint)
+        for source in g.pop('data_sources', ()):
+            data_sources.inc(endpoint=endpoint, source=source)
+        # Threads do not survive gunicorn's fork, so each worker starts its own
+        start_flusher()
+        return response
@@ -0,0 +1,198 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Hashable, Optional, Tuple
+from config import Config
+from services.cache import TTLCache
+
+class SQLiteStore:
+    """
+    Key/value store in a SQLite database opened in WAL mode, so every gunicorn
+    worker on the host can read while one writes and entries survive restarts.
+
+    Values are stored as JSON with an absolute (wall clock) expiry. Errors are
+    logged and treated as misses: the store must never fail a request.
+    """
+
+    PRUNE_EVERY = 200
+
+    def __init__(self, path: str, stale_seconds: float):
+        self.path = path
+        self.stale_seconds = stale_seconds
+        self._local = threading.local()
+        self._writes = 0
+        self._lock = threading.Lock()
+
+    def _connect(self) -> sqlite3.Connection:
+        # One connection per thread, reopened after fork
+        conn = getattr(self._local, 'conn', None)
+        if conn is not None and self._local.pid == os.getpid():
+            return conn
+        conn = sqlite3.connect(self.path, timeout=5, isolation_level=None, check_same_thread=False)
+        conn.execute('PRAGMA journal_mode=WAL')
+        conn.execute('PRAGMA synchronous=NORMAL')
+        conn.execute('''
+            CREATE TABLE IF NOT EXISTS response_cache (
+                namespace TEXT NOT NULL,
+                cache_key TEXT NOT NULL,
+                value TEXT NOT NULL,
+                expires_at REAL NOT NULL,
+                PRIMARY KEY (namespace, cache_key)
+            )
+        ''')
+        self._local.conn = conn
+        self._local.pid = os.getpid()
+        return conn
+
+    @staticmethod
+    def encode_key(key: Hashable) -> str:
+        return json.dumps(list(key) if isinstance(key, tuple) else key, default=str)
+
+    def get(self, namespace: str, key: Hashable) -> Optional[Tuple[Any, float]]:
+        """Return (value, expires_at) for a key, expired or not, or None"""
+        try:
+            row = self._connect().execute(
+                'SELECT value, expires_at FROM response_cache WHERE namespace = ? AND cache_key = ?',
+                (namespace, self.encode_key(key)),
+            ).fetchone()
+        except sqlite3.Error as e:
+            print(f"Persistent cache read failed ({namespace}): {e}")
+            return None
+        if row is None:
+            return None
+        return json.loads(row[0]), row[1]
+
+    def set(self, namespace: str, key: Hashable, value: Any, ttl: float) -> None:
+        try:
+            conn = self._connect()
+            conn.execute(
+                'INSERT OR REPLACE INTO response_cache (namespace, cache_key, value, expires_at) VALUES (?, ?, ?, ?)',
+                (namespace, self.encode_key(key), json.dumps(value), time.time() + ttl),
+            )
+            self._count_write(conn)
+        except (sqlite3.Error, TypeError, ValueError) as e:
+            print(f"Persistent cache write failed ({namespace}): {e}")
+
+    def add(self, namespace: str, key: Hashable, value: Any, ttl: float) -> Optional[Tuple[Any, float]]:
+        """Store a value unless a live one is already stored; return the stored (value, expires_at)"""
+        now = time.time()
+        try:
+            conn = self._connect()
+            conn.execute(
+                'INSERT INTO response_cache (namespace, cache_key, value, expires_at) VALUES (?, ?, ?, ?) '
+                'ON CONFLICT (namespace, cache_key) DO UPDATE SET value = excluded.value, expires_at = excluded.expires_at '
+                'WHERE response_cache.expires_at <= ?',
+                (namespace, self.encode_key(key), json.dumps(value), now + ttl, now),
+            )
+            self._count_write(conn)
+        except (sqlite3.Error, TypeError, ValueError) as e:
+            print(f"Persistent cache write failed ({namespace}): {e}")
+            return None
+        return self.get(namespace, key)
+
+    def _count_write(self, conn: sqlite3.Connection) -> None:
+        with self._lock:
+            self._writes += 1
+            prune = self._writes % self.PRUNE_EVERY == 0
+        if prune:
+            # Entries are kept past expiry as stale fallbacks, but not forever
+            conn.execute('DELETE FROM response_cache WHERE expires_at < ?', (time.time() - self.stale_seconds,))
+
+    def clear(self, namespace: str) -> None:
+        try:
+            self._connect().execute('DELETE FROM response_cache WHERE namespace = ?', (namespace,))
+        except sqlite3.Error as e:
+            print(f"Persistent cache clear failed ({namespace}): {e}")
+
+_store: Optional[SQLiteStore] = None
+_store_lock = threading.Lock()
+
+def get_store() -> Optional[SQLiteStore]:
+    """Return the process-wide store, or None when PERSISTENT_CACHE_PATH is empty"""
+    global _store
+    if not Config.PERSISTENT_CACHE_PATH:
+        return None
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                _store = SQLiteStore(Config.PERSISTENT_CACHE_PATH, Config.PERSISTENT_CACHE_STALE_SECONDS)
+    return _store
+
+class TieredCache(TTLCache):
+    """
+    TTLCache backed by the persistent store: reads fall through to SQLite on a
+    memory miss and promote what they find, writes go to both tiers. A worker
+    that was just recycled or restarted is therefore warm from its first request.
+    """
+
+    def __init__(self, namespace: str, ttl: float, maxsize: int = 256):
+        super().__init__(ttl, maxsize)
+        self.namespace = namespace
+        self.disk_hits = 0
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        value = super().get(key)
+        if value is not None:
+            return value
+        store = get_store()
+        entry = store.get(self.namespace, key) if store else None
+        if entry is None:
+            return None
+        value, expires_at = entry
+        remaining = expires_at - time.time()
+        if remaining <= 0:
+            return None
+        super().set(key, value, ttl=remaining)
+        with self._lock:
+            # The memory tier counted a miss, but the lookup as a whole was served
+            self.misses -= 1
+            self.hits += 1
+            self.disk_hits += 1
+        return value
+
+    def get_stale(self, key: Hashable) -> Optional[Any]:
+        value = super().get_stale(key)
+        if value is not None:
+            return value
+        store = get_store()
+        entry = store.get(self.namespace, key) if store else None
+        return entry[0] if entry is not None else None
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> None:
+        super().set(key, value, ttl)
+        store = get_store()
+        if store:
+            store.set(self.namespace, key, value, self.ttl if ttl is None else ttl)
+
+    def set_shared(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> Any:
+        """
+        Store a value unless another worker already stored a live one, and
+        return whichever value the persistent store holds, so every worker
+        serves (and ETags) the same content for the key.
+        """
+        ttl = self.ttl if ttl is None else ttl
+        store = get_store()
+        entry = store.add(self.namespace, key, value, ttl) if store else None
+        if entry is not None:
+            value, expires_at = entry
+            ttl = expires_at - time.time()
+        super().set(key, value, ttl)
+        return value
+
+    @property
+    def shared(self) -> bool:
+        """Whether values are shared through the persistent store across workers"""
+        return get_store() is not None
+
+    def clear(self) -> None:
+        super().clear()
+        store = get_store()
+        if store:
+            store.clear(self.namespace)
+
+    def stats(self) -> Dict[str, Any]:
+        stats = super().stats()
+        stats['diskHits'] = self.disk_hits
+        return stats
@@ -0,0 +1,163 @@
+import cProfile
+import hmac
+import io
+import os
+import pstats
+import sys
+import threading
+import time
+import uuid
+from collections import Counter
+from typing import Dict, List, Optional
+from config import Config
+
+PROFILE_HEADER = 'X-Profile'
+MODE_HEADER = 'X-Profile-Mode'
+MODES = ('cprofile', 'sample')
+
+# cProfile can only have one active profiler per process (Python 3.12+), so
+# concurrent profiled requests take turns; the loser is served unprofiled.
+_cprofile_lock = threading.Lock()
+
+class StackSampler:
+    """
+    Samples one thread's stack every `interval` seconds and counts collapsed
+    stacks ("outer;inner;leaf"), the input format of flamegraph.pl / speedscope.
+    Unlike cProfile, time blocked on sockets (Gemini) shows up as samples.
+    """
+
+    def __init__(self, thread_id: int, interval: float):
+        self.thread_id = thread_id
+        self.interval = interval
+        self.stacks: Counter = Counter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name='profile-sampler', daemon=True)
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            frames: List[str] = []
+            while frame is not None:
+                code = frame.f_code
+                frames.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{frame.f_lineno})")
+                frame = frame.f_back
+            if frames:
+                self.stacks[';'.join(reversed(frames))] += 1
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._thread.join()
+
+    def folded(self) -> str:
+        return ''.join(f"{stack} {count}\n" for stack, count in self.stacks.most_common())
+
+def requested_mode(headers, args) -> Optional[str]:
+    """
+    Return the profiling mode if the request carries the configured token, else None.
+    The token is only read from the X-Profile header: query strings end up in access logs.
+    """
+    token = Config.PROFILE_TOKEN
+    if not token:
+        return None
+    supplied = headers.get(PROFILE_HEADER) or ''
+    if not hmac.compare_digest(supplied.encode(), token.encode()):
+        return None
+    mode = (headers.get(MODE_HEADER) or args.get('profile_mode') or 'cprofile').lower()
+    return mode if mode in MODES else 'cprofile'
+
+def _output_path(endpoint: str, ext: str, stem: str) -> str:
+    os.makedirs(Config.PROFILE_DIR, exist_ok=True)
+    return os.path.join(Config.PROFILE_DIR, f"{stem}-{endpoint}.{ext}")
+
+def init_profiling(app) -> None:
+    """Profile individual /api requests on demand; result paths come back in X-Profile-File"""
+    from flask import g, request
+
+    @app.before_request
+    def _start_profile():
+        if not request.path.startswith('/api/'):
+            return
+        mode = requested_mode(request.headers, request.args)
+        if mode is None:
+            return
+        if mode == 'cprofile':
+            if not _cprofile_lock.acquire(blocking=False):
+                g.profile_error = 'another request is being profiled'
+                return
+            profiler = cProfile.Profile()
+            profiler.enable()
+        else:
+            profiler = StackSampler(threading.get_ident(), Config.PROFILE_SAMPLE_INTERVAL_MS / 1000.0)
+            profiler.start()
+        g.profile = (mode, profiler, time.perf_counter())
+
+    @app.after_request
+    def _finish_profile(response):
+        if 'profile_error' in g:
+            response.headers['X-Profile-Error'] = g.pop('profile_error')
+        if 'profile' not in g:
+            return response
+        mode, profiler, start = g.pop('profile')
+        endpoint = (request.endpoint or 'unmatched').replace('.', '_')
+        stem = f"{time.strftime('%Y%m%d-%H%M%S')}-{uuid.uuid4().hex[:8]}"
+        exts = ('prof', 'txt') if mode == 'cprofile' else ('folded',)
+        try:
+            paths = {ext: _output_path(endpoint, ext, stem) for ext in exts}
+        except OSError:
+            paths = {}
+        title = f"{request.method} {request.path} {response.status_code}"
+
+        def finish() -> Optional[float]:
+            """Stop the profiler and write its output; returns the profiled time in ms"""
+            elapsed_ms = (time.perf_counter() - start) * 1000
+            try:
+                if mode == 'cprofile':
+                    profiler.disable()
+                    _cprofile_lock.release()
+                    profiler.dump_stats(paths['prof'])
+                    summary = io.StringIO()
+                    stats = pstats.Stats(profiler, stream=summary)
+                    stats.sort_stats('cumulative').print_stats(40)
+                    with open(paths['txt'], 'w') as f:
+                        f.write(f"{title} {elapsed_ms:.1f} ms\n")
+                        f.write(summary.getvalue())
+                else:
+                    profiler.stop()
+                    with open(paths['folded'], 'w') as f:
+                        f.write(profiler.folded())
+            except (OSError, KeyError) as e:
+                print(f"Error writing request profile: {e}")
+                return None
+            return elapsed_ms
+
+        if response.is_streamed:
+            # The body is produced after this hook returns: keep profiling until the
+            # server closes the response, then write the files named up front
+            response.call_on_close(finish)
+            if paths:
+                response.headers['X-Profile-File'] = ', '.join(paths.values())
+            return response
+
+        elapsed_ms = finish()
+        if elapsed_ms is None:
+            response.headers['X-Profile-Error'] = 'could not write profile'
+            return response
+        response.headers['X-Profile-File'] = ', '.join(paths.values())
+        response.headers['X-Profile-Duration-Ms'] = f"{elapsed_ms:.1f}"
+        return response
+
+    @app.teardown_request
+    def _abandon_profile(exc):
+        # after_request did not run (unhandled error): never leave a profiler active
+        entry = g.pop('profile', None)
+        if entry is None:
+            return
+        mode, profiler, _ = entry
+        if mode == 'cprofile':
+            profiler.disable()
+            _cprofile_lock.release()
+        else:
+            profiler.stop()
@@ -0,0 +1,48 @@
+import string
+import textwrap
+from typing import Dict, List
+
+class RenderedPrompt(str):
+    """Prompt text that remembers which template produced it (for token accounting)"""
+    template = 'adhoc'
+
+class PromptTemplate:
+    """
+    A Gemini prompt split into a static prefix (instructions, schema, reference
+    lists) built once at import, and a short per-request suffix filled with
+    str.format fields. Every request using the template shares the exact same
+    leading text, which is what upstream prefix/context caching keys on.
+    """
+
+    def __init__(self, name: str, prefix: str, suffix: str = ''):
+        self.name = name
+        self.prefix = textwrap.dedent(prefix).strip()
+        self.suffix = textwrap.dedent(suffix).strip()
+        self.fields = sorted({field for _, field, _, _ in string.Formatter().parse(self.suffix) if field})
+
+    def render(self, **variables) -> RenderedPrompt:
+        missing = [field for field in self.fields if field not in variables]
+        if missing:
+            raise KeyError(f"Prompt '{self.name}' is missing variables: {', '.join(missing)}")
+        text = self.prefix
+        if self.suffix:
+            text = f"{self.prefix}\n\n{self.suffix.format(**variables)}"
+        prompt = RenderedPrompt(text)
+        prompt.template = self.name
+        return prompt
+
+_registry: Dict[str, PromptTemplate] = {}
+
+def register(name: str, prefix: str, suffix: str = '') -> PromptTemplate:
+    """Compile and register a template; called once per template at import time"""
+    if name in _registry:
+        raise ValueError(f"Prompt template '{name}' is already registered")
+    template = PromptTemplate(name, prefix, suffix)
+    _registry[name] = template
+    return template
+
+def get_template(name: str) -> PromptTemplate:
+    return _registry[name]
+
+def templates() -> List[PromptTemplate]:
+    return [_registry[name] for name in sorted(_registry)]
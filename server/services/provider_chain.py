@@ -0,0 +1,73 @@
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, wait
+from typing import Any, Callable, List, Optional, Tuple
+from config import Config
+from services.background import ForkSafePool
+
+# (name, enabled, fetch) in priority order. fetch is called with the seconds
+# left before the deadline (None for no deadline) and returns None when it has
+# nothing.
+Provider = Tuple[str, bool, Callable[[Optional[float]], Optional[Any]]]
+
+# Race legs get their own bounded pool so a slow provider cannot tie up the
+# shared background pool that latency budgets rely on
+race_pool = ForkSafePool('provider-race', lambda: Config.PROVIDER_RACE_WORKERS)
+
+def _outcome(name: str, future: Future) -> Optional[Any]:
+    try:
+        return future.result()
+    except Exception as e:
+        print(f"Provider {name} failed: {e}")
+        return None
+
+def race_providers(providers: List[Provider], deadline: Optional[float]) -> Optional[Tuple[str, Any]]:
+    """
+    Fire every enabled provider concurrently and return (name, result) for the
+    highest-priority provider with a usable result.
+
+    A lower-priority result is only taken once every provider above it has come
+    back empty. When `deadline` (seconds) runs out, the best result finished so
+    far wins, or None. Providers still queued are cancelled; running ones are
+    handed the time left when they start and should give up by then.
+    """
+    enabled = [(name, fetch) for name, is_enabled, fetch in providers if is_enabled]
+    if not enabled:
+        return None
+    end = time.monotonic() + deadline if deadline else None
+
+    def leg(fetch: Callable[[Optional[float]], Optional[Any]]) -> Optional[Any]:
+        remaining = None if end is None else end - time.monotonic()
+        if remaining is not None and remaining <= 0:
+            return None
+        return fetch(remaining)
+
+    futures = [(name, race_pool.submit(leg, fetch)) for name, fetch in enabled]
+    results = {}
+
+    def decided(final: bool) -> Optional[Tuple[str, Any]]:
+        for name, future in futures:
+            if not future.done():
+                if final:
+                    continue
+                return None
+            if name not in results:
+                results[name] = _outcome(name, future)
+            result = results[name]
+            if result:
+                return name, result
+        return None
+
+    try:
+        pending = {future for _, future in futures}
+        while pending:
+            winner = decided(final=False)
+            if winner:
+                return winner
+            remaining = None if end is None else end - time.monotonic()
+            if remaining is not None and remaining <= 0:
+                break
+            _, pending = wait(pending, timeout=remaining, return_when=FIRST_COMPLETED)
+        return decided(final=True)
+    finally:
+        for _, future in futures:
+            future.cancel()
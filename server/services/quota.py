@@ -0,0 +1,245 @@
+import contextvars
+import heapq
+import itertools
+import os
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Optional, Tuple
+from config import Config
+
+# Lower value = served first when the quota is contended
+INTERACTIVE = 0
+BACKGROUND = 1
+
+# Priority of the Gemini calls made by the current request or job. Copied into
+# background.submit() work, so budgeted calls keep their request's priority.
+current_priority: contextvars.ContextVar = contextvars.ContextVar('gemini_priority', default=INTERACTIVE)
+
+@contextmanager
+def priority(level: int):
+    """Run the enclosed Gemini calls at the given priority"""
+    token = current_priority.set(level)
+    try:
+        yield
+    finally:
+        current_priority.reset(token)
+
+def estimate_tokens(prompt: str) -> int:
+    """Rough prompt + answer size (~4 characters per token) charged before the call"""
+    return len(prompt) // 4 + Config.GEMINI_EXPECTED_OUTPUT_TOKENS
+
+class _LocalBuckets:
+    """Token buckets for this process only (used when QUOTA_DB_PATH is empty)"""
+
+    def __init__(self):
+        self._state: Dict[str, Tuple[float, float]] = {}
+        self._lock = threading.Lock()
+
+    def take(self, costs: Dict[str, float], limits: Dict[str, Tuple[float, float]]) -> float:
+        now = time.time()
+        with self._lock:
+            levels = {name: _refill(self._state.get(name), limits[name], now) for name in costs}
+            wait = _shortfall(levels, costs, limits)
+            if wait == 0:
+                for name, cost in costs.items():
+                    levels[name] -= cost
+            for name, level in levels.items():
+                self._state[name] = (level, now)
+            return wait
+
+    def give(self, name: str, amount: float, limits: Dict[str, Tuple[float, float]]) -> None:
+        now = time.time()
+        with self._lock:
+            level = _refill(self._state.get(name), limits[name], now)
+            self._state[name] = (max(-limits[name][0], min(limits[name][0], level + amount)), now)
+
+class _SQLiteBuckets:
+    """
+    Token buckets in a small SQLite database so every gunicorn worker on the
+    host draws from the same per-minute quota. Each take/give is one
+    BEGIN IMMEDIATE transaction (refill, check, debit).
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._local = threading.local()
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = getattr(self._local, 'conn', None)
+        if conn is not None and self._local.pid == os.getpid():
+            return conn
+        conn = sqlite3.connect(self.path, timeout=5, isolation_level=None, check_same_thread=False)
+        conn.execute('PRAGMA journal_mode=WAL')
+        conn.execute('CREATE TABLE IF NOT EXISTS buckets (name TEXT PRIMARY KEY, level REAL NOT NULL, updated REAL NOT NULL)')
+        self._local.conn = conn
+        self._local.pid = os.getpid()
+        return conn
+
+    def _load(self, conn: sqlite3.Connection, name: str) -> Optional[Tuple[float, float]]:
+        row = conn.execute('SELECT level, updated FROM buckets WHERE name = ?', (name,)).fetchone()
+        return (row[0], row[1]) if row else None
+
+    def _update(self, fn) -> float:
+        conn = self._connect()
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            result = fn(conn, time.time())
+            conn.execute('COMMIT')
+            return result
+        except BaseException:
+            conn.execute('ROLLBACK')
+            raise
+
+    def take(self, costs: Dict[str, float], limits: Dict[str, Tuple[float, float]]) -> float:
+        def apply(conn, now):
+            levels = {name: _refill(self._load(conn, name), limits[name], now) for name in costs}
+            wait = _shortfall(levels, costs, limits)
+            if wait == 0:
+                for name, cost in costs.items():
+                    levels[name] -= cost
+            for name, level in levels.items():
+                conn.execute('INSERT OR REPLACE INTO buckets (name, level, updated) VALUES (?, ?, ?)', (name, level, now))
+            return wait
+        return self._update(apply)
+
+    def give(self, name: str, amount: float, limits: Dict[str, Tuple[float, float]]) -> None:
+        def apply(conn, now):
+            level = _refill(self._load(conn, name), limits[name], now)
+            level = max(-limits[name][0], min(limits[name][0], level + amount))
+            conn.execute('INSERT OR REPLACE INTO buckets (name, level, updated) VALUES (?, ?, ?)', (name, level, now))
+            return 0.0
+        self._update(apply)
+
+def _refill(state: Optional[Tuple[float, float]], limit: Tuple[float, float], now: float) -> float:
+    capacity, rate = limit
+    if state is None:
+        return capacity
+    level, updated = state
+    return min(capacity, level + max(0.0, now - updated) * rate)
+
+def _shortfall(levels: Dict[str, float], costs: Dict[str, float], limits: Dict[str, Tuple[float, float]]) -> float:
+    """Seconds until every bucket can cover its cost (0 if it already can)"""
+    wait = 0.0
+    for name, cost in costs.items():
+        if levels[name] < cost:
+            wait = max(wait, (cost - levels[name]) / limits[name][1])
+    return wait
+
+class Reservation:
+    """Quota taken for one Gemini call; settle() with the real token count afterwards"""
+
+    def __init__(self, manager: 'QuotaManager', tokens: int):
+        self.manager = manager
+        self.tokens = tokens
+
+    def settle(self, actual_tokens: Optional[int]) -> None:
+        """Refund (or charge) the difference between the estimate and usageMetadata"""
+        if actual_tokens is not None and self.manager.enabled('tokens'):
+            self.manager.adjust('tokens', self.tokens - actual_tokens)
+
+    def cancel(self) -> None:
+        """The call was never sent: return everything"""
+        if self.manager.enabled('requests'):
+            self.manager.adjust('requests', 1)
+        if self.manager.enabled('tokens'):
+            self.manager.adjust('tokens', self.tokens)
+
+class QuotaManager:
+    """
+    Client-side Gemini quota shared by every blueprint and worker: a
+    requests-per-minute and a tokens-per-minute bucket. Interactive callers
+    queue (in priority order) for up to QUOTA_MAX_WAIT_SECONDS; background
+    work is shed immediately so its caller falls back without a round trip.
+    """
+
+    def __init__(self):
+        self._buckets = None
+        self._pid: Optional[int] = None
+        self._cond = threading.Condition()
+        self._queue: list = []
+        self._seq = itertools.count()
+
+    def limits(self) -> Dict[str, Tuple[float, float]]:
+        # (capacity, refill per second): a full minute's quota may be used as a burst
+        return {
+            'requests': (float(Config.GEMINI_RPM), Config.GEMINI_RPM / 60.0),
+            'tokens': (float(Config.GEMINI_TPM), Config.GEMINI_TPM / 60.0),
+        }
+
+    def enabled(self, name: str) -> bool:
+        return self.limits()[name][0] > 0
+
+    def _store(self):
+        pid = os.getpid()
+        if self._buckets is None or self._pid != pid:
+            self._buckets = _SQLiteBuckets(Config.QUOTA_DB_PATH) if Config.QUOTA_DB_PATH else _LocalBuckets()
+            self._pid = pid
+            self._cond = threading.Condition()
+            self._queue = []
+        return self._buckets
+
+    def _take(self, tokens: int) -> float:
+        limits = self.limits()
+        costs = {name: cost for name, cost in (('requests', 1.0), ('tokens', float(tokens)))
+                 if limits[name][0] > 0}
+        # A prompt bigger than the whole bucket would never fit; charge the bucket instead
+        costs = {name: min(cost, limits[name][0]) for name, cost in costs.items()}
+        if not costs:
+            return 0.0
+        try:
+            return self._store().take(costs, limits)
+        except sqlite3.Error as e:
+            print(f"Quota store unavailable, not throttling: {e}")
+            return 0.0
+
+    def adjust(self, name: str, amount: float) -> None:
+        if amount:
+            try:
+                self._store().give(name, amount, self.limits())
+            except sqlite3.Error as e:
+                print(f"Quota store unavailable: {e}")
+
+    def exhaust(self) -> None:
+        """Gemini answered 429: drain the request bucket so all workers back off"""
+        if self.enabled('requests'):
+            self.adjust('requests', -Config.GEMINI_RPM)
+
+    def acquire(self, prompt: str) -> Optional[Reservation]:
+        """Reserve quota for one call at the current priority; None means shed it"""
+        tokens = estimate_tokens(prompt)
+        if not (self.enabled('requests') or self.enabled('tokens')):
+            return Reservation(self, tokens)
+        self._store()
+        level = current_priority.get()
+        if level >= BACKGROUND:
+            return Reservation(self, tokens) if self._take(tokens) == 0 else None
+
+        deadline = time.monotonic() + Config.QUOTA_MAX_WAIT_SECONDS
+        entry = (level, next(self._seq))
+        with self._cond:
+            heapq.heappush(self._queue, entry)
+        try:
+            while True:
+                with self._cond:
+                    at_head = self._queue[0] == entry
+                # Only the head debits, and outside the lock: the SQLite transaction can
+                # wait on other workers and must not hold up this process's queue
+                wait = self._take(tokens) if at_head else float('inf')
+                if wait == 0:
+                    return Reservation(self, tokens)
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return None
+                with self._cond:
+                    # Skip the wait if the head left while the lock was released
+                    if at_head or self._queue[0] != entry:
+                        self._cond.wait(min(wait, remaining))
+        finally:
+            with self._cond:
+                self._queue.remove(entry)
+                heapq.heapify(self._queue)
+                self._cond.notify_all()
+
+quota = QuotaManager()
@@ -0,0 +1,158 @@
+import os
+import threading
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, Iterable, List, Optional
+from services import quota
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - not available on Windows
+    fcntl = None
+
+BatchGenerator = Callable[[List[str], str], Dict[str, Dict[str, Any]]]
+
+class DailyPregenerator:
+    """
+    Background job that generates one entry per key for each calendar day
+    shortly before the date rolls over, retrying keys that failed.
+
+    With a `lock_path`, the job is started in every worker but only the one
+    holding an exclusive lock on that file runs it; the others retry the lock
+    every `retry_interval` and take over if the runner exits.
+    """
+
+    def __init__(self, name: str, keys: Iterable[str], generate: Callable[[str, str], Optional[Dict[str, Any]]],
+                 lead_time: timedelta, retry_interval: float, enabled: Callable[[], bool] = lambda: True,
+                 generate_batch: Optional[BatchGenerator] = None, lock_path: Optional[str] = None):
+        self.name = name
+        self.keys = list(keys)
+        self.generate = generate
+        self.generate_batch = generate_batch
+        self.lead_time = lead_time
+        self.retry_interval = retry_interval
+        self.enabled = enabled
+        self.lock_path = lock_path
+        self._lock_file = None
+        self._store: Dict[str, Dict[str, Dict[str, Any]]] = {}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._pid: Optional[int] = None
+
+    def get(self, date_str: str, key: str) -> Optional[Dict[str, Any]]:
+        """Return the pre-generated entry for a date and key, if any"""
+        with self._lock:
+            entry = self._store.get(date_str, {}).get(key)
+        return dict(entry) if entry is not None else None
+
+    def put(self, date_str: str, key: str, value: Dict[str, Any]) -> None:
+        with self._lock:
+            self._store.setdefault(date_str, {})[key] = value
+
+    def missing(self, date_str: str) -> List[str]:
+        with self._lock:
+            done = self._store.get(date_str, {})
+            return [k for k in self.keys if k not in done]
+
+    def run_for_date(self, date_str: str) -> List[str]:
+        """Generate every missing key for a date; returns the keys that still failed"""
+        missing = self.missing(date_str)
+        if self.generate_batch is not None and len(missing) > 1:
+            try:
+                for key, value in self.generate_batch(missing, date_str).items():
+                    if key in missing and value:
+                        self.put(date_str, key, value)
+            except Exception as e:
+                print(f"Error batch pre-generating {self.name} on {date_str}: {e}")
+        for key in self.missing(date_str):
+            if self._stop.is_set():
+                break
+            try:
+                value = self.generate(key, date_str)
+            except Exception as e:
+                print(f"Error pre-generating {self.name} for {key} on {date_str}: {e}")
+                value = None
+            if value:
+                self.put(date_str, key, value)
+        return self.missing(date_str)
+
+    def _prune(self, today: str) -> None:
+        with self._lock:
+            for date_str in [d for d in self._store if d < today]:
+                del self._store[date_str]
+
+    def _target_dates(self, now: datetime) -> List[str]:
+        today = now.strftime('%Y-%m-%d')
+        next_midnight = datetime.combine(now.date() + timedelta(days=1), datetime.min.time())
+        dates = [today]
+        if next_midnight - now <= self.lead_time:
+            dates.append(next_midnight.strftime('%Y-%m-%d'))
+        return dates
+
+    def _seconds_until_next_run(self, now: datetime) -> float:
+        next_midnight = datetime.combine(now.date() + timedelta(days=1), datetime.min.time())
+        next_run = next_midnight - self.lead_time
+        if next_run <= now:
+            # Already inside the lead window: wake up just after the rollover
+            next_run = next_midnight + timedelta(seconds=1)
+        return max(1.0, (next_run - now).total_seconds())
+
+    def _acquire_lease(self) -> bool:
+        """Try to become the single runner across processes; True while this process is it"""
+        if self.lock_path is None or fcntl is None:
+            return True
+        try:
+            if self._lock_file is None:
+                self._lock_file = open(self.lock_path, 'a')
+            fcntl.flock(self._lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            return True
+        except OSError:
+            return False
+
+    def _release_lease(self) -> None:
+        if self._lock_file is not None:
+            self._lock_file.close()
+            self._lock_file = None
+
+    def _run(self) -> None:
+        # Pre-generation is never urgent: it yields Gemini quota to live requests
+        quota.current_priority.set(quota.BACKGROUND)
+        try:
+            self._run_while_leader()
+        finally:
+            self._release_lease()
+
+    def _run_while_leader(self) -> None:
+        while not self._stop.is_set():
+            if not self._acquire_lease():
+                self._stop.wait(self.retry_interval)
+                continue
+            now = datetime.now()
+            self._prune(now.strftime('%Y-%m-%d'))
+            failed = []
+            for date_str in self._target_dates(now):
+                failed.extend(self.run_for_date(date_str))
+            wait = self._seconds_until_next_run(datetime.now())
+            if failed:
+                print(f"{self.name} pre-generation incomplete ({len(failed)} pending), retrying in {self.retry_interval:.0f}s")
+                wait = min(wait, self.retry_interval)
+            self._stop.wait(wait)
+
+    def start(self) -> bool:
+        """Start the background thread once per process; returns True if it is running"""
+        if not self.enabled():
+            return False
+        pid = os.getpid()
+        if self._thread is not None and self._thread.is_alive() and self._pid == pid:
+            return True
+        self._stop.clear()
+        if self._pid != pid:
+            # A lock file opened before fork would share the parent's lock
+            self._lock_file = None
+        self._pid = pid
+        self._thread = threading.Thread(target=self._run, name=f"{self.name}-pregenerator", daemon=True)
+        self._thread.start()
+        return True
+
+    def stop(self) -> None:
+        self._stop.set()
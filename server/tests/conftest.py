@@ -0,0 +1,88 @@
+import json
+import os
+import sys
+import tempfile
+import pytest
+
+# Config reads the environment at import, so isolate it before any app module
+# is imported: no Gemini calls, and SQLite files in a throwaway directory.
+_tmp = tempfile.mkdtemp(prefix='horoscope_tests_')
+os.environ['GEMINI_API_KEY'] = ''
+os.environ['PERSISTENT_CACHE_PATH'] = os.path.join(_tmp, 'response_cache.db')
+os.environ['QUOTA_DB_PATH'] = os.path.join(_tmp, 'gemini_quota.db')
+os.environ['METRICS_DIR'] = os.path.join(_tmp, 'metrics')
+os.environ['ENABLE_DAILY_PREGENERATION'] = 'false'
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+@pytest.fixture
+def client():
+    """Flask test client for the app (imported here, after the environment is isolated)"""
+    import app
+    return app.app.test_client()
+
+class FakeResponse:
+    """Enough of requests.Response for gemini_client: a JSON answer or an SSE stream"""
+
+    def __init__(self, answer, usage, status_code=200):
+        self.answer = answer
+        self.usage = usage
+        self.status_code = status_code
+        self.closed = False
+
+    @staticmethod
+    def _event(text, usage=None):
+        event = {'candidates': [{'content': {'parts': [{'text': text}]}}]}
+        if usage:
+            event['usageMetadata'] = usage
+        return event
+
+    def json(self):
+        return self._event(self.answer, self.usage)
+
+    def iter_lines(self, decode_unicode=False):
+        # Each chunk is one event; an exception in the list is raised mid-stream
+        for i, chunk in enumerate(self.answer):
+            if isinstance(chunk, Exception):
+                raise chunk
+            last = i == len(self.answer) - 1
+            yield 'data: ' + json.dumps(self._event(chunk, self.usage if last else None))
+            yield ''
+
+    def close(self):
+        self.closed = True
+
+class FakeGemini:
+    """
+    Stand-in for the Gemini HTTP API behind gemini_client.post. `answer` maps
+    the prompt text to the reply: a string, a list of stream chunks, or an
+    exception to raise as a transport error.
+    """
+
+    def __init__(self):
+        self.answer = lambda prompt: '{}'
+        self.status_code = 200
+        self.usage = {'promptTokenCount': 100, 'candidatesTokenCount': 20, 'totalTokenCount': 120}
+        self.prompts = []
+        self.responses = []
+
+    def post(self, payload, timeout=None, endpoint='gemini_api', stream=False):
+        prompt = payload['contents'][0]['parts'][0]['text']
+        self.prompts.append(prompt)
+        answer = self.answer(prompt)
+        if isinstance(answer, Exception):
+            raise answer
+        response = FakeResponse(answer, self.usage, self.status_code)
+        self.responses.append(response)
+        return response
+
+@pytest.fixture
+def gemini(monkeypatch):
+    """Route every Gemini call to a FakeGemini, with a key configured and fresh breakers"""
+    from config import Config
+    from services import circuit_breaker, gemini_client
+    fake = FakeGemini()
+    monkeypatch.setattr(Config, 'GEMINI_API_KEY', 'test-key')
+    monkeypatch.setattr(circuit_breaker, '_breakers', {})
+    monkeypatch.setattr(gemini_client, 'post', fake.post)
+    return fake
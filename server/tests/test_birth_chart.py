@@ -0,0 +1,90 @@
+from datetime import datetime
+import pytest
+from astro.chart import birth_chart
+from astro.ephemeris import julian_day
+
+BIRTH = {'name': 'Test', 'date': '1990-05-15', 'time': '14:30'}
+
+def expected_chart(utc: datetime, latitude: float, longitude: float):
+    return birth_chart(julian_day(utc), latitude, longitude)
+
+def chart_of(response):
+    data = dict(response.get_json()['data'])
+    return data, {key: value for key, value in data.items() if key not in ('location', 'dataSource')}
+
+def test_non_ist_birth_uses_the_given_zone(client):
+    response = client.post('/api/birth-chart', json=dict(BIRTH, place='Springfield, USA', latitude='39.7817',
+                                                         longitude='-89.6501', tz='America/Chicago'))
+    assert response.status_code == 200
+    data, chart = chart_of(response)
+    # 14:30 CDT is 19:30 UTC
+    assert chart == expected_chart(datetime(1990, 5, 15, 19, 30), 39.7817, -89.6501)
+    assert data['location'] == {'lat': 39.7817, 'lon': -89.6501, 'tz': 'America/Chicago', 'utcOffsetHours': -5.0,
+                                'place': None, 'source': 'coordinates'}
+
+def test_fixed_offset_zone(client):
+    response = client.post('/api/birth-chart', json=dict(BIRTH, place='Somewhere', latitude='-33.9',
+                                                         longitude='18.4', tz='2'))
+    data, chart = chart_of(response)
+    assert chart == expected_chart(datetime(1990, 5, 15, 12, 30), -33.9, 18.4)
+    assert data['location']['utcOffsetHours'] == 2.0
+
+def test_known_place_without_coordinates_uses_its_own_zone(client):
+    response = client.post('/api/birth-chart', json=dict(BIRTH, place='London, UK'))
+    assert response.status_code == 200
+    data, chart = chart_of(response)
+    # 14:30 BST is 13:30 UTC
+    assert chart == expected_chart(datetime(1990, 5, 15, 13, 30), 51.5074, -0.1278)
+    assert data['location']['place'] == 'London' and data['location']['source'] == 'place'
+    assert data['location']['tz'] == 'Europe/London'
+
+def test_coordinates_near_a_known_place_borrow_its_zone(client):
+    response = client.post('/api/birth-chart', json=dict(BIRTH, place='Bombay', latitude='19.1', longitude='72.9'))
+    data, chart = chart_of(response)
+    assert chart == expected_chart(datetime(1990, 5, 15, 9, 0), 19.1, 72.9)
+    assert data['location']['place'] == 'Mumbai' and data['location']['tz'] == 'Asia/Kolkata'
+
+@pytest.mark.parametrize('fields,error', [
+    ({'place': 'Springfield'}, "Unknown place 'Springfield'"),
+    ({'place': 'Springfield', 'latitude': '39.78', 'longitude': '-89.65'}, 'tz is required'),
+    ({'place': 'London', 'latitude': '39.78', 'longitude': '-89.65'}, 'tz is required'),  # far from London
+    ({'place': 'Springfield', 'latitude': '39.78'}, 'latitude and longitude must be sent together'),
+    ({'place': 'Springfield', 'latitude': '139', 'longitude': '0', 'tz': 'UTC'}, 'lat must be within'),
+    ({'place': 'Springfield', 'latitude': '39.78', 'longitude': '-89.65', 'tz': 'Mars/Olympus'}, 'Unknown timezone'),
+])
+def test_unresolvable_locations_are_rejected(client, fields, error):
+    response = client.post('/api/birth-chart', json=dict(BIRTH, **fields))
+    assert response.status_code == 400
+    assert error in response.get_json()['error']
+
+# Published Lahiri charts: sign and whole-sign house of every graha, and degrees within a sign
+INDEPENDENCE = {  # 1947-08-15 00:00 IST, New Delhi; Taurus lagna
+    'Sun': ('Cancer', 3, 28), 'Moon': ('Cancer', 3, 4), 'Mercury': ('Cancer', 3, 13), 'Venus': ('Cancer', 3, 22),
+    'Mars': ('Gemini', 2, 7), 'Jupiter': ('Libra', 6, 26), 'Saturn': ('Cancer', 3, 20),
+    'Rahu': ('Taurus', 1, 5), 'Ketu': ('Scorpio', 7, 5),
+}
+GANDHI = {  # 1869-10-02 07:11 local mean time, Porbandar; Libra lagna
+    'Sun': ('Virgo', 12), 'Moon': ('Cancer', 10), 'Mercury': ('Libra', 1), 'Venus': ('Libra', 1),
+    'Mars': ('Libra', 1), 'Jupiter': ('Aries', 7), 'Saturn': ('Scorpio', 2), 'Rahu': ('Cancer', 10),
+    'Ketu': ('Capricorn', 4),
+}
+
+def positions(data):
+    return {p['name']: p for p in data['planetaryPositions']}
+
+def test_reference_chart_indian_independence(client):
+    data = client.post('/api/birth-chart', json={'name': 'India', 'date': '1947-08-15', 'time': '00:00',
+                                                 'place': 'New Delhi'}).get_json()['data']
+    assert (data['ascendant'], data['sunSign'], data['moonSign']) == ('Taurus', 'Cancer', 'Cancer')
+    for name, planet in positions(data).items():
+        sign, house, degree = INDEPENDENCE[name]
+        assert (planet['sign'], planet['house']) == (sign, house), name
+        assert abs(planet['degree'] - degree) <= 1, name
+
+def test_reference_chart_gandhi(client):
+    # Local mean time at 69.63 E is UT + 4h38.5m
+    data = client.post('/api/birth-chart', json={'name': 'Gandhi', 'date': '1869-10-02', 'time': '07:11',
+                                                 'place': 'Porbandar', 'latitude': '21.6417', 'longitude': '69.6293',
+                                                 'tz': '4.642'}).get_json()['data']
+    assert (data['ascendant'], data['sunSign'], data['moonSign']) == ('Libra', 'Virgo', 'Cancer')
+    assert {name: (p['sign'], p['house']) for name, p in positions(data).items()} == GANDHI
@@ -0,0 +1,57 @@
+import json
+import pytest
+from config import Config
+from routes import birth_chart as birth_chart_routes
+
+RECORDS = [
+    {'name': 'Delhi', 'date': '1990-05-15', 'time': '14:30', 'place': 'New Delhi'},
+    {'name': 'London', 'date': '1985-12-01', 'time': '06:05', 'place': 'London, UK'},
+    {'name': 'Chicago', 'date': '2001-07-04', 'time': '23:59:30', 'place': 'Springfield',
+     'latitude': 39.7817, 'longitude': -89.6501, 'tz': 'America/Chicago'},
+    {'name': 'Offset', 'date': '1970-01-01', 'time': '00:00', 'place': 'Somewhere',
+     'latitude': '-33.9', 'longitude': '18.4', 'tz': '2'},
+    {'name': 'Sydney', 'date': '2010-02-28', 'time': '12:00', 'place': 'Sydney'},
+]
+
+def post_batch(client, body, content_type='application/json'):
+    response = client.post('/api/birth-chart/batch', data=body, content_type=content_type)
+    assert response.status_code == 200
+    assert response.mimetype == 'application/x-ndjson'
+    return [json.loads(line) for line in response.get_data(as_text=True).splitlines()]
+
+def test_batch_rows_equal_single_results(client, monkeypatch):
+    monkeypatch.setattr(birth_chart_routes, 'BATCH_CHUNK_SIZE', 2)  # exercise several chunks
+    rows = post_batch(client, json.dumps(RECORDS))
+    assert [row['index'] for row in rows] == list(range(len(RECORDS)))
+    for record, row in zip(RECORDS, rows):
+        single = client.post('/api/birth-chart', json=record).get_json()
+        assert row['success'] and single['success']
+        assert row['name'] == record['name']
+        assert row['data'] == single['data']
+
+def test_ndjson_body_gives_the_same_rows(client):
+    body = '\n'.join(json.dumps(record) for record in RECORDS) + '\n'
+    assert post_batch(client, body, 'application/x-ndjson') == post_batch(client, json.dumps(RECORDS))
+
+def test_unlocatable_records_fail_alone(client):
+    records = [
+        RECORDS[0],
+        {'name': 'Unknown', 'date': '1990-05-15', 'time': '14:30', 'place': 'Springfield'},
+        {'name': 'No tz', 'date': '1990-05-15', 'time': '14:30', 'place': 'Springfield', 'latitude': 39.78, 'longitude': -89.65},
+        {'name': 'No time', 'date': '1990-05-15', 'place': 'London'},
+        RECORDS[1],
+    ]
+    rows = post_batch(client, json.dumps(records))
+    assert [row['success'] for row in rows] == [True, False, False, False, True]
+    assert "Unknown place 'Springfield'" in rows[1]['error']
+    assert 'tz is required' in rows[2]['error']
+    assert rows[3]['error'] == 'Missing required field: time'
+    assert rows[4]['data']['location']['tz'] == 'Europe/London'
+
+def test_invalid_json_lines_and_batch_limits(client, monkeypatch):
+    rows = post_batch(client, json.dumps(RECORDS[0]) + '\n{not json\n', 'application/x-ndjson')
+    assert rows[1] == {'index': 1, 'success': False, 'error': 'Invalid JSON line'}
+    monkeypatch.setattr(Config, 'BIRTH_CHART_BATCH_MAX', 2)
+    response = client.post('/api/birth-chart/batch', json=RECORDS[:3])
+    assert response.status_code == 400
+    assert client.post('/api/birth-chart/batch', json=[]).status_code == 400
@@ -0,0 +1,49 @@
+import pytest
+from services import cache as cache_module
+from services.cache import TTLCache
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Controllable monotonic clock for the cache module"""
+    now = [1000.0]
+    monkeypatch.setattr(cache_module.time, 'monotonic', lambda: now[0])
+    return now
+
+def test_hit_and_miss_are_counted(clock):
+    cache = TTLCache(ttl=60)
+    assert cache.get('a') is None
+    cache.set('a', 1)
+    assert cache.get('a') == 1
+    stats = cache.stats()
+    assert (stats['hits'], stats['misses'], stats['hitRatio']) == (1, 1, 0.5)
+
+def test_expired_entry_is_a_miss_but_readable_as_stale(clock):
+    cache = TTLCache(ttl=60)
+    cache.set('a', 'old')
+    clock[0] += 61
+    assert cache.get('a') is None
+    assert cache.get_stale('a') == 'old'
+
+def test_per_entry_ttl_overrides_default(clock):
+    cache = TTLCache(ttl=60)
+    cache.set('short', 1, ttl=5)
+    clock[0] += 10
+    assert cache.get('short') is None
+
+def test_least_recently_used_entry_is_evicted(clock):
+    cache = TTLCache(ttl=60, maxsize=2)
+    cache.set('a', 1)
+    cache.set('b', 2)
+    cache.get('a')  # 'b' is now least recently used
+    cache.set('c', 3)
+    assert cache.get_stale('b') is None
+    assert cache.get('a') == 1 and cache.get('c') == 3
+
+def test_expired_entries_are_evicted_before_live_ones(clock):
+    cache = TTLCache(ttl=60, maxsize=2)
+    cache.set('live', 1)
+    cache.set('expiring', 2, ttl=1)
+    clock[0] += 5
+    cache.set('new', 3)
+    assert cache.get_stale('expiring') is None
+    assert cache.get('live') == 1 and cache.get('new') == 3
@@ -0,0 +1,62 @@
+from datetime import datetime
+import numpy as np
+import pytest
+from astro import chebyshev
+from astro.chebyshev import ANALYTIC, SEGMENTS, ChebyshevTable, body_longitude, build_table, load_table
+from astro.ephemeris import julian_day
+
+@pytest.fixture(scope='module')
+def table_path(tmp_path_factory):
+    path = str(tmp_path_factory.mktemp('ephemeris') / 'ephemeris.bin')
+    build_table(path, 2020, 2030)
+    return path
+
+@pytest.fixture(scope='module')
+def table(table_path):
+    return ChebyshevTable(table_path)
+
+def angular_error(a, b):
+    return np.abs((np.asarray(a) - np.asarray(b) + 180.0) % 360.0 - 180.0)
+
+@pytest.mark.parametrize('name', sorted(SEGMENTS))
+def test_table_matches_the_analytic_series(table, name):
+    jd = np.random.default_rng(0).uniform(table.start, table.end, 2000)
+    assert angular_error(table.longitude(name, jd), ANALYTIC[name](jd)).max() < 1e-5
+    for day in jd[:20].tolist():
+        assert angular_error(table.longitude(name, day), ANALYTIC[name](day)) < 1e-5
+
+def test_segment_edges_are_continuous(table):
+    span = SEGMENTS['Moon'][0]
+    edges = table.start + span * np.arange(1, 50)
+    before = table.longitude('Moon', edges - 1e-9)
+    after = table.longitude('Moon', edges)
+    assert angular_error(before, after).max() < 1e-5
+
+def test_missing_or_invalid_files_fall_back(tmp_path, table_path):
+    assert load_table(str(tmp_path / 'absent.bin')) is None
+    garbage = tmp_path / 'garbage.bin'
+    garbage.write_bytes(b'not an ephemeris table')
+    assert load_table(str(garbage)) is None
+    # Same layout with a newer format version
+    with open(table_path, 'rb') as f:
+        data = f.read()
+    newer = tmp_path / 'newer.bin'
+    newer.write_bytes(data.replace(b'"version": 1', b'"version": 9', 1))
+    assert load_table(str(newer)) is None
+
+def test_body_longitude_without_a_table_uses_the_series(monkeypatch):
+    monkeypatch.setattr(chebyshev, 'table', None)
+    jd = julian_day(datetime(2024, 4, 8))
+    assert body_longitude('Moon', jd) == ANALYTIC['Moon'](jd)
+
+def test_dates_outside_the_table_use_the_series(monkeypatch, table):
+    monkeypatch.setattr(chebyshev, 'table', table)
+    inside = julian_day(datetime(2024, 4, 8))
+    outside = julian_day(datetime(1950, 1, 1))
+    assert body_longitude('Mars', inside) == table.longitude('Mars', inside)
+    assert body_longitude('Mars', outside) == ANALYTIC['Mars'](outside)
+    assert body_longitude('Mars', table.end) == ANALYTIC['Mars'](table.end)
+    # An array reaching past either end is computed analytically as a whole
+    straddling = np.array([inside, outside])
+    np.testing.assert_array_equal(body_longitude('Mars', straddling), ANALYTIC['Mars'](straddling))
+    assert not table.covers(np.array([]))
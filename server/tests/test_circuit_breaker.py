@@ -0,0 +1,71 @@
+import pytest
+from services import circuit_breaker as breaker_module
+from services.circuit_breaker import CircuitBreaker
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(breaker_module.time, 'monotonic', lambda: now[0])
+    return now
+
+def make_breaker():
+    return CircuitBreaker('test', failure_rate_threshold=0.5, slow_call_seconds=2.0, slow_call_rate_threshold=0.5,
+                          window_seconds=60, minimum_calls=4, open_seconds=30, half_open_max_calls=1)
+
+def trip(breaker):
+    for _ in range(4):
+        assert breaker.allow_request()
+        breaker.record(False, 0.1)
+
+def test_stays_closed_below_minimum_calls(clock):
+    breaker = make_breaker()
+    for _ in range(3):
+        breaker.record(False, 0.1)
+    assert breaker.state == CircuitBreaker.CLOSED
+
+def test_opens_on_failure_rate_and_rejects(clock, caplog):
+    breaker = make_breaker()
+    breaker.record(True, 0.1)
+    breaker.record(True, 0.1)
+    breaker.record(False, 0.1)
+    breaker.record(False, 0.1)
+    assert breaker.state == CircuitBreaker.OPEN
+    assert "Circuit breaker 'test' opened" in caplog.text
+    assert not breaker.allow_request()
+    assert breaker.snapshot()['rejected'] == 1
+
+def test_opens_on_slow_call_rate(clock):
+    breaker = make_breaker()
+    for latency in (0.1, 0.1, 3.0, 3.0):
+        breaker.record(True, latency)
+    assert breaker.state == CircuitBreaker.OPEN
+
+def test_old_outcomes_leave_the_window(clock):
+    breaker = make_breaker()
+    breaker.record(False, 0.1)
+    breaker.record(False, 0.1)
+    clock[0] += 61
+    breaker.record(True, 0.1)
+    breaker.record(True, 0.1)
+    breaker.record(False, 0.1)
+    assert breaker.state == CircuitBreaker.CLOSED
+
+def test_half_open_probe_success_closes(clock):
+    breaker = make_breaker()
+    trip(breaker)
+    clock[0] += 30
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    assert breaker.allow_request()
+    assert not breaker.allow_request()  # only one probe at a time
+    breaker.record(True, 0.1)
+    assert breaker.state == CircuitBreaker.CLOSED
+    assert breaker.allow_request()
+
+def test_half_open_probe_failure_reopens(clock):
+    breaker = make_breaker()
+    trip(breaker)
+    clock[0] += 30
+    assert breaker.allow_request()
+    breaker.record(True, 5.0)  # slow probe counts as unhealthy
+    assert breaker.state == CircuitBreaker.OPEN
+    assert breaker.snapshot()['retryInSeconds'] == 30.0
@@ -0,0 +1,75 @@
+import json
+from datetime import timedelta
+from routes import horoscope
+from routes.horoscope import ZODIAC_SIGNS, get_gemini_daily_batch, pregenerate_daily_horoscope, warm_daily_horoscopes
+from services.scheduler import DailyPregenerator
+
+def reading(sign, prediction='A calm day.'):
+    return {'sign': sign.capitalize(), 'prediction': prediction, 'luckyColor': 'Red', 'luckyNumber': 3}
+
+def answer_batch(signs):
+    """Gemini reply for the batch prompt covering only `signs`"""
+    return '```json\n' + json.dumps([reading(sign) for sign in signs]) + '\n```'
+
+def is_batch(prompt):
+    return prompt.template == 'horoscope_batch'
+
+def test_batch_parses_every_sign(gemini):
+    gemini.answer = lambda prompt: answer_batch(['aries', 'leo'])
+    batch = get_gemini_daily_batch('2030-01-01', ['aries', 'leo'])
+    assert set(batch) == {'aries', 'leo'}
+    assert batch['leo']['lucky_color'] == 'Red'
+    assert batch['leo']['dataSource'] == 'AI Generated (Gemini)'
+    assert 'Aries, Leo' in gemini.prompts[0]
+
+def test_batch_keeps_only_well_formed_entries_for_requested_signs(gemini):
+    entries = [reading('aries'), reading('aries', 'Duplicate.'), reading('virgo'), reading('leo', '  '), 'junk',
+               {'prediction': 'No sign.'}]
+    gemini.answer = lambda prompt: json.dumps(entries)
+    batch = get_gemini_daily_batch('2030-01-01', ['aries', 'leo'])
+    assert list(batch) == ['aries']
+    assert batch['aries']['prediction'] == 'A calm day.'
+
+def test_batch_accepts_an_object_wrapping_the_list(gemini):
+    gemini.answer = lambda prompt: json.dumps({'horoscopes': [reading('leo')]})
+    assert list(get_gemini_daily_batch('2030-01-01', ['leo'])) == ['leo']
+
+def test_malformed_or_refused_batch_is_empty(gemini):
+    gemini.answer = lambda prompt: '[{"sign": "Aries", "prediction": '
+    assert get_gemini_daily_batch('2030-01-01', ['aries']) == {}
+    gemini.answer = lambda prompt: 'Sorry, I cannot help with that.'
+    assert get_gemini_daily_batch('2030-01-01', ['aries']) == {}
+    gemini.status_code = 500
+    assert get_gemini_daily_batch('2030-01-01', ['aries']) == {}
+
+def test_warm_caches_what_the_batch_returned_and_skips_cached_signs(gemini):
+    gemini.answer = lambda prompt: answer_batch(['aries', 'leo'])
+    assert set(warm_daily_horoscopes(['aries', 'leo', 'virgo'], '2030-01-02')) == {'aries', 'leo'}
+    # Only virgo is still missing, so the second batch asks for it alone
+    gemini.answer = lambda prompt: answer_batch(['virgo'])
+    assert set(warm_daily_horoscopes(['aries', 'leo', 'virgo'], '2030-01-02')) == {'aries', 'leo', 'virgo'}
+    assert 'Virgo' in gemini.prompts[1] and 'Aries' not in gemini.prompts[1]
+
+def test_partial_batch_falls_back_to_one_prompt_per_missing_sign(gemini):
+    def answer(prompt):
+        if is_batch(prompt):
+            return answer_batch(ZODIAC_SIGNS[:9])
+        return json.dumps(reading('any', 'Generated alone.'))
+    gemini.answer = answer
+    pregenerator = DailyPregenerator('test-daily', ZODIAC_SIGNS, pregenerate_daily_horoscope,
+                                     generate_batch=warm_daily_horoscopes,
+                                     lead_time=timedelta(minutes=30), retry_interval=60)
+    assert pregenerator.run_for_date('2030-01-03') == []
+    single = [prompt for prompt in gemini.prompts if not is_batch(prompt)]
+    assert len(gemini.prompts) == 4 and len(single) == 3
+    assert all(f'zodiac sign {sign.capitalize()}' in prompt for sign, prompt in zip(ZODIAC_SIGNS[9:], single))
+    assert pregenerator.get('2030-01-03', 'pisces')['prediction'] == 'Generated alone.'
+    assert horoscope.ai_horoscope_cache.get(horoscope.get_horoscope_cache_key('aries', {}, '2030-01-03'))
+
+def test_malformed_batch_falls_back_for_every_sign(gemini):
+    gemini.answer = lambda prompt: '{not json' if is_batch(prompt) else json.dumps(reading('any'))
+    pregenerator = DailyPregenerator('test-daily', ['aries', 'leo'], pregenerate_daily_horoscope,
+                                     generate_batch=warm_daily_horoscopes,
+                                     lead_time=timedelta(minutes=30), retry_interval=60)
+    assert pregenerator.run_for_date('2030-01-04') == []
+    assert len(gemini.prompts) == 3
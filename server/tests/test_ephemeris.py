@@ -0,0 +1,44 @@
+from datetime import datetime, timedelta
+import numpy as np
+import pytest
+from astro.ephemeris import (J2000, from_julian_day, julian_day, lahiri_ayanamsa, lunar_node, moon_position,
+                             obliquity, planet_position, sidereal_time, sun_position)
+
+# Geocentric ecliptic longitudes of date at J2000.0 (2000-01-01 12:00), from the JPL ephemeris
+J2000_LONGITUDES = {
+    'Mercury': 271.89,
+    'Venus': 241.57,
+    'Mars': 327.96,
+    'Jupiter': 25.25,
+    'Saturn': 40.40,
+}
+
+def test_julian_day_round_trip():
+    assert julian_day(datetime(2000, 1, 1, 12)) == J2000
+    moment = datetime(2024, 4, 8, 18, 20)
+    assert abs(from_julian_day(julian_day(moment)).replace(tzinfo=None) - moment) < timedelta(milliseconds=1)
+
+@pytest.mark.parametrize('name', sorted(J2000_LONGITUDES))
+def test_planet_longitudes_at_j2000(name):
+    assert planet_position(name, J2000)[0] == pytest.approx(J2000_LONGITUDES[name], abs=0.1)
+
+def test_sun_and_moon_at_j2000():
+    assert sun_position(J2000)[0] == pytest.approx(280.37, abs=0.05)
+    assert moon_position(J2000)[0] == pytest.approx(223.32, abs=0.1)
+
+def test_lunar_node_obliquity_and_sidereal_time_at_j2000():
+    assert lunar_node(J2000) == pytest.approx(125.045, abs=0.01)
+    assert abs(lunar_node(J2000, true_node=True) - lunar_node(J2000)) < 1.75
+    assert obliquity(J2000) == pytest.approx(23.4393, abs=1e-4)
+    assert sidereal_time(J2000, 0.0) == pytest.approx(280.4606, abs=1e-4)
+
+def test_lahiri_ayanamsa():
+    assert lahiri_ayanamsa(J2000) == pytest.approx(23.853, abs=0.001)
+    # Precession adds about 50.3 arcseconds a year
+    assert lahiri_ayanamsa(J2000 + 36525) - lahiri_ayanamsa(J2000) == pytest.approx(1.397, abs=0.001)
+
+def test_array_input_matches_scalar():
+    jd = J2000 + np.array([0.0, 1000.5, 9000.25])
+    longitudes = planet_position('Mars', jd)[0]
+    for i, day in enumerate(jd):
+        assert longitudes[i] == pytest.approx(planet_position('Mars', float(day))[0], abs=1e-9)
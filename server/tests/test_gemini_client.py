@@ -0,0 +1,45 @@
+import pytest
+from config import Config
+from services import gemini_client
+from services.gemini_client import _resolve_timeout, get_session, strip_code_fences
+
+@pytest.fixture
+def pid(monkeypatch):
+    """Fresh session state and a settable process id"""
+    monkeypatch.setattr(gemini_client, '_session', None)
+    monkeypatch.setattr(gemini_client, '_session_pid', None)
+    current = [1000]
+    monkeypatch.setattr(gemini_client.os, 'getpid', lambda: current[0])
+    return current
+
+def test_session_is_reused_within_a_process(pid):
+    assert get_session() is get_session()
+
+def test_forked_worker_builds_its_own_session(pid):
+    parent = get_session()
+    pid[0] = 1001
+    child = get_session()
+    assert child is not parent
+    assert get_session() is child
+
+@pytest.mark.parametrize('timeout, expected', [
+    (None, (3.0, 20.0)),
+    (10, (3.0, 10)),
+    (1.5, (1.5, 1.5)),
+    ((2, 5), (2, 5)),
+])
+def test_resolve_timeout(monkeypatch, timeout, expected):
+    monkeypatch.setattr(Config, 'GEMINI_CONNECT_TIMEOUT', 3.0)
+    monkeypatch.setattr(Config, 'GEMINI_READ_TIMEOUT', 20.0)
+    assert _resolve_timeout(timeout) == expected
+
+@pytest.mark.parametrize('content, expected', [
+    ('{"a": 1}', '{"a": 1}'),
+    ('```json\n{"a": 1}\n```', '{"a": 1}'),
+    ('  ```json{"a": 1}```  ', '{"a": 1}'),
+    ('```json\n{"a": 1}', '{"a": 1}'),
+    ('{"a": 1}\n```', '{"a": 1}'),
+    ('', ''),
+])
+def test_strip_code_fences(content, expected):
+    assert strip_code_fences(content) == expected
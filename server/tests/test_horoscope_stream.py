@@ -0,0 +1,65 @@
+import json
+from services import metrics
+from services.circuit_breaker import get_breaker
+
+ANSWER = ['```json\n{"prediction": "Bold moves pay off.", ', '"love": "Speak up.", "luckyNu', 'mber": 9, ',
+          '"career": "Lead the meeting."}\n```']
+
+def events(body):
+    """[(event, data)] from a text/event-stream body"""
+    parsed = []
+    for block in body.strip().split('\n\n'):
+        lines = dict(line.split(': ', 1) for line in block.split('\n'))
+        parsed.append((lines['event'], json.loads(lines['data'])))
+    return parsed
+
+def outcomes():
+    return {outcome: metrics.upstream_requests.values.get((('kind', 'horoscope_stream'), ('outcome', outcome)), 0.0)
+            for outcome in ('ok', 'error')}
+
+def stream(client, sign, **kwargs):
+    return client.post('/api/horoscope/ai?stream=1', json={'zodiacSign': sign}, **kwargs)
+
+def test_fields_stream_in_order_then_done(client, gemini):
+    gemini.answer = lambda prompt: ANSWER
+    before = outcomes()
+    response = stream(client, 'leo')
+    assert response.mimetype == 'text/event-stream'
+    sent = events(response.get_data(as_text=True))
+    names = [event for event, _ in sent]
+    assert names[0] == 'meta' and names[-1] == 'done'
+    fields = [data['field'] for event, data in sent if event == 'field']
+    # Gemini's fields as they completed, then the rest from the fallback
+    assert fields[:4] == ['prediction', 'love', 'luckyNumber', 'career']
+    assert len(fields) == len(set(fields)) == 11
+    done = sent[-1][1]
+    assert (done['prediction'], done['luckyNumber']) == ('Bold moves pay off.', 9)
+    assert outcomes()['ok'] - before['ok'] == 1
+    assert get_breaker('horoscope_stream').snapshot()['failureRate'] == 0.0
+    assert gemini.responses[0].closed
+
+def test_mid_stream_error_keeps_sent_fields_and_counts_a_failure(client, gemini):
+    gemini.answer = lambda prompt: ANSWER[:2] + [ConnectionError('reset by peer')]
+    before = outcomes()
+    sent = events(stream(client, 'virgo').get_data(as_text=True))
+    fields = {data['field']: data['value'] for event, data in sent if event == 'field'}
+    assert fields['prediction'] == 'Bold moves pay off.'
+    assert len(fields) == 11
+    assert sent[-1][0] == 'done'
+    assert sent[-1][1]['prediction'] == 'Bold moves pay off.'
+    assert outcomes()['error'] - before['error'] == 1
+    assert get_breaker('horoscope_stream').snapshot()['failureRate'] == 1.0
+    assert gemini.responses[0].closed
+
+def test_client_disconnect_closes_upstream_without_a_failure(client, gemini):
+    gemini.answer = lambda prompt: ANSWER
+    before = outcomes()
+    response = stream(client, 'libra', buffered=False)
+    body = iter(response.response)
+    assert b'event: meta' in next(body)
+    assert b'"prediction"' in next(body)
+    response.close()
+    assert gemini.responses[0].closed
+    after = outcomes()
+    assert (after['ok'] - before['ok'], after['error'] - before['error']) == (1, 0)
+    assert get_breaker('horoscope_stream').snapshot()['failureRate'] == 0.0
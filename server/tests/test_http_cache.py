@@ -0,0 +1,31 @@
+import itertools
+import pytest
+from config import Config
+from services.cache import TTLCache
+from routes import mantra
+
+@pytest.fixture
+def generated_mantras(monkeypatch):
+    """Gemini stand-in that returns a different set on every call, like separate workers would"""
+    counter = itertools.count()
+    monkeypatch.setattr(mantra, 'get_gemini_mantras', lambda category: [
+        {'id': f'm{next(counter)}', 'name': 'Gayatri', 'category': 'vedic'}])
+    mantra.ai_mantra_cache.clear()
+    yield
+    mantra.ai_mantra_cache.clear()
+
+def test_ai_mantras_etag_is_shared_across_workers(client, generated_mantras):
+    first = client.get('/api/mantra')
+    assert first.status_code == 200 and first.headers.get('ETag')
+    # A second worker starts with an empty memory tier and must not regenerate
+    TTLCache.clear(mantra.ai_mantra_cache)
+    second = client.get('/api/mantra')
+    assert second.headers['ETag'] == first.headers['ETag']
+    assert client.get('/api/mantra', headers={'If-None-Match': first.headers['ETag']}).status_code == 304
+
+def test_no_etag_without_the_shared_store(client, generated_mantras, monkeypatch):
+    monkeypatch.setattr(Config, 'PERSISTENT_CACHE_PATH', '')
+    response = client.get('/api/mantra')
+    assert response.status_code == 200
+    assert 'ETag' not in response.headers
+    assert response.cache_control.max_age is not None
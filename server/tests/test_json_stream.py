@@ -0,0 +1,53 @@
+import json
+import pytest
+from services.json_stream import JsonFieldStream
+
+DOCUMENT = '```json\n{\n  "prediction": "Say \\"yes\\" \\u2014 then rest.\\nTomorrow: \\\\ more",\n' \
+           '  "luckyNumber": 12, "ratio": -0.5e-3, "score": 3.25,\n  "lucky": true, "missing": null,\n' \
+           '  "compatibility": ["Leo", "Aries"], "detail": {"a": [1, {"b": "}"}]}\n}\n```'
+EXPECTED = json.loads(DOCUMENT[len('```json\n'):-len('\n```')])
+
+def feed_all(chunks):
+    parser, completed = JsonFieldStream(), []
+    for chunk in chunks:
+        completed.extend(parser.feed(chunk))
+    return parser, completed
+
+def test_whole_document_in_one_chunk():
+    parser, completed = feed_all([DOCUMENT])
+    assert completed == list(EXPECTED.items())
+    assert parser.fields == EXPECTED
+
+@pytest.mark.parametrize('split', range(1, len(DOCUMENT)))
+def test_any_split_point_gives_the_same_fields(split):
+    parser, completed = feed_all([DOCUMENT[:split], DOCUMENT[split:]])
+    assert completed == list(EXPECTED.items())
+
+def test_one_character_at_a_time():
+    parser, completed = feed_all(DOCUMENT)
+    assert completed == list(EXPECTED.items())
+
+def test_fields_are_emitted_as_soon_as_they_are_complete():
+    parser = JsonFieldStream()
+    assert parser.feed('{"prediction": "Good da') == []
+    assert parser.feed('y", "lucky') == [('prediction', 'Good day')]
+    assert parser.feed('Color": "Red"') == [('luckyColor', 'Red')]
+
+@pytest.mark.parametrize('first, second, value', [
+    ('{"n": 1', '2}', 12),
+    ('{"n": 3.', '25}', 3.25),
+    ('{"n": 1e', '3}', 1000.0),
+    ('{"n": -', '4}', -4),
+    ('{"n": 7', ' }', 7),
+    ('{"n": tr', 'ue}', True),
+    ('{"s": "a\\', '"b"}', 'a"b'),
+    ('{"s": "\\u00', 'e9"}', 'é'),
+])
+def test_values_split_inside_numbers_literals_and_escapes(first, second, value):
+    parser = JsonFieldStream()
+    assert parser.feed(first) == []
+    assert [v for _, v in parser.feed(second)] == [value]
+
+def test_text_before_the_object_is_ignored():
+    _, completed = feed_all(['Here you go:\n', '```json\n{"a": ', '"b"}'])
+    assert completed == [('a', 'b')]
@@ -0,0 +1,40 @@
+import pytest
+from flask import Flask
+from config import Config
+from routes import horoscope
+from services.latency_budget import BUDGET_HEADER, get_latency_budget
+
+app = Flask(__name__)
+
+@pytest.fixture(autouse=True)
+def budgets(monkeypatch):
+    monkeypatch.setattr(Config, 'AI_LATENCY_BUDGET_MS', 800)
+    monkeypatch.setattr(Config, 'AI_LATENCY_BUDGET_MAX_MS', 20000)
+    monkeypatch.setattr(Config, 'PROVIDER_DEADLINE_SECONDS', 25.0)
+
+def test_config_budget_applies_without_the_header():
+    with app.test_request_context():
+        assert get_latency_budget() == 0.8
+
+def test_header_overrides_and_is_capped():
+    with app.test_request_context(headers={BUDGET_HEADER: '1500'}):
+        assert get_latency_budget() == 1.5
+    with app.test_request_context(headers={BUDGET_HEADER: '60000'}):
+        assert get_latency_budget() == 20.0
+    with app.test_request_context(headers={BUDGET_HEADER: '0'}):
+        assert get_latency_budget() is None
+
+def test_default_replaces_the_config_budget_only_without_the_header():
+    with app.test_request_context():
+        assert get_latency_budget(default=25.0) == 25.0
+    with app.test_request_context(headers={BUDGET_HEADER: '1500'}):
+        assert get_latency_budget(default=25.0) == 1.5
+
+def test_provider_race_uses_its_own_deadline_unless_the_client_sent_one(monkeypatch):
+    deadlines = []
+    monkeypatch.setattr(horoscope, 'race_providers', lambda providers, deadline: deadlines.append(deadline))
+    with app.test_request_context():
+        horoscope.race_horoscope_providers('aries', {'zodiacSign': 'aries'})
+    with app.test_request_context(headers={BUDGET_HEADER: '3000'}):
+        horoscope.race_horoscope_providers('aries', {'zodiacSign': 'aries'})
+    assert deadlines == [25.0, 3.0]
@@ -0,0 +1,80 @@
+import json
+import pytest
+from config import Config
+from services import metrics
+
+@pytest.fixture
+def metrics_dir(monkeypatch, tmp_path):
+    """Empty snapshot directory; returns a helper that writes a fake worker's snapshot"""
+    monkeypatch.setattr(Config, 'METRICS_DIR', str(tmp_path))
+    alive = set()
+    monkeypatch.setattr(metrics, '_alive', lambda pid: pid in alive)
+
+    def worker(pid, requests, latency, entries):
+        alive.add(pid)
+        labels = json.dumps([['endpoint', 'fake'], ['method', 'GET'], ['status', '200']])
+        counts = [0] * (len(metrics.LATENCY_BUCKETS) + 1)
+        counts[metrics.LATENCY_BUCKETS.index(latency)] = requests
+        snapshot = {
+            'http_requests_total': {labels: float(requests)},
+            'http_request_duration_seconds': {json.dumps([['endpoint', 'fake']]): [counts, latency * requests]},
+            'cache_entries': {json.dumps([['cache', 'fake']]): float(entries)},
+        }
+        (tmp_path / f'worker-{pid}.json').write_text(json.dumps(snapshot))
+    worker.alive = alive
+    return worker
+
+def fake(data, name):
+    values = [v for k, v in data.get(name, {}).items() if 'fake' in k]
+    return values[0] if values else None
+
+def test_workers_snapshots_are_merged(metrics_dir):
+    metrics_dir(900001, requests=3, latency=0.1, entries=5)
+    metrics_dir(900002, requests=4, latency=1.0, entries=7)
+    data = metrics.collect()
+    assert fake(data, 'http_requests_total') == 7
+    counts, total = fake(data, 'http_request_duration_seconds')
+    assert counts[metrics.LATENCY_BUCKETS.index(0.1)] == 3 and counts[metrics.LATENCY_BUCKETS.index(1.0)] == 4
+    assert total == pytest.approx(4.3)
+    assert fake(data, 'cache_entries') == 12
+
+def test_exited_workers_counters_survive_in_the_archive(metrics_dir, tmp_path):
+    metrics_dir(900001, requests=3, latency=0.1, entries=5)
+    metrics_dir(900002, requests=4, latency=1.0, entries=7)
+    metrics_dir.alive.discard(900001)
+    data = metrics.collect()
+    assert not (tmp_path / 'worker-900001.json').exists()
+    assert fake(data, 'http_requests_total') == 7
+    # Its gauges no longer describe a live process
+    assert fake(data, 'cache_entries') == 7
+    # The archive keeps counting after the next worker recycles too
+    metrics_dir.alive.discard(900002)
+    data = metrics.collect()
+    assert fake(data, 'http_requests_total') == 7
+    assert fake(data, 'http_request_duration_seconds')[1] == pytest.approx(4.3)
+    assert fake(json.loads((tmp_path / 'archive.json').read_text()), 'http_requests_total') == 7
+
+def test_render_outputs_merged_histograms_and_hit_ratios(metrics_dir, tmp_path):
+    metrics_dir(900001, requests=3, latency=0.1, entries=5)
+    snapshot = json.loads((tmp_path / 'worker-900001.json').read_text())
+    snapshot['cache_hits_total'] = {json.dumps([['cache', 'fake']]): 3.0}
+    snapshot['cache_misses_total'] = {json.dumps([['cache', 'fake']]): 1.0}
+    (tmp_path / 'worker-900001.json').write_text(json.dumps(snapshot))
+    text = metrics.render()
+    assert 'http_requests_total{endpoint="fake",method="GET",status="200"} 3' in text
+    assert 'http_request_duration_seconds_bucket{endpoint="fake",le="0.1"} 3' in text
+    assert 'http_request_duration_seconds_count{endpoint="fake"} 3' in text
+    assert 'cache_hit_ratio{cache="fake"} 0.75' in text
+
+def sources(endpoint):
+    return {dict(k)['source']: v for k, v in metrics.data_sources.values.items() if dict(k)['endpoint'] == endpoint}
+
+def test_routes_record_their_data_source(client):
+    before = sources('panchang.get_panchang').get('Astronomical Calculation', 0)
+    assert client.get('/api/panchang?date=2024-04-08').status_code == 200
+    assert sources('panchang.get_panchang')['Astronomical Calculation'] - before == 1
+
+def test_data_source_outside_a_request_needs_an_endpoint():
+    metrics.record_data_source('Fallback')
+    metrics.record_data_source('Fallback', endpoint='test.stream')
+    assert sources('test.stream') == {'Fallback': 1}
@@ -0,0 +1,49 @@
+from datetime import date
+from astro.location import location_from_args
+from astro.muhurta import search_muhurta
+
+DELHI = location_from_args({})
+MONDAY = date(2024, 4, 8)  # sunrise 06:03 in Delhi
+
+def night_search(weekday: int):
+    return search_muhurta(MONDAY, 1, DELHI, weekdays=[weekday], avoid=(), daytime_only=False,
+                          min_minutes=1, limit=100)
+
+def test_hours_before_sunrise_belong_to_the_previous_vara():
+    sunday = night_search(0)
+    assert min(w['start'] for w in sunday) == '2024-04-08T00:00+05:30'
+    assert max(w['end'] for w in sunday) == '2024-04-08T06:03+05:30'
+    assert all(w['dayName'] == 'Monday' and w['vara'] == 'Sunday' for w in sunday)
+
+def test_monday_vara_starts_at_sunrise():
+    monday = night_search(1)
+    assert min(w['start'] for w in monday) == '2024-04-08T06:03+05:30'
+
+def test_daytime_only_windows_are_between_sunrise_and_sunset():
+    windows = search_muhurta(MONDAY, 1, DELHI, avoid=(), min_minutes=1, limit=100)
+    assert min(w['start'] for w in windows) == '2024-04-08T06:03+05:30'
+    assert max(w['end'] for w in windows) == '2024-04-08T18:44+05:30'  # sunset 18:43:xx
+
+def test_rahu_kaal_is_avoided():
+    windows = search_muhurta(MONDAY, 1, DELHI, min_minutes=1, limit=100)
+    # Monday's Rahu Kaal in Delhi: 07:38-09:13
+    assert windows
+    assert not any(w['start'][:16] < '2024-04-08T09:13' and w['end'][:16] > '2024-04-08T07:38' for w in windows)
+
+def search(client, **body):
+    return client.post('/api/muhurta/search', json=dict(start='2024-04-08', end='2024-04-08', minDurationMinutes=1, limit=100, **body))
+
+def test_daytime_only_accepts_booleans_and_their_strings(client):
+    night_start = '2024-04-08T00:00+05:30'
+    for value, includes_night in ((False, True), ('false', True), ('FALSE', True), (True, False), ('true', False)):
+        response = search(client, daytimeOnly=value, avoidRahuKaal=False)
+        assert response.status_code == 200
+        starts = [w['start'] for w in response.get_json()['data']['windows']]
+        assert (night_start in starts) == includes_night, value
+
+def test_other_boolean_values_are_rejected(client):
+    for value in ('0', 'no', 1, None, ''):
+        response = search(client, daytimeOnly=value)
+        assert response.status_code == 400, value
+        assert 'daytimeOnly' in response.get_json()['error']
+    assert search(client, avoidRahuKaal='0').status_code == 400
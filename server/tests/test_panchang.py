@@ -0,0 +1,61 @@
+from datetime import date, datetime, timezone
+import pytest
+from astro.ephemeris import from_julian_day, julian_day
+from astro.location import location_from_args
+from astro.panchang import _elongation, _moon, compute_panchang, next_boundary
+from routes.panchang import calculate_panchang
+from services import http_cache
+
+DELHI = location_from_args({})
+
+def test_delhi_panchang_2024_04_08():
+    panchang = calculate_panchang(date(2024, 4, 8), DELHI)
+    assert panchang['tithi'] == 'Amavasya'
+    assert panchang['tithiEndTime'] == '2024-04-08T23:50+05:30'
+    assert panchang['paksha'] == 'Krishna Paksha (Waning Moon)'
+    assert panchang['nakshatra'] == 'Uttara Bhadrapada'
+    assert panchang['nakshatraEndTime'] == '2024-04-08T10:11+05:30'
+    assert panchang['yoga'] == 'Indra'
+    assert panchang['dayName'] == 'Monday'
+
+def test_end_times_land_on_the_boundary():
+    jd = julian_day(datetime(2024, 4, 8, 0, 30))
+    panchang = compute_panchang(jd)
+    # The new moon: elongation wraps through 360 at the end of Amavasya
+    assert (_elongation(panchang['tithiEnd']) + 180.0) % 360.0 - 180.0 == pytest.approx(0.0, abs=1e-3)
+    assert _moon(panchang['nakshatraEnd']) == pytest.approx(26 * 360.0 / 27, abs=1e-3)  # start of Revati
+    # ...and the element changes right after it
+    assert compute_panchang(panchang['tithiEnd'] + 1e-3)['tithi'] == 'Pratipada'
+    assert compute_panchang(panchang['nakshatraEnd'] + 1e-3)['nakshatra'] == 'Revati'
+
+def test_next_boundary_converges_from_any_start():
+    start = julian_day(datetime(2024, 1, 1))
+    for hours in range(0, 24 * 30, 7):
+        jd = start + hours / 24.0
+        value = _moon(jd)
+        end = next_boundary(_moon, jd, value, 360.0 / 27, 13.18)
+        assert end > jd
+        assert end - jd < 1.5  # a nakshatra lasts about a day
+        assert (_moon(end) * 27 / 360.0 + 0.5) % 1.0 - 0.5 == pytest.approx(0.0, abs=1e-4)
+
+def test_second_karana_ends_with_the_tithi():
+    first = compute_panchang(julian_day(datetime(2024, 4, 8, 0, 30)))
+    assert first['karana'] == 'Chatushpada' and first['karanaEnd'] < first['tithiEnd']
+    second = compute_panchang(first['karanaEnd'] + 1e-3)
+    assert second['karana'] == 'Naga'
+    assert second['karanaEnd'] == pytest.approx(first['tithiEnd'], abs=1e-5)
+
+class FrozenDatetime(datetime):
+    """2024-04-08 06:30 UTC: still 2024-04-07 in Los Angeles, already midday in Delhi"""
+
+    @classmethod
+    def now(cls, tz=None):
+        moment = datetime(2024, 4, 8, 6, 30, tzinfo=timezone.utc)
+        return moment.astimezone(tz) if tz else moment.astimezone().replace(tzinfo=None)
+
+def test_today_is_the_requested_locations_date(client, monkeypatch):
+    monkeypatch.setattr(http_cache, 'datetime', FrozenDatetime)
+    response = client.get('/api/panchang?lat=34.05&lon=-118.24&tz=America/Los_Angeles')
+    assert response.get_json()['data']['date'] == '2024-04-07'
+    assert response.cache_control.max_age == 1800  # until midnight in Los Angeles
+    assert client.get('/api/panchang').get_json()['data']['date'] == '2024-04-08'
@@ -0,0 +1,48 @@
+import json
+from datetime import date, timedelta
+import pytest
+from config import Config
+from astro.location import location_from_args
+from routes.panchang import calculate_panchang, panchang_range_lines
+
+SHARED_FIELDS = ['date', 'dayName', 'sunrise', 'sunset', 'tithi', 'tithiEndTime', 'paksha', 'nakshatra',
+                 'nakshatraEndTime', 'yoga', 'yogaEndTime', 'karana', 'karanaEndTime']
+
+@pytest.mark.parametrize('args', [{}, {'lat': '51.5074', 'lon': '-0.1278', 'tz': 'Europe/London'}])
+def test_range_matches_single_day_panchang(args):
+    # Spans the UK clock change on 2024-03-31
+    location = location_from_args(args)
+    start = date(2024, 3, 20)
+    lines = list(panchang_range_lines(start, 20, location))
+    assert len(lines) == 20
+    for i, line in enumerate(lines):
+        single = calculate_panchang(start + timedelta(days=i), location)
+        ranged = json.loads(line)
+        assert {field: ranged[field] for field in SHARED_FIELDS} == {field: single[field] for field in SHARED_FIELDS}
+
+def test_range_streams_one_json_object_per_line(client):
+    response = client.get('/api/panchang/range?start=2024-04-01&end=2024-04-10')
+    assert response.status_code == 200
+    assert response.mimetype == 'application/x-ndjson'
+    body = response.get_data(as_text=True)
+    assert body.endswith('\n')
+    rows = [json.loads(line) for line in body.splitlines()]
+    assert [row['date'] for row in rows] == [f'2024-04-{day:02d}' for day in range(1, 11)]
+
+@pytest.mark.parametrize('query', [
+    'start=2024-04-10&end=2024-04-01',
+    'start=2024-04-01',
+    'start=2024/04/01&end=2024-04-10',
+    'start=2024-04-01&end=2024-04-10&lat=95',
+])
+def test_invalid_ranges_are_rejected(client, query):
+    response = client.get(f'/api/panchang/range?{query}')
+    assert response.status_code == 400
+    assert response.get_json()['success'] is False
+
+def test_range_limit(client, monkeypatch):
+    monkeypatch.setattr(Config, 'PANCHANG_RANGE_MAX_DAYS', 10)
+    assert client.get('/api/panchang/range?start=2024-04-01&end=2024-04-10').status_code == 200
+    response = client.get('/api/panchang/range?start=2024-04-01&end=2024-04-11')
+    assert response.status_code == 400
+    assert '10 days' in response.get_json()['error']
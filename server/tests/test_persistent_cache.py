@@ -0,0 +1,35 @@
+from services.persistent_cache import TieredCache
+
+def test_disk_hit_counts_as_a_hit_not_a_miss():
+    TieredCache('test_disk_hit', ttl=60).set('k', {'value': 1})
+    cache = TieredCache('test_disk_hit', ttl=60)  # fresh worker: empty memory tier
+    assert cache.get('k') == {'value': 1}
+    assert cache.get('k') == {'value': 1}
+    stats = cache.stats()
+    assert (stats['hits'], stats['misses'], stats['diskHits']) == (2, 0, 1)
+    assert stats['hitRatio'] == 1.0
+
+def test_miss_in_both_tiers_is_one_miss():
+    cache = TieredCache('test_disk_miss', ttl=60)
+    assert cache.get('absent') is None
+    stats = cache.stats()
+    assert (stats['hits'], stats['misses'], stats['diskHits']) == (0, 1, 0)
+
+def test_stale_value_is_read_back_from_disk():
+    TieredCache('test_disk_stale', ttl=60).set('k', 'old', ttl=-1)
+    cache = TieredCache('test_disk_stale', ttl=60)
+    assert cache.get('k') is None
+    assert cache.get_stale('k') == 'old'
+
+def test_set_shared_keeps_the_first_live_value():
+    worker_a, worker_b = TieredCache('test_shared', ttl=60), TieredCache('test_shared', ttl=60)
+    assert worker_a.set_shared('k', 'from a') == 'from a'
+    # Worker b generated its own value concurrently, but serves a's
+    assert worker_b.set_shared('k', 'from b') == 'from a'
+    assert worker_b.get('k') == 'from a'
+
+def test_set_shared_replaces_an_expired_value():
+    cache = TieredCache('test_shared_expired', ttl=60)
+    cache.set('k', 'old', ttl=-1)
+    assert cache.set_shared('k', 'new') == 'new'
+    assert TieredCache('test_shared_expired', ttl=60).get('k') == 'new'
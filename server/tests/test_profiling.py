@@ -0,0 +1,61 @@
+import pstats
+from config import Config
+from services.profiling import requested_mode
+
+def test_token_is_only_accepted_in_the_header(monkeypatch):
+    monkeypatch.setattr(Config, 'PROFILE_TOKEN', 'secret')
+    assert requested_mode({'X-Profile': 'secret'}, {}) == 'cprofile'
+    assert requested_mode({}, {'profile': 'secret'}) is None
+    assert requested_mode({'X-Profile': 'wrong'}, {}) is None
+
+def test_mode_header_selects_the_sampler(monkeypatch):
+    monkeypatch.setattr(Config, 'PROFILE_TOKEN', 'secret')
+    assert requested_mode({'X-Profile': 'secret', 'X-Profile-Mode': 'sample'}, {}) == 'sample'
+    assert requested_mode({'X-Profile': 'secret', 'X-Profile-Mode': 'bogus'}, {}) == 'cprofile'
+
+def test_disabled_without_a_token(monkeypatch):
+    monkeypatch.setattr(Config, 'PROFILE_TOKEN', '')
+    assert requested_mode({'X-Profile': ''}, {}) is None
+
+def streaming_app():
+    from flask import Flask, Response
+    from services.profiling import init_profiling
+    app = Flask(__name__)
+    init_profiling(app)
+
+    def body():
+        yield 'first\n'
+        yield 'second\n'
+
+    @app.route('/api/stream')
+    def stream():
+        return Response(body(), mimetype='text/plain')
+
+    @app.route('/api/plain')
+    def plain():
+        return 'plain'
+    return app
+
+def test_streamed_response_is_profiled_until_closed(monkeypatch, tmp_path):
+    from services import profiling
+    monkeypatch.setattr(Config, 'PROFILE_TOKEN', 'secret')
+    monkeypatch.setattr(Config, 'PROFILE_DIR', str(tmp_path))
+    response = streaming_app().test_client().get('/api/stream', headers={'X-Profile': 'secret'}, buffered=False)
+    paths = response.headers['X-Profile-File'].split(', ')
+    assert 'X-Profile-Duration-Ms' not in response.headers
+    assert profiling._cprofile_lock.locked()
+    assert b''.join(response.response) == b'first\nsecond\n'
+    response.close()
+    assert not profiling._cprofile_lock.locked()
+    summary = open(next(path for path in paths if path.endswith('.txt'))).read()
+    assert summary.startswith('GET /api/stream 200')
+    # The generator ran after after_request, and is still in the profile
+    stats = pstats.Stats(next(path for path in paths if path.endswith('.prof')))
+    assert 'body' in {function for _, _, function in stats.stats}
+
+def test_buffered_response_reports_its_duration(monkeypatch, tmp_path):
+    monkeypatch.setattr(Config, 'PROFILE_TOKEN', 'secret')
+    monkeypatch.setattr(Config, 'PROFILE_DIR', str(tmp_path))
+    response = streaming_app().test_client().get('/api/plain', headers={'X-Profile': 'secret', 'X-Profile-Mode': 'sample'})
+    assert response.headers['X-Profile-File'].endswith('.folded')
+    assert float(response.headers['X-Profile-Duration-Ms']) >= 0
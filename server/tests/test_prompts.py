@@ -0,0 +1,62 @@
+import pytest
+from services import gemini_client, metrics, prompts
+from services.prompts import PromptTemplate
+
+@pytest.fixture
+def registry(monkeypatch):
+    monkeypatch.setattr(prompts, '_registry', {})
+
+def test_prefix_is_dedented_and_shared_by_every_render():
+    template = PromptTemplate('reading', """
+        You are an astrologer.
+          Answer in JSON.
+    """, """
+        Sign: {sign}
+    """)
+    assert template.prefix == 'You are an astrologer.\n  Answer in JSON.'
+    aries, leo = template.render(sign='Aries'), template.render(sign='Leo')
+    assert aries == 'You are an astrologer.\n  Answer in JSON.\n\nSign: Aries'
+    assert leo.startswith(template.prefix + '\n\n')
+    assert aries.template == leo.template == 'reading'
+
+def test_fields_come_from_the_suffix_only():
+    template = PromptTemplate('fields', 'Schema: {"prediction": "..."}', 'Sign: {sign} on {date}, again {sign}')
+    assert template.fields == ['date', 'sign']
+
+def test_missing_variables_are_named():
+    template = PromptTemplate('strict', 'Prefix', 'Sign: {sign} on {date}')
+    with pytest.raises(KeyError, match='date'):
+        template.render(sign='Aries')
+
+def test_prefix_only_template_renders_the_prefix():
+    template = PromptTemplate('static', 'List five mantras.')
+    assert template.fields == []
+    assert template.render() == 'List five mantras.'
+
+def test_register_rejects_duplicates(registry):
+    template = prompts.register('daily', 'Prefix', 'Sign: {sign}')
+    prompts.register('another', 'Prefix')
+    assert prompts.get_template('daily') is template
+    assert [t.name for t in prompts.templates()] == ['another', 'daily']
+    with pytest.raises(ValueError):
+        prompts.register('daily', 'Other prefix')
+
+def tokens(counter, template):
+    return counter.values.get((('template', template),), 0.0)
+
+def test_tokens_are_accounted_to_the_template(gemini):
+    gemini.usage = {'promptTokenCount': 100, 'candidatesTokenCount': 20, 'cachedContentTokenCount': 64,
+                    'totalTokenCount': 120}
+    template = PromptTemplate('test_accounting', 'Prefix', 'Sign: {sign}')
+    before = [tokens(c, 'test_accounting') for c in (metrics.prompt_calls, metrics.prompt_tokens,
+                                                     metrics.response_tokens, metrics.cached_tokens)]
+    gemini_client.generate_text(template.render(sign='Aries'), kind='accounting')
+    gemini_client.generate_text(template.render(sign='Leo'), kind='accounting')
+    after = [tokens(c, 'test_accounting') for c in (metrics.prompt_calls, metrics.prompt_tokens,
+                                                    metrics.response_tokens, metrics.cached_tokens)]
+    assert [b - a for a, b in zip(before, after)] == [2, 200, 40, 128]
+
+def test_plain_string_prompts_are_accounted_to_their_kind(gemini):
+    before = tokens(metrics.prompt_tokens, 'test_kind')
+    gemini_client.generate_text('not from a template', kind='test_kind')
+    assert tokens(metrics.prompt_tokens, 'test_kind') - before == 100
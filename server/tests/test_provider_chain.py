@@ -0,0 +1,63 @@
+import threading
+import time
+from services import provider_chain
+from services.background import ForkSafePool
+from services.provider_chain import race_providers
+
+def after(seconds, value):
+    """Provider that answers with value after a delay"""
+    def fetch(remaining):
+        time.sleep(seconds)
+        return value
+    return fetch
+
+def test_higher_priority_result_wins_even_when_slower():
+    winner = race_providers([
+        ('primary', True, after(0.1, 'primary answer')),
+        ('secondary', True, after(0, 'secondary answer')),
+    ], deadline=5)
+    assert winner == ('primary', 'primary answer')
+
+def test_empty_or_failing_provider_falls_through_to_the_next():
+    def broken(remaining):
+        raise RuntimeError('upstream down')
+    assert race_providers([
+        ('primary', True, after(0, None)),
+        ('broken', True, broken),
+        ('secondary', True, after(0.05, 'secondary answer')),
+    ], deadline=5) == ('secondary', 'secondary answer')
+
+def test_disabled_providers_are_not_called():
+    called = []
+    assert race_providers([('off', False, lambda remaining: called.append(1))], deadline=1) is None
+    assert called == []
+
+def test_deadline_takes_the_best_finished_result():
+    start = time.monotonic()
+    winner = race_providers([
+        ('primary', True, after(1, 'too late')),
+        ('secondary', True, after(0, 'secondary answer')),
+    ], deadline=0.2)
+    assert winner == ('secondary', 'secondary answer')
+    assert time.monotonic() - start < 0.5
+
+def test_legs_are_handed_the_time_left():
+    seen = []
+    race_providers([('only', True, lambda remaining: seen.append(remaining) or 'ok')], deadline=2)
+    assert 0 < seen[0] <= 2
+    race_providers([('only', True, lambda remaining: seen.append(remaining) or 'ok')], deadline=None)
+    assert seen[1] is None
+
+def test_legs_still_queued_at_the_deadline_are_cancelled(monkeypatch):
+    monkeypatch.setattr(provider_chain, 'race_pool', ForkSafePool('test-race', lambda: 1))
+    release, called = threading.Event(), []
+    try:
+        winner = race_providers([
+            ('blocking', True, lambda remaining: release.wait(5) and None),
+            ('queued', True, lambda remaining: called.append(1) or 'never'),
+        ], deadline=0.2)
+    finally:
+        release.set()
+    assert winner is None
+    provider_chain.race_pool.executor().shutdown(wait=True)
+    assert called == []
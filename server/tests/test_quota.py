@@ -0,0 +1,83 @@
+import threading
+import time
+import pytest
+from config import Config
+from services import quota as quota_module
+from services.quota import BACKGROUND, QuotaManager, priority
+
+@pytest.fixture
+def limits(monkeypatch, tmp_path):
+    """Fresh quota database per test; returns a setter for the limits"""
+    monkeypatch.setattr(Config, 'QUOTA_DB_PATH', str(tmp_path / 'quota.db'))
+    monkeypatch.setattr(Config, 'GEMINI_TPM', 0)
+
+    def configure(rpm: int, max_wait: float = 0.0) -> None:
+        monkeypatch.setattr(Config, 'GEMINI_RPM', rpm)
+        monkeypatch.setattr(Config, 'QUOTA_MAX_WAIT_SECONDS', max_wait)
+    return configure
+
+def test_disabled_quota_never_blocks(limits):
+    limits(0)
+    manager = QuotaManager()
+    assert all(manager.acquire('prompt') is not None for _ in range(100))
+
+def test_bucket_refills_at_the_per_minute_rate(limits, monkeypatch):
+    limits(60)  # one request per second
+    now = [1_000_000.0]
+    monkeypatch.setattr(quota_module.time, 'time', lambda: now[0])
+    manager = QuotaManager()
+    for _ in range(60):
+        assert manager._take(0) == 0
+    assert manager._take(0) == pytest.approx(1.0)
+    now[0] += 0.5
+    assert manager._take(0) == pytest.approx(0.5)
+    now[0] += 0.5
+    assert manager._take(0) == 0
+
+def test_background_calls_are_shed_without_waiting(limits):
+    limits(1, max_wait=5)
+    manager = QuotaManager()
+    assert manager.acquire('prompt') is not None
+    start = time.monotonic()
+    with priority(BACKGROUND):
+        assert manager.acquire('prompt') is None
+    assert time.monotonic() - start < 0.5
+
+def test_interactive_call_gives_up_at_the_max_wait(limits):
+    limits(1, max_wait=0.2)
+    manager = QuotaManager()
+    assert manager.acquire('prompt') is not None
+    start = time.monotonic()
+    assert manager.acquire('prompt') is None
+    assert 0.15 < time.monotonic() - start < 1.0
+
+def test_exhaust_drains_the_bucket_for_every_worker(limits):
+    limits(60)
+    manager, other_worker = QuotaManager(), QuotaManager()
+    assert manager.acquire('prompt') is not None
+    manager.exhaust()
+    assert other_worker.acquire('prompt') is None
+
+def test_cancel_returns_the_reservation(limits):
+    limits(1)
+    manager = QuotaManager()
+    manager.acquire('prompt').cancel()
+    assert manager.acquire('prompt') is not None
+
+def test_waiting_callers_are_served_in_queue_order(limits):
+    limits(600, max_wait=5)  # ten requests per second once drained
+    manager = QuotaManager()
+    manager.exhaust()
+    served = []
+
+    def call(name):
+        if manager.acquire('prompt') is not None:
+            served.append(name)
+
+    threads = [threading.Thread(target=call, args=(name,)) for name in ('first', 'second', 'third')]
+    for thread in threads:
+        thread.start()
+        time.sleep(0.02)  # queue them in this order
+    for thread in threads:
+        thread.join(5)
+    assert served == ['first', 'second', 'third']
@@ -0,0 +1,77 @@
+from datetime import datetime, timedelta
+import pytest
+from services.scheduler import DailyPregenerator
+
+KEYS = ['aries', 'taurus', 'gemini', 'cancer']
+
+def make(generate=None, generate_batch=None, lock_path=None, keys=KEYS):
+    return DailyPregenerator('test', keys, generate or (lambda key, date: {'key': key}),
+                             lead_time=timedelta(minutes=30), retry_interval=60,
+                             generate_batch=generate_batch, lock_path=lock_path)
+
+@pytest.mark.parametrize('now, seconds', [
+    (datetime(2024, 4, 8, 22, 0), 5400),                # until 23:30
+    (datetime(2024, 4, 8, 0, 0), 23.5 * 3600),
+    (datetime(2024, 4, 8, 23, 30), 1801),               # inside the window: just after midnight
+    (datetime(2024, 4, 8, 23, 45), 901),
+    (datetime(2024, 4, 8, 23, 59, 59, 500000), 1.5),
+])
+def test_seconds_until_next_run(now, seconds):
+    assert make()._seconds_until_next_run(now) == pytest.approx(seconds)
+
+@pytest.mark.parametrize('now, dates', [
+    (datetime(2024, 4, 8, 22, 0), ['2024-04-08']),
+    (datetime(2024, 4, 8, 23, 29, 59), ['2024-04-08']),
+    (datetime(2024, 4, 8, 23, 30), ['2024-04-08', '2024-04-09']),
+    (datetime(2024, 12, 31, 23, 45), ['2024-12-31', '2025-01-01']),
+    (datetime(2024, 2, 28, 23, 50), ['2024-02-28', '2024-02-29']),
+])
+def test_target_dates(now, dates):
+    assert make()._target_dates(now) == dates
+
+def test_batch_results_are_kept_and_the_rest_retried_one_by_one():
+    single = []
+
+    def batch(keys, date):
+        assert keys == KEYS
+        return {'aries': {'key': 'aries'}, 'taurus': None, 'leo': {'key': 'leo'}}
+
+    def generate(key, date):
+        single.append(key)
+        return None if key == 'cancer' else {'key': key, 'single': True}
+
+    pregenerator = make(generate, batch)
+    assert pregenerator.run_for_date('2024-04-08') == ['cancer']
+    assert single == ['taurus', 'gemini', 'cancer']
+    assert pregenerator.get('2024-04-08', 'aries') == {'key': 'aries'}
+    assert pregenerator.get('2024-04-08', 'taurus') == {'key': 'taurus', 'single': True}
+    assert pregenerator.get('2024-04-08', 'leo') is None
+    # A retry only asks for what is still missing
+    single.clear()
+    assert pregenerator.run_for_date('2024-04-08') == ['cancer']
+    assert single == ['cancer']
+
+def test_failed_batch_falls_back_to_every_key():
+    def batch(keys, date):
+        raise ValueError('malformed batch')
+    pregenerator = make(generate_batch=batch)
+    assert pregenerator.run_for_date('2024-04-08') == []
+    assert pregenerator.get('2024-04-08', 'gemini') == {'key': 'gemini'}
+
+def test_batch_is_skipped_for_a_single_missing_key():
+    calls = []
+    pregenerator = make(generate_batch=lambda keys, date: calls.append(keys) or {}, keys=['aries'])
+    assert pregenerator.run_for_date('2024-04-08') == []
+    assert calls == []
+
+def test_one_runner_holds_the_lease(tmp_path):
+    lock_path = str(tmp_path / 'pregeneration.lock')
+    first, second = make(lock_path=lock_path), make(lock_path=lock_path)
+    assert first._acquire_lease()
+    assert first._acquire_lease()  # still the runner on the next loop
+    assert not second._acquire_lease()
+    first._release_lease()
+    assert second._acquire_lease()
+
+def test_without_a_lock_path_every_process_runs():
+    assert make()._acquire_lease() and make()._acquire_lease()
@@ -0,0 +1,72 @@
+import threading
+import time
+import pytest
+from services.singleflight import SingleFlight
+
+def run_concurrently(flight, key, fn, callers):
+    """Unstarted threads that each call flight.do(key, fn), and the lists they fill"""
+    results, errors = [], []
+
+    def call():
+        try:
+            results.append(flight.do(key, fn))
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=call) for _ in range(callers)]
+    return threads, results, errors
+
+def test_concurrent_callers_share_one_call():
+    flight = SingleFlight()
+    entered, release = threading.Event(), threading.Event()
+    calls = []
+
+    def slow():
+        calls.append(1)
+        entered.set()
+        release.wait(5)
+        return {'value': 42}
+
+    threads, results, errors = run_concurrently(flight, 'k', slow, 5)
+    threads[0].start()
+    assert entered.wait(5)
+    for thread in threads[1:]:
+        thread.start()
+    time.sleep(0.2)  # let the followers park on the leader's call
+    release.set()
+    for thread in threads:
+        thread.join(5)
+
+    assert len(calls) == 1
+    assert not errors
+    assert len(results) == 5 and all(r is results[0] for r in results)
+    assert flight.in_flight() == 0
+
+def test_leader_exception_reaches_every_caller():
+    flight = SingleFlight()
+    entered, release = threading.Event(), threading.Event()
+
+    def failing():
+        entered.set()
+        release.wait(5)
+        raise RuntimeError('upstream down')
+
+    threads, results, errors = run_concurrently(flight, 'k', failing, 3)
+    threads[0].start()
+    assert entered.wait(5)
+    for thread in threads[1:]:
+        thread.start()
+    release.set()
+    for thread in threads:
+        thread.join(5)
+
+    assert not results
+    assert len(errors) == 3 and all(isinstance(e, RuntimeError) for e in errors)
+
+def test_key_is_released_after_completion():
+    flight = SingleFlight()
+    assert flight.do('k', lambda: 1) == 1
+    assert flight.do('k', lambda: 2) == 2
+    with pytest.raises(ValueError):
+        flight.do('k', lambda: int('x'))
+    assert flight.in_flight() == 0
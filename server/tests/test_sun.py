@@ -0,0 +1,57 @@
+from datetime import date
+import numpy as np
+import pytest
+from astro.sun import cached_sunrise_sunset, format_clock, local_noon_jd, sun_times_cache, sunrise_sunset
+
+def minutes(clock: str) -> int:
+    hours, mins = clock.split(':')
+    return int(hours) * 60 + int(mins)
+
+# (latitude, longitude, UTC offset, date, sunrise, sunset) as published by timeanddate.com
+REFERENCE = [
+    (28.6139, 77.2090, 5.5, date(2024, 6, 21), '05:23', '19:22'),     # New Delhi, solstice
+    (28.6139, 77.2090, 5.5, date(2024, 12, 21), '07:10', '17:29'),
+    (51.5074, -0.1278, 1.0, date(2024, 6, 20), '04:43', '21:21'),     # London, BST
+    (-33.8688, 151.2093, 11.0, date(2024, 12, 21), '05:41', '20:05'), # Sydney, AEDT
+]
+
+@pytest.mark.parametrize('latitude,longitude,offset,day,sunrise,sunset', REFERENCE)
+def test_sunrise_and_sunset_match_reference_times(latitude, longitude, offset, day, sunrise, sunset):
+    rise, set_ = cached_sunrise_sunset(day, latitude, longitude, offset)
+    assert abs(rise - minutes(sunrise)) <= 1.5
+    assert abs(set_ - minutes(sunset)) <= 1.5
+
+@pytest.mark.parametrize('day', [date(2024, 6, 21), date(2024, 12, 21)])
+def test_polar_day_and_night_return_none(day):
+    # Tromso: midnight sun in June, polar night in December
+    assert cached_sunrise_sunset(day, 69.6492, 18.9553, 1.0) == (None, None)
+
+def test_polar_days_are_nan_in_arrays():
+    days = [date(2024, 3, 20), date(2024, 6, 21)]
+    jd_noon = np.array([local_noon_jd(day, 1.0) for day in days])
+    sunrise, sunset = sunrise_sunset(jd_noon, 69.6492, 18.9553, np.array([1.0, 1.0]))
+    assert not np.isnan(sunrise[0]) and not np.isnan(sunset[0])
+    assert np.isnan(sunrise[1]) and np.isnan(sunset[1])
+
+def test_polar_panchang_has_null_sunrise(client):
+    response = client.get('/api/panchang?date=2024-06-21&lat=69.6492&lon=18.9553&tz=Europe/Oslo')
+    assert response.status_code == 200
+    data = response.get_json()['data']
+    assert data['sunrise'] is None and data['sunset'] is None
+
+def test_nearby_coordinates_share_a_cache_entry():
+    sun_times_cache.clear()
+    day = date(2024, 5, 1)
+    first = cached_sunrise_sunset(day, 28.6139, 77.2090, 5.5)
+    size = len(sun_times_cache)
+    # About a kilometre away: same 0.05 degree cell
+    assert cached_sunrise_sunset(day, 28.6201, 77.2150, 5.5) == first
+    assert len(sun_times_cache) == size
+    # A different cell gets its own entry
+    cached_sunrise_sunset(day, 28.7000, 77.2090, 5.5)
+    assert len(sun_times_cache) == size + 1
+
+def test_format_clock():
+    assert format_clock(None) is None
+    assert format_clock(323.6) == '05:24'
+    assert format_clock(1439.7) == '00:00'
@@ -0,0 +1,59 @@
+from datetime import date
+import numpy as np
+import pytest
+from astro.location import location_from_args
+from astro.timings import compute_timings, day_timings, sunday_first, timings_for_dates
+
+WEEK = ['Sunday', 'Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday']
+
+@pytest.fixture
+def equinox_week():
+    """Timings for Sunday..Saturday with sunrise 06:00, sunset 18:00 and next sunrise 06:00"""
+    sunrise = np.full(7, 360.0)
+    timings = compute_timings(sunrise, np.full(7, 1080.0), sunrise + 1440.0, np.arange(7))
+    return [day_timings(timings, i) for i in range(7)]
+
+def test_delhi_timings_2024_04_08():
+    day = timings_for_dates(date(2024, 4, 8), 1, location_from_args({}))[0]
+    assert day['dayName'] == 'Monday'
+    assert day['rahuKaal'] == {'start': '07:38', 'end': '09:13'}
+    assert (day['sunrise'], day['sunset']) == ('06:03', '18:43')
+
+@pytest.mark.parametrize('name,starts', [
+    ('rahuKaal', ['16:30', '07:30', '15:00', '12:00', '13:30', '10:30', '09:00']),
+    ('yamaganda', ['12:00', '10:30', '09:00', '07:30', '06:00', '15:00', '13:30']),
+    ('gulikaKaal', ['15:00', '13:30', '12:00', '10:30', '09:00', '07:30', '06:00']),
+])
+def test_segment_rotation_over_the_week(equinox_week, name, starts):
+    assert [day[name]['start'] for day in equinox_week] == starts
+
+def test_segments_last_an_eighth_of_the_day(equinox_week):
+    monday = equinox_week[1]
+    assert monday['rahuKaal'] == {'start': '07:30', 'end': '09:00'}
+    assert monday['gulikaKaal'] == {'start': '13:30', 'end': '15:00'}
+    assert monday['abhijitMuhurta'] == {'start': '11:36', 'end': '12:24'}
+    assert monday['brahmaMuhurta'] == {'start': '04:24', 'end': '05:12'}
+
+def test_choghadiya_rotation_over_the_week(equinox_week):
+    assert [day['choghadiya']['day'][0]['name'] for day in equinox_week] == \
+        ['Udveg', 'Amrit', 'Rog', 'Labh', 'Shubh', 'Char', 'Kaal']
+    assert [day['choghadiya']['night'][0]['name'] for day in equinox_week] == \
+        ['Shubh', 'Char', 'Kaal', 'Udveg', 'Amrit', 'Rog', 'Labh']
+    sunday = equinox_week[0]['choghadiya']
+    assert [c['name'] for c in sunday['day']] == ['Udveg', 'Char', 'Labh', 'Amrit', 'Kaal', 'Shubh', 'Rog', 'Udveg']
+    assert sunday['day'][0] == {'start': '06:00', 'end': '07:30', 'name': 'Udveg', 'quality': 'Bad'}
+    assert sunday['night'][-1]['end'] == '06:00'
+
+def test_hora_rotation_over_the_week(equinox_week):
+    # The first hora belongs to the weekday's lord...
+    assert [day['hora'][0]['lord'] for day in equinox_week] == \
+        ['Sun', 'Moon', 'Mars', 'Mercury', 'Jupiter', 'Venus', 'Saturn']
+    # ...and the sequence runs on in Chaldean order into the next day's first hora
+    sunday = [hora['lord'] for hora in equinox_week[0]['hora']]
+    assert sunday[:8] == ['Sun', 'Venus', 'Mercury', 'Moon', 'Saturn', 'Jupiter', 'Mars', 'Sun']
+    assert sunday[23] == 'Mercury'  # followed by Monday's Moon
+    assert equinox_week[0]['hora'][12] == {'start': '18:00', 'end': '19:00', 'lord': 'Jupiter'}
+
+def test_sunday_first():
+    assert [sunday_first(date(2024, 4, 7 + i)) for i in range(7)] == list(range(7))
+    assert date(2024, 4, 7).strftime('%A') == WEEK[0]